@@ -0,0 +1,983 @@
+# =================================================================================================
+# Wstęp / podsumowanie:
+#
+# Notatki opisują złożoność asymptotyczną, ale nie mówią nic o stałych, a w praktyce to one decydują, czy dany algorytm
+# jest szybki. Ten plik to zestaw pomiarów dla procedur z pozostałych notatek. Każdy pomiar uruchamiamy z linii poleceń:
+#
+#               python benchmarks.py sorting --sizes 1000 10000 --out wyniki.json
+#               python benchmarks.py sorting --sizes 1000 10000 --baseline wyniki.json --threshold 0.2
+#
+# Wyniki zapisujemy do CSV albo JSON (po rozszerzeniu pliku), razem z hashem commita, żeby móc porównać wyniki
+# z różnych wersji kodu. Jeśli podamy plik bazowy (--baseline), to każdy pomiar wolniejszy od bazowego o więcej niż
+# zadany próg jest zgłaszany jako regresja, a program kończy się kodem 1.
+#
+# Pomiary:
+# 1. Sortowania (sorting.py) na różnych rozkładach danych, w tym na danych złośliwych dla quick sorta
+# 2. Funkcje hashujące (data_structures.py): kolizje i przepustowość na różnych rozkładach kluczy
+# 3. Drzewa uporządkowane (data_structures.py): BST, drzewo czerwono-czarne i B+-drzewa o różnym rozgałęzieniu
+# 4. Kolejki priorytetowe (data_structures.py): algorytm Dijkstry z decrease-key na losowych grafach
+# 5. Kolejki współbieżne (data_structures.py): ShardedPriorityQueue i queue.PriorityQueue przy wielu wątkach
+# 6. Stos i kolejka FIFO (data_structures.py): ArrayStack i RingQueue kontra list i collections.deque
+# 7. Łańcuchy macierzy (dp.py): mnożenie według planu MCM kontra naiwne mnożenie od lewej do prawej
+# 8. Czas importu modułów (python -X importtime) - import notatek nie powinien niczego liczyć ani wypisywać
+# 9. Równoległe wypełnianie tabel DP falą kafelków (dp.py): LCS i odległość edycyjna przy różnej liczbie procesów
+# =================================================================================================
+
+import argparse
+import array
+import collections
+import csv
+import functools
+import heapq
+import json
+import os
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+import data_structures
+import dp
+import graphs
+import sorting
+
+# =================================================================================================
+# 0. Wspólne narzędzia:
+# Każdy pomiar zwraca listę wierszy (słowników). Wiersz identyfikuje klucz - krotka pól opisujących "co" mierzyliśmy
+# (np. algorytm, rozkład, rozmiar) - i ma pole 'time', po którym szukamy regresji.
+#
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def save_rows(rows, path):
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            fields = []
+            for row in rows:
+                fields.extend(k for k in row if k not in fields)
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+def load_rows(path):
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            if row.get('time') not in (None, ''):
+                row['time'] = float(row['time'])
+        return rows
+    with open(path) as f:
+        return json.load(f)
+
+def find_regressions(rows, baseline, key_fields, threshold):
+    old = {}
+    for row in baseline:
+        if isinstance(row.get('time'), float):
+            old[tuple(str(row[k]) for k in key_fields)] = row['time']
+    regressions = []
+    for row in rows:
+        key = tuple(str(row[k]) for k in key_fields)
+        if key in old and isinstance(row.get('time'), float) and row['time'] > old[key] * (1 + threshold):
+            regressions.append((row, old[key]))
+    return regressions
+
+def report(rows, args, key_fields):
+    commit = git_commit()
+    for row in rows:
+        row['commit'] = commit
+    if args.out:
+        save_rows(rows, args.out)
+    if args.baseline:
+        regressions = find_regressions(rows, load_rows(args.baseline), key_fields, args.threshold)
+        for row, old in regressions:
+            label = ' '.join(f'{k}={row[k]}' for k in key_fields)
+            print(f'REGRESJA: {label}: {old:.6f}s -> {row["time"]:.6f}s')
+        if regressions:
+            return 1
+    return 0
+
+def add_common_arguments(parser):
+    parser.add_argument('--out', help='plik wynikowy .csv albo .json')
+    parser.add_argument('--baseline', help='wyniki bazowe (.csv albo .json) do porównania')
+    parser.add_argument('--threshold', type=float, default=0.2, help='dopuszczalne spowolnienie, 0.2 = 20%%')
+    parser.add_argument('--seed', type=int, default=2024)
+
+# =================================================================================================
+
+# =================================================================================================
+# 1. Sortowania:
+# Mierzymy każde sortowanie z sorting.py na rozkładach:
+# - random: losowa permutacja
+# - sorted, reversed: posortowane rosnąco / malejąco (pesymistyczny przypadek insertion sorta i quick sorta z Lomuto)
+# - organ_pipe: rosnąco do połowy, później malejąco ("piszczałki organowe")
+# - many_duplicates: tylko ~sqrt(n) różnych wartości
+# - lomuto_killer: same równe klucze - partycja Lomuto z warunkiem arr[j] <= pivot odcina wtedy zawsze jeden element
+# - antiqsort: dane złośliwe dla konkretnego algorytmu, generowane przez przeciwnika McIlroya (opis niżej)
+#
+# Dla każdego pomiaru zapisujemy czas (pomiar bez żadnej instrumentacji), liczbę porównań oraz zamian i szczytowe zużycie
+# pamięci (kolejne uruchomienia, z licznikami i z tracemalloc - instrumentacja spowalnia, więc czasu z nich nie bierzemy).
+# Porównania liczymy opakowując wartości w obiekt Counted, a zamiany podmieniając Array na CountingArray.
+#
+# Algorytmy kwadratowe (oraz quick sort na danych, które dla niego są kwadratowe) uruchamiamy tylko do rozmiaru
+# --quadratic-limit, inaczej pomiar dla n = 10^6 trwałby dni. Rozmiary do 10^8 da się podać, ale w czystym Pythonie
+# sensownie mierzy się raczej do 10^6.
+#
+
+class Counter:
+    comparisons = 0
+    swaps = 0
+
+class Counted:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    @staticmethod
+    def unwrap(other):
+        return other.value if isinstance(other, Counted) else other
+
+    def __lt__(self, other):
+        Counter.comparisons += 1
+        return self.value < Counted.unwrap(other)
+
+    def __le__(self, other):
+        Counter.comparisons += 1
+        return self.value <= Counted.unwrap(other)
+
+    def __gt__(self, other):
+        Counter.comparisons += 1
+        return self.value > Counted.unwrap(other)
+
+    def __ge__(self, other):
+        Counter.comparisons += 1
+        return self.value >= Counted.unwrap(other)
+
+class CountingArray(sorting.Array):
+    def swap(self, i, j):
+        Counter.swaps += 1
+        sorting.Array.swap(self, i, j)
+
+#
+# Przeciwnik McIlroya ("A Killer Adversary for Quicksort"): zamiast ustalać dane z góry, odpowiadamy na porównania
+# w trakcie sortowania. Na początku wszystkie elementy są "gazem" (wartość nieustalona, większa od każdej ustalonej).
+# Gdy porównujemy dwa gazy, to jeden z nich "zamrażamy" (nadajemy mu najmniejszą wolną wartość) - wybieramy ten, który
+# nie jest aktualnym kandydatem na pivota. Kandydat, czyli ostatni gaz biorący udział w porównaniu, zostaje gazem, więc
+# pivot okazuje się prawie zawsze jednym z największych elementów. Na koniec zamrażamy resztę gazu i wartości nadane
+# elementom tworzą dane wejściowe, które dla tego algorytmu dają pesymistyczny przypadek.
+#
+
+class AntiqsortAdversary:
+    def __init__(self, n):
+        self.gas = n
+        self.val = [n] * n
+        self.candidate = 0
+        self.solid = 0
+
+    def freeze(self, x):
+        self.val[x] = self.solid
+        self.solid += 1
+
+    def cmp(self, x, y):
+        if self.val[x] == self.gas and self.val[y] == self.gas:
+            if x == self.candidate:
+                self.freeze(x)
+            else:
+                self.freeze(y)
+        if self.val[x] == self.gas:
+            self.candidate = x
+        elif self.val[y] == self.gas:
+            self.candidate = y
+        return self.val[x] - self.val[y]
+
+class AdversaryItem:
+    __slots__ = ('idx', 'adversary')
+
+    def __init__(self, idx, adversary):
+        self.idx = idx
+        self.adversary = adversary
+
+    def compare(self, other):
+        if not isinstance(other, AdversaryItem):
+            # Porównanie ze strażnikiem (np. INF w merge) - gaz i tak jest mniejszy od strażnika
+            return -1
+        return self.adversary.cmp(self.idx, other.idx)
+
+    def __lt__(self, other):
+        return self.compare(other) < 0
+
+    def __le__(self, other):
+        return self.compare(other) <= 0
+
+    def __gt__(self, other):
+        return self.compare(other) > 0
+
+    def __ge__(self, other):
+        return self.compare(other) >= 0
+
+def antiqsort_input(run, n):
+    adversary = AntiqsortAdversary(n)
+    run(sorting.Array(AdversaryItem(i, adversary) for i in range(n)))
+    for i in range(n):
+        if adversary.val[i] == adversary.gas:
+            adversary.freeze(i)
+    return adversary.val
+
+def gen_random(n, rng):
+    data = list(range(n))
+    rng.shuffle(data)
+    return data
+
+def gen_sorted(n, rng):
+    return list(range(n))
+
+def gen_reversed(n, rng):
+    return list(range(n-1, -1, -1))
+
+def gen_organ_pipe(n, rng):
+    half = n // 2
+    return list(range(half)) + list(range(n - half - 1, -1, -1))
+
+def gen_many_duplicates(n, rng):
+    distinct = max(1, int(n ** 0.5))
+    return [rng.randrange(distinct) for _ in range(n)]
+
+def gen_lomuto_killer(n, rng):
+    return [0] * n
+
+DISTRIBUTIONS = {
+    'random': gen_random,
+    'sorted': gen_sorted,
+    'reversed': gen_reversed,
+    'organ_pipe': gen_organ_pipe,
+    'many_duplicates': gen_many_duplicates,
+    'lomuto_killer': gen_lomuto_killer,
+    'antiqsort': None,
+}
+
+def run_radix(arr):
+    digits = len(str(max(arr.values(), default=0)))
+    perm = sorting.radix_argsort(arr, digits)
+    sorting.permute_in_place(arr, perm)
+
+def run_counting(arr):
+    B = sorting.Array([0] * arr.length)
+    sorting.counting_sort(arr, B, max(arr.values(), default=0))
+    arr.data[1:] = B.data[1:]
+
+# nazwa -> (procedura sortująca tablicę Array, czy kwadratowa, czy porównuje klucze)
+SORTS = {
+    'insertion_sort': (sorting.insertion_sort, True, True),
+    'selection_sort': (sorting.selection_sort, True, True),
+    'merge_sort': (lambda arr: sorting.merge_sort(arr, 1, arr.length), False, True),
+    'heapsort': (sorting.heapsort, False, True),
+    'dary_heapsort_4': (lambda arr: sorting.dary_heapsort(arr, 4), False, True),
+    'quick_sort': (lambda arr: sorting.quick_sort(arr, 1, arr.length), False, True),
+    'hoare_quick_sort': (lambda arr: sorting.hoare_quick_sort(arr, 1, arr.length), False, True),
+    'counting_sort': (run_counting, False, False),
+    'radix_sort': (run_radix, False, False),
+}
+
+# Rozkłady, na których dany algorytm jest kwadratowy, choć w średnim przypadku nie jest
+QUADRATIC_CASES = {
+    'quick_sort': {'sorted', 'reversed', 'organ_pipe', 'lomuto_killer', 'antiqsort'},
+    'hoare_quick_sort': {'sorted', 'reversed', 'organ_pipe', 'antiqsort'},
+}
+
+def measure_sort(run, data, compares, trace_memory):
+    arr = sorting.Array(data)
+    start = time.perf_counter()
+    run(arr)
+    elapsed = time.perf_counter() - start
+    if arr.values() != sorted(data):
+        raise AssertionError('wynik sortowania jest niepoprawny')
+
+    Counter.comparisons = 0
+    Counter.swaps = 0
+    arr = CountingArray(Counted(x) for x in data) if compares else CountingArray(data)
+    run(arr)
+
+    # tracemalloc bardzo zwalnia przy głębokiej rekurencji, więc pamięć mierzymy osobno i nie dla przypadków kwadratowych
+    peak = ''
+    if trace_memory:
+        arr = sorting.Array(data)
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        run(arr)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak -= base
+    return elapsed, Counter.comparisons, Counter.swaps, peak
+
+def sorting_benchmark(args):
+    rng = random.Random(args.seed)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * args.quadratic_limit + 1000))
+    rows = []
+    for name in args.sorts or SORTS:
+        run, quadratic, compares = SORTS[name]
+        for dist in args.distributions or DISTRIBUTIONS:
+            # Przeciwnik działa tylko przez porównania
+            if dist == 'antiqsort' and not compares:
+                continue
+            for n in args.sizes:
+                slow = quadratic or dist in QUADRATIC_CASES.get(name, ())
+                if slow and n > args.quadratic_limit:
+                    continue
+                if dist == 'antiqsort':
+                    data = antiqsort_input(run, n)
+                else:
+                    data = DISTRIBUTIONS[dist](n, rng)
+                row = {'sort': name, 'distribution': dist, 'n': n}
+                try:
+                    elapsed, comparisons, swaps, peak = measure_sort(run, data, compares, not slow)
+                    row.update(time=elapsed, comparisons=comparisons, swaps=swaps, peak_memory=peak)
+                except RecursionError:
+                    row.update(time='', error='RecursionError')
+                rows.append(row)
+                print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('sort', 'distribution', 'n'))
+
+def sorting_arguments(parser):
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**3, 10**4, 10**5])
+    parser.add_argument('--sorts', nargs='+', choices=list(SORTS))
+    parser.add_argument('--distributions', nargs='+', choices=list(DISTRIBUTIONS))
+    parser.add_argument('--quadratic-limit', type=int, default=10**4)
+
+# =================================================================================================
+# 2. Funkcje hashujące:
+# Dla każdej rodziny z data_structures.py hashujemy n kluczy do m = 2^p kubełków (najmniejsza potęga dwójki >= n) i mierzymy:
+# - collisions: n - liczba niepustych kubełków, czyli ile kluczy trafiło do już zajętego kubełka,
+# - expected: to samo dla w pełni losowej funkcji, n - m*(1 - (1 - 1/m)^n) - z tym porównujemy collisions,
+# - max_load: najwięcej kluczy w jednym kubełku (dla losowej funkcji ~ ln n / ln ln n),
+# - time: czas zhashowania wszystkich kluczy metodą many (przepustowość to n / time).
+# Rozkłady kluczy:
+# - sequential: 0, 1, 2, ... (łatwe - nawet k mod m daje tu zero kolizji)
+# - random: losowe liczby 64-bitowe
+# - strided: wielokrotności 1024 - k mod 2^p trafia zawsze w kilka kubełków, tu widać, po co jest haszowanie multiplikatywne
+# - high_bits: klucze różniące się tylko starszymi bitami (k * 2^32)
+# - clustered: kilka gęstych przedziałów rozrzuconych po zakresie
+#
+
+def keys_sequential(n, rng):
+    return list(range(n))
+
+def keys_random(n, rng):
+    return [rng.getrandbits(64) for _ in range(n)]
+
+def keys_strided(n, rng):
+    return [i * 1024 for i in range(n)]
+
+def keys_high_bits(n, rng):
+    return [i << 32 for i in range(n)]
+
+def keys_clustered(n, rng):
+    clusters = max(1, n // 1000)
+    starts = [rng.getrandbits(48) for _ in range(clusters)]
+    return [starts[i % clusters] + i // clusters for i in range(n)]
+
+KEY_DISTRIBUTIONS = {
+    'sequential': keys_sequential,
+    'random': keys_random,
+    'strided': keys_strided,
+    'high_bits': keys_high_bits,
+    'clustered': keys_clustered,
+}
+
+def make_hash(name, seed):
+    family = data_structures.HASH_FAMILIES[name]
+    if name in ('universal', 'tabulation'):
+        return family(seed)
+    return family()
+
+def hashing_benchmark(args):
+    rng = random.Random(args.seed)
+    rows = []
+    for dist in args.distributions or KEY_DISTRIBUTIONS:
+        for n in args.sizes:
+            keys = KEY_DISTRIBUTIONS[dist](n, rng)
+            m = 1 << max(0, (n - 1).bit_length())
+            expected = n - m * (1 - (1 - 1 / m) ** n)
+            for name in args.families or data_structures.HASH_FAMILIES:
+                h = make_hash(name, args.seed)
+                start = time.perf_counter()
+                buckets = h.many(keys, m)
+                elapsed = time.perf_counter() - start
+                loads = {}
+                for b in buckets:
+                    loads[b] = loads.get(b, 0) + 1
+                row = {'family': name, 'distribution': dist, 'n': n, 'time': elapsed,
+                       'collisions': n - len(loads), 'expected': round(expected), 'max_load': max(loads.values())}
+                rows.append(row)
+                print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('family', 'distribution', 'n'))
+
+def hashing_arguments(parser):
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5])
+    parser.add_argument('--families', nargs='+', choices=list(data_structures.HASH_FAMILIES))
+    parser.add_argument('--distributions', nargs='+', choices=list(KEY_DISTRIBUTIONS))
+
+# =================================================================================================
+# 3. Drzewa uporządkowane:
+# Porównujemy zwykłe BST (węzły z 'NIL' i procedury z punktu 5), RBTreeMap i BPlusTree dla kilku wartości order.
+# Klucze to losowa permutacja 0...n-1 (dla BST posortowane dane dałyby drzewo-listę). Operacje:
+# - insert: zbudowanie drzewa przez n wstawień,
+# - search: n wyszukiwań istniejących kluczy w losowej kolejności,
+# - successor: n razy następnik losowego klucza (dla RBTreeMap ceiling(k + 1), bo klucze są całkowite),
+# - scan: przejście wszystkich kluczy w kolejności rosnącej.
+#
+
+class BSTNode:
+    __slots__ = ('key', 'left', 'right', 'parent')
+
+    def __init__(self, key):
+        self.key = key
+        self.left = self.right = self.parent = 'NIL'
+
+class BSTree:
+    def __init__(self):
+        self.root = 'NIL'
+
+def bst_operations():
+    def insert(keys):
+        T = BSTree()
+        for k in keys:
+            data_structures.insert_node(T, BSTNode(k))
+        return T
+
+    def search(T, queries):
+        for k in queries:
+            data_structures.iterative_tree_search(T.root, k)
+
+    def successor(T, queries):
+        for k in queries:
+            data_structures.successor(data_structures.iterative_tree_search(T.root, k))
+
+    def scan(T):
+        node = data_structures.minimum(T.root)
+        while node != 'NIL':
+            node = data_structures.successor(node)
+
+    return insert, search, successor, scan
+
+def rbtree_operations():
+    def insert(keys):
+        M = data_structures.RBTreeMap()
+        for k in keys:
+            M[k] = k
+        return M
+
+    def search(M, queries):
+        for k in queries:
+            M.find(k)
+
+    def successor(M, queries):
+        for k in queries:
+            M.ceiling(k + 1)
+
+    def scan(M):
+        for _ in M.items():
+            pass
+
+    return insert, search, successor, scan
+
+def bplus_operations(order):
+    def insert(keys):
+        T = data_structures.BPlusTree(order)
+        for k in keys:
+            T[k] = k
+        return T
+
+    def search(T, queries):
+        for k in queries:
+            T.search(k)
+
+    def successor(T, queries):
+        for k in queries:
+            T.successor(k)
+
+    def scan(T):
+        for _ in T.items():
+            pass
+
+    return insert, search, successor, scan
+
+def trees_benchmark(args):
+    rng = random.Random(args.seed)
+    structures = {'bst': bst_operations(), 'rbtree': rbtree_operations()}
+    for order in args.orders:
+        structures[f'bplus-{order}'] = bplus_operations(order)
+    rows = []
+    for n in args.sizes:
+        keys = list(range(n))
+        rng.shuffle(keys)
+        queries = keys[:]
+        rng.shuffle(queries)
+        for name in args.structures or structures:
+            insert, search, successor, scan = structures[name]
+            start = time.perf_counter()
+            T = insert(keys)
+            times = {'insert': time.perf_counter() - start}
+            for op, run in (('search', lambda: search(T, queries)), ('successor', lambda: successor(T, queries)),
+                            ('scan', lambda: scan(T))):
+                start = time.perf_counter()
+                run()
+                times[op] = time.perf_counter() - start
+            for op, elapsed in times.items():
+                row = {'structure': name, 'operation': op, 'n': n, 'time': elapsed}
+                rows.append(row)
+                print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('structure', 'operation', 'n'))
+
+def trees_arguments(parser):
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5])
+    parser.add_argument('--orders', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--structures', nargs='+')
+
+# =================================================================================================
+# 4. Kolejki priorytetowe:
+# Algorytm Dijkstry na losowym grafie skierowanym z n wierzchołkami, n * degree krawędziami i całkowitymi wagami z
+# przedziału [1, max_weight], uruchomiony z każdą kolejką z PRIORITY_QUEUES (z decrease-key). Dla porównania również
+# heapq bez decrease-key: wrzucamy nową parę przy każdej poprawie odległości, a nieaktualne pary pomijamy przy wyjmowaniu.
+# Zapisujemy czas i liczbę operacji decrease-key, a wyniki wszystkich kolejek porównujemy ze sobą.
+#
+
+def random_graph(n, degree, max_weight, rng):
+    return [[(rng.randrange(n), rng.randint(1, max_weight)) for _ in range(degree)] for _ in range(n)]
+
+def dijkstra(adj, s, make_queue):
+    Q = make_queue()
+    dist = [None] * len(adj)
+    handles = [None] * len(adj)
+    done = [False] * len(adj)
+    dist[s] = 0
+    handles[s] = Q.insert(0, s)
+    decreases = 0
+    while len(Q):
+        d, u = Q.extract_min()
+        done[u] = True
+        for v, w in adj[u]:
+            if done[v]:
+                continue
+            if dist[v] is None:
+                dist[v] = d + w
+                handles[v] = Q.insert(d + w, v)
+            elif d + w < dist[v]:
+                dist[v] = d + w
+                Q.decrease_key(handles[v], d + w)
+                decreases += 1
+    return dist, decreases
+
+def dijkstra_heapq(adj, s):
+    dist = [None] * len(adj)
+    dist[s] = 0
+    heap = [(0, s)]
+    pushes = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in adj[u]:
+            if dist[v] is None or d + w < dist[v]:
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+                pushes += 1
+    return dist, pushes
+
+def queues_benchmark(args):
+    rng = random.Random(args.seed)
+    rows = []
+    for n in args.sizes:
+        adj = random_graph(n, args.degree, args.max_weight, rng)
+        expected = None
+        for name in args.queues or list(data_structures.PRIORITY_QUEUES) + ['heapq']:
+            start = time.perf_counter()
+            if name == 'heapq':
+                dist, ops = dijkstra_heapq(adj, 0)
+            else:
+                dist, ops = dijkstra(adj, 0, data_structures.PRIORITY_QUEUES[name])
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = dist
+            elif dist != expected:
+                raise AssertionError(f'{name}: inne odległości niż dla pierwszej kolejki')
+            row = {'queue': name, 'n': n, 'time': elapsed, 'operations': ops}
+            rows.append(row)
+            print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('queue', 'n'))
+
+def queues_arguments(parser):
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5])
+    parser.add_argument('--degree', type=int, default=8)
+    parser.add_argument('--max-weight', type=int, default=1000)
+    parser.add_argument('--queues', nargs='+', choices=list(data_structures.PRIORITY_QUEUES) + ['heapq'])
+
+# =================================================================================================
+# 5. Kolejki współbieżne:
+# T wątków-producentów wstawia razem n elementów z losowymi priorytetami, a T wątków-konsumentów je wyjmuje.
+# Mierzymy czas całości i przepustowość (elementy na sekundę) dla:
+# - queue.PriorityQueue: jeden kopiec, jedna blokada,
+# - sharded: ShardedPriorityQueue z put/get po jednym elemencie,
+# - sharded-batch: ShardedPriorityQueue z put_many/get_many w paczkach po --batch elementów.
+# Kolejki są ograniczone (--maxsize), więc producenci muszą czekać na konsumentów (backpressure).
+#
+
+def run_queue_threads(kind, n, threads, batch, maxsize, rng):
+    if kind == 'PriorityQueue':
+        Q = queue.PriorityQueue(maxsize)
+    else:
+        Q = data_structures.ShardedPriorityQueue(maxsize=maxsize)
+    per_thread = [n // threads + (i < n % threads) for i in range(threads)]
+    priorities = [rng.random() for _ in range(max(per_thread))]
+
+    def produce(count):
+        if kind == 'sharded-batch':
+            for i in range(0, count, batch):
+                Q.put_many([(p, None) for p in priorities[i:min(count, i + batch)]])
+        elif kind == 'sharded':
+            for i in range(count):
+                Q.put(priorities[i], None)
+        else:
+            for i in range(count):
+                Q.put((priorities[i], i))
+
+    def consume(count):
+        while count > 0:
+            if kind == 'sharded-batch':
+                count -= len(Q.get_many(min(batch, count)))
+            else:
+                Q.get()
+                count -= 1
+
+    workers = [threading.Thread(target=produce, args=(c,)) for c in per_thread]
+    workers += [threading.Thread(target=consume, args=(c,)) for c in per_thread]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - start
+
+def concurrency_benchmark(args):
+    rng = random.Random(args.seed)
+    rows = []
+    for threads in args.threads:
+        for kind in args.queues:
+            elapsed = run_queue_threads(kind, args.n, threads, args.batch, args.maxsize, rng)
+            row = {'queue': kind, 'threads': threads, 'n': args.n, 'time': elapsed, 'throughput': round(args.n / elapsed)}
+            rows.append(row)
+            print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('queue', 'threads', 'n'))
+
+def concurrency_arguments(parser):
+    parser.add_argument('--n', type=int, default=10**5)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--queues', nargs='+', choices=['PriorityQueue', 'sharded', 'sharded-batch'],
+                        default=['PriorityQueue', 'sharded', 'sharded-batch'])
+    parser.add_argument('--batch', type=int, default=64)
+    parser.add_argument('--maxsize', type=int, default=10**4)
+
+# =================================================================================================
+# 6. Stos i kolejka FIFO:
+# Wkładamy n kolejnych liczb (od 10^6, więc każda jest osobnym obiektem, jak numery wierzchołków w dużym grafie),
+# a potem wszystkie wyjmujemy. Struktury:
+# - deque / list: collections.deque (popleft) i list (pop), które trzymają liczby jako obiekty,
+# - ring / stack: RingQueue i ArrayStack po jednym elemencie (enqueue/dequeue, push/pop),
+# - ring-batch / stack-batch: RingQueue i ArrayStack paczkami po --batch elementów (enqueue_many/dequeue_many,
+#   push_many/pop_many).
+# Mierzymy czas (bez instrumentacji) i w osobnym uruchomieniu szczytowe zużycie pamięci (tracemalloc), gdy wszystkie
+# n elementów jest w strukturze.
+#
+# Same operacje na kontenerze to nie wszystko - liczy się miejsce, gdzie kolejka jest naprawdę używana. Dlatego mierzymy
+# też BFS na losowym grafie z n wierzchołkami i n * --degree krawędziami:
+# - bfs-deque: ta sama procedura co graphs.bfs (te same tablice kolorów, odległości i rodziców), ale z collections.deque
+#   i wierzchołkami wkładanymi po jednym,
+# - bfs-ring: graphs.bfs, czyli RingQueue obsługiwana warstwami (dequeue_many / enqueue_many).
+# Wyniki obu wersji porównujemy ze sobą.
+#
+
+FIRST = 10**6
+
+def fifo_deque(n, batch):
+    Q = collections.deque()
+    for x in range(FIRST, FIRST + n):
+        Q.append(x)
+    while Q:
+        Q.popleft()
+
+def fifo_ring(n, batch):
+    Q = data_structures.RingQueue(n)
+    for x in range(FIRST, FIRST + n):
+        Q.enqueue(x)
+    while not Q.empty():
+        Q.dequeue()
+
+def fifo_ring_batch(n, batch):
+    Q = data_structures.RingQueue(n)
+    for i in range(FIRST, FIRST + n, batch):
+        Q.enqueue_many(array.array('q', range(i, min(FIRST + n, i + batch))))
+    while not Q.empty():
+        Q.dequeue_many(batch)
+
+def lifo_list(n, batch):
+    S = []
+    for x in range(FIRST, FIRST + n):
+        S.append(x)
+    while S:
+        S.pop()
+
+def lifo_stack(n, batch):
+    S = data_structures.ArrayStack()
+    for x in range(FIRST, FIRST + n):
+        S.push(x)
+    while not S.empty():
+        S.pop()
+
+def lifo_stack_batch(n, batch):
+    S = data_structures.ArrayStack()
+    for i in range(FIRST, FIRST + n, batch):
+        S.push_many(array.array('q', range(i, min(FIRST + n, i + batch))))
+    while not S.empty():
+        S.pop_many(batch)
+
+CONTAINERS = {
+    'deque': fifo_deque,
+    'ring': fifo_ring,
+    'ring-batch': fifo_ring_batch,
+    'list': lifo_list,
+    'stack': lifo_stack,
+    'stack-batch': lifo_stack_batch,
+}
+
+def bfs_deque(adj, s):
+    n = len(adj)
+    colour = bytearray(n)
+    distance = array.array('q', [-1]) * n
+    parent = array.array('q', [-1]) * n
+    colour[s] = graphs.GRAY
+    distance[s] = 0
+    Q = collections.deque([s])
+    while Q:
+        u = Q.popleft()
+        for v in adj[u]:
+            if colour[v] == graphs.WHITE:
+                colour[v] = graphs.GRAY
+                distance[v] = distance[u] + 1
+                parent[v] = u
+                Q.append(v)
+        colour[u] = graphs.BLACK
+    return distance, parent
+
+BFS = {
+    'bfs-deque': bfs_deque,
+    'bfs-ring': graphs.bfs,
+}
+
+def containers_benchmark(args):
+    rng = random.Random(args.seed)
+    rows = []
+    for n in args.sizes:
+        adj = expected = None
+        for name in args.containers or list(CONTAINERS) + list(BFS):
+            if name in BFS:
+                if adj is None:
+                    adj = [[rng.randrange(n) for _ in range(args.degree)] for _ in range(n)]
+                run = functools.partial(BFS[name], adj, 0)
+            else:
+                run = functools.partial(CONTAINERS[name], n, args.batch)
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+            if name in BFS:
+                if expected is None:
+                    expected = result
+                elif result != expected:
+                    raise AssertionError(f'{name}: inne odległości lub rodzice niż dla pierwszego BFS')
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            row = {'container': name, 'n': n, 'time': elapsed, 'ops_per_second': round(2 * n / elapsed),
+                   'peak_memory': peak}
+            rows.append(row)
+            print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('container', 'n'))
+
+def containers_arguments(parser):
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6])
+    parser.add_argument('--containers', nargs='+', choices=list(CONTAINERS) + list(BFS))
+    parser.add_argument('--batch', type=int, default=1024)
+    parser.add_argument('--degree', type=int, default=4)
+
+# =================================================================================================
+# 7. Łańcuchy macierzy:
+# Losowe macierze całkowite o "niesymetrycznych" kształtach, dla których kolejność mnożenia ma znaczenie:
+# - vector: n macierzy d x d, a na końcu wektor d x 1 (od lewej do prawej to n*d^3, od prawej n*d^2),
+# - funnel: wymiary maleją od d do 2, a na końcu jedna szeroka macierz 2 x d,
+# - skewed: wymiary losowane spośród {2, d}.
+# Metody: left-to-right (functools.reduce z dp.matmul), plan (dp.chain_multiply, pierwsze wywołanie - z planowaniem)
+# i plan-cached (drugie wywołanie z tymi samymi kształtami). Wyniki porównujemy, bo liczby są całkowite.
+#
+
+def chain_shapes(workload, n, d, rng):
+    if workload == 'vector':
+        return [d] * (n+1) + [1]
+    if workload == 'funnel':
+        return [max(2, d - (d-2) * k // n) for k in range(n+1)] + [d]
+    return [rng.choice((2, d)) for _ in range(n+1)]
+
+CHAIN_WORKLOADS = ('vector', 'funnel', 'skewed')
+
+def chains_benchmark(args):
+    rng = random.Random(args.seed)
+    rows = []
+    for n in args.sizes:
+        for workload in args.workloads or CHAIN_WORKLOADS:
+            p = chain_shapes(workload, n, args.dim, rng)
+            matrices = [[[rng.randint(-9, 9) for _ in range(p[i+1])] for _ in range(p[i])] for i in range(len(p)-1)]
+            dp.PLAN_CACHE.clear()
+
+            start = time.perf_counter()
+            expected = functools.reduce(dp.matmul, matrices)
+            elapsed = time.perf_counter() - start
+            flops = 2 * sum(p[0] * p[k] * p[k+1] for k in range(1, len(p)-1))
+            results = [('left-to-right', elapsed, flops)]
+            for method in ('plan', 'plan-cached'):
+                start = time.perf_counter()
+                result, stats = dp.chain_multiply(matrices)
+                elapsed = time.perf_counter() - start
+                assert result == expected
+                results.append((method, elapsed, stats['measured_flops']))
+
+            for method, elapsed, flops in results:
+                row = {'workload': workload, 'n': n, 'method': method, 'time': elapsed, 'flops': flops,
+                       'speedup': round(results[0][1] / elapsed, 2)}
+                rows.append(row)
+                print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('workload', 'n', 'method'))
+
+def chains_arguments(parser):
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 40])
+    parser.add_argument('--workloads', nargs='+', choices=CHAIN_WORKLOADS)
+    parser.add_argument('--dim', type=int, default=60)
+
+# =================================================================================================
+# 8. Czas importu:
+# Każdy moduł importujemy w nowym procesie z flagą -X importtime, która wypisuje na stderr czas importu każdego modułu
+# (self - sam moduł, cumulative - razem z modułami, które importuje). Bierzemy najlepszy z --repeat pomiarów. 'all' to
+# import wszystkich modułów naraz. Osobno liczymy bajty wypisane na stdout - import nie powinien nic wypisywać.
+# Przed pomiarem uruchamiamy import raz bez pomiaru, żeby zapisać pliki .pyc (dlatego zdejmujemy
+# PYTHONDONTWRITEBYTECODE) - mierzymy import w działającej usłudze, a nie kompilację źródeł.
+#
+
+MODULES = ('sorting', 'data_structures', 'graphs', 'greedy', 'dp')
+
+def import_times(modules):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    code = 'import ' + ', '.join(modules)
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True, env=env,
+                         cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    times = {}
+    for line in out.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            if self_us.strip().isdigit():
+                times[name.strip()] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+    return times, len(out.stdout)
+
+def startup_benchmark(args):
+    modules = args.modules or MODULES
+    import_times(modules)
+    rows = []
+    for name in list(modules) + ['all']:
+        targets = modules if name == 'all' else [name]
+        best = None
+        for _ in range(args.repeat):
+            times, stdout = import_times(targets)
+            total = sum(times[m][1] for m in targets)
+            if best is None or total < best[0]:
+                best = (total, sum(times[m][0] for m in targets), stdout)
+        row = {'module': name, 'time': best[0], 'self_time': best[1], 'stdout_bytes': best[2]}
+        rows.append(row)
+        print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('module',))
+
+def startup_arguments(parser):
+    parser.add_argument('--modules', nargs='+', choices=MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+
+# =================================================================================================
+# 9. Wypełnianie falą:
+# Losowe ciągi DNA (bytes) długości n, tabela (n+1) x (n+1). Dla każdej liczby procesów z --workers mierzymy czas
+# dp.wavefront (workers=1 to wypełnienie sekwencyjne w jednym procesie) i sprawdzamy, że wynik jest taki sam jak dla
+# workers=1. speedup liczymy względem workers=1. Domyślne rozmiary są małe - tabela 10^8 komórek (n = 10^4) to
+# kilka minut na rdzeń w czystym Pythonie.
+#
+
+def wavefront_benchmark(args):
+    rng = random.Random(args.seed)
+    rows = []
+    for n in args.sizes:
+        a = bytes(rng.choice(b'ACGT') for _ in range(n))
+        b = bytes(rng.choice(b'ACGT') for _ in range(n))
+        for kernel in args.kernels:
+            base = None
+            # workers=1 zawsze mierzymy pierwszy - to punkt odniesienia dla speedup
+            for workers in [1] + [w for w in args.workers if w != 1]:
+                start = time.perf_counter()
+                value, _ = dp.wavefront(kernel, a, b, tile=args.tile, workers=workers)
+                elapsed = time.perf_counter() - start
+                if base is None:
+                    base = (value, elapsed)
+                assert value == base[0]
+                row = {'kernel': kernel, 'n': n, 'workers': workers, 'time': elapsed, 'value': value,
+                       'cells_per_second': round((n+1)**2 / elapsed), 'speedup': round(base[1] / elapsed, 2)}
+                rows.append(row)
+                print(' '.join(f'{k}={v}' for k, v in row.items()))
+    return report(rows, args, ('kernel', 'n', 'workers'))
+
+def wavefront_arguments(parser):
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 3000])
+    parser.add_argument('--kernels', nargs='+', choices=list(dp.WAVEFRONT_KERNELS), default=list(dp.WAVEFRONT_KERNELS))
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--tile', type=int, default=256)
+
+# =================================================================================================
+
+# nazwa -> (dodanie argumentów, uruchomienie)
+BENCHMARKS = {
+    'sorting': (sorting_arguments, sorting_benchmark),
+    'hashing': (hashing_arguments, hashing_benchmark),
+    'trees': (trees_arguments, trees_benchmark),
+    'queues': (queues_arguments, queues_benchmark),
+    'concurrency': (concurrency_arguments, concurrency_benchmark),
+    'containers': (containers_arguments, containers_benchmark),
+    'chains': (chains_arguments, chains_benchmark),
+    'startup': (startup_arguments, startup_benchmark),
+    'wavefront': (wavefront_arguments, wavefront_benchmark),
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pomiary algorytmów z notatek')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    for name, (add_arguments, _) in BENCHMARKS.items():
+        sub = subparsers.add_parser(name)
+        add_arguments(sub)
+        add_common_arguments(sub)
+    args = parser.parse_args(argv)
+    return BENCHMARKS[args.benchmark][1](args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,11 +14,28 @@
 # 7. Stack (stos, kolejka LIFO)
 # 8. Queue (zwykła kolejka FIFO)
 #
+# Dodatkowo, poza wykładem:
+# 9. B+-trees (B+-drzewa, indeks uporządkowany przyjazny dla pamięci podręcznej, także na dysku)
+#
 # Osobno były omawiane grafy, gdyż tam niewiele jest do powiedzenia na temat ich reprezentacji jako
 # abstrakcyjnej struktury danych. Implementowaliśmy je za pomocą macierzy sąsiedztwa, bądź też listy
 # sąsiedztwa, w zależności od relacji między licznością wierzchołków a licznością krawędzi.
 # =================================================================================================
 
+import array
+import heapq
+import itertools
+import mmap
+import operator
+import os
+import queue
+import random
+import struct
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
 # =================================================================================================
 # 1. Min/Max Heap:
 # Kopiec binarny to drzewo, gdzie zachowana jest tzw. własność kopca, czyli rodzic ma większą 
@@ -37,6 +54,479 @@
 # oraz przywraca własność kopca (tak jak w heapsort) a increase-key zwiększa klucz danego elementu. To
 # również może zepsuć własność kopca, więc należy ją naprawić poprzez procedurę przypominającą 
 # insertion-sort - zamieniamy miejscami klucz z rodzicem dopóki nie wpadnie on na właściwe miejsce.
+#
+# Dla algorytmów grafowych (Dijkstra, Prim) potrzebujemy kolejki typu min z operacją decrease-key, a żeby zmniejszyć klucz
+# elementu, trzeba wiedzieć, gdzie on jest. Dlatego insert zwraca uchwyt (handle) - obiekt z polami key i item, który
+# kolejka aktualizuje przy przesuwaniu elementów. Wszystkie kolejki poniżej mają ten sam interfejs:
+# - insert(key, item) -> uchwyt
+# - minimum() -> (key, item), extract_min() -> (key, item)
+# - decrease_key(uchwyt, key), len(Q)
+#
+#   a) kopiec binarny (BinaryHeap):
+# Kopiec typu min z punktu 1 na tablicy 1-indexed, tylko w tablicy trzymamy uchwyty, a każdy uchwyt zna swój indeks.
+# Przy każdej zamianie poprawiamy indeksy obu uchwytów. decrease-key to przesuwanie w górę jak w opisie wyżej.
+#
+
+class BinaryHeapHandle:
+    __slots__ = ('key', 'item', 'index')
+
+    def __init__(self, key, item, index):
+        self.key = key
+        self.item = item
+        self.index = index
+
+class BinaryHeap:
+    def __init__(self):
+        self.A = [None]
+
+    def __len__(self):
+        return len(self.A) - 1
+
+    def sift_up(self, i):
+        A = self.A
+        h = A[i]
+        while i > 1 and A[i // 2].key > h.key:
+            A[i] = A[i // 2]
+            A[i].index = i
+            i //= 2
+        A[i] = h
+        h.index = i
+
+    def sift_down(self, i):
+        A = self.A
+        n = len(A) - 1
+        h = A[i]
+        while 2 * i <= n:
+            c = 2 * i
+            if c < n and A[c + 1].key < A[c].key:
+                c += 1
+            if A[c].key >= h.key:
+                break
+            A[i] = A[c]
+            A[i].index = i
+            i = c
+        A[i] = h
+        h.index = i
+
+    def insert(self, key, item=None):
+        h = BinaryHeapHandle(key, item, len(self.A))
+        self.A.append(h)
+        self.sift_up(h.index)
+        return h
+
+    def minimum(self):
+        h = self.A[1]
+        return h.key, h.item
+
+    def extract_min(self):
+        if len(self.A) == 1:
+            raise IndexError('kolejka jest pusta')
+        top = self.A[1]
+        last = self.A.pop()
+        if last is not top:
+            self.A[1] = last
+            self.sift_down(1)
+        top.index = 0
+        return top.key, top.item
+
+    def decrease_key(self, h, key):
+        # Wyjęty uchwyt ma index = 0 (extract_min), a A[0] to tylko wartownik
+        if h.index == 0:
+            raise ValueError('elementu nie ma w kolejce')
+        if key > h.key:
+            raise ValueError('nowy klucz jest większy od aktualnego')
+        h.key = key
+        self.sift_up(h.index)
+
+#
+# Złożoność obliczeniowa: insert, extract_min i decrease_key to O(lgn), minimum to O(1).
+#
+#   b) kopiec parujący (PairingHeap):
+# Kopiec parujący to drzewo (dowolnego stopnia) z własnością kopca, trzymane jako lista dzieci: węzeł wskazuje pierwsze
+# dziecko (child), dziecko wskazuje następnego brata (sibling), a prev to lewy brat albo rodzic dla pierwszego dziecka.
+# Podstawowa operacja to link(a, b): korzeń z większym kluczem zostaje pierwszym dzieckiem drugiego, O(1).
+# - insert: link(korzeń, nowy węzeł), O(1). meld (złączenie dwóch kopców): link(korzeń1, korzeń2), O(1).
+# - decrease_key: zmniejszamy klucz, odcinamy węzeł razem z poddrzewem od rodzica i linkujemy z korzeniem.
+# - extract_min: usuwamy korzeń, a jego dzieci łączymy w dwóch przejściach: najpierw linkujemy pary od lewej do prawej,
+#   potem wyniki od prawej do lewej. Pojedyncze usunięcie może kosztować O(n), ale zamortyzowany koszt to O(lgn), a
+#   decrease_key ma zamortyzowany koszt o(lgn) - w praktyce kopiec parujący jest zwykle najszybszy z "teoretycznych" kopców.
+#
+
+class PairingNode:
+    __slots__ = ('key', 'item', 'child', 'sibling', 'prev')
+
+    def __init__(self, key, item):
+        self.key = key
+        self.item = item
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+def pairing_link(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if b.key < a.key:
+        a, b = b, a
+    b.prev = a
+    b.sibling = a.child
+    if a.child is not None:
+        a.child.prev = b
+    a.child = b
+    a.sibling = None
+    a.prev = None
+    return a
+
+class PairingHeap:
+    def __init__(self):
+        self.root = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, key, item=None):
+        node = PairingNode(key, item)
+        self.root = pairing_link(self.root, node)
+        self.count += 1
+        return node
+
+    def meld(self, other):
+        self.root = pairing_link(self.root, other.root)
+        self.count += other.count
+        other.root = None
+        other.count = 0
+
+    def minimum(self):
+        return self.root.key, self.root.item
+
+    def extract_min(self):
+        top = self.root
+        if top is None:
+            raise IndexError('kolejka jest pusta')
+        # Przejście 1: łączymy pary dzieci od lewej do prawej
+        pairs = []
+        x = top.child
+        while x is not None:
+            y = x.sibling
+            nxt = y.sibling if y is not None else None
+            pairs.append(pairing_link(x, y))
+            x = nxt
+        # Przejście 2: od prawej do lewej
+        root = None
+        for node in reversed(pairs):
+            root = pairing_link(node, root)
+        self.root = root
+        self.count -= 1
+        top.child = None
+        return top.key, top.item
+
+    def decrease_key(self, node, key):
+        # Każdy węzeł w kopcu oprócz korzenia ma prev, wyjęty korzeń już go nie ma
+        if node.prev is None and node is not self.root:
+            raise ValueError('elementu nie ma w kolejce')
+        if key > node.key:
+            raise ValueError('nowy klucz jest większy od aktualnego')
+        node.key = key
+        if node is self.root:
+            return
+        # Odcięcie poddrzewa node
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.sibling = None
+        node.prev = None
+        self.root = pairing_link(self.root, node)
+
+#
+# Złożoność obliczeniowa: insert, meld i minimum to O(1), extract_min to zamortyzowane O(lgn), decrease_key zamortyzowane
+# O(2^(2*sqrt(lglgn))) (czyli o(lgn)).
+#
+#   c) kopiec pozycyjny (RadixHeap):
+# W algorytmie Dijkstry z nieujemnymi wagami kolejne wyjmowane klucze nie maleją (kolejka monotoniczna), a klucze są
+# często liczbami całkowitymi. Wtedy można zamiast porównań użyć bitów. Pamiętamy last - ostatnio wyjęty klucz -
+# i trzymamy elementy w 65 kubełkach: klucz k trafia do kubełka nr 0, jeśli k == last, a w przeciwnym razie do kubełka
+# nr (k XOR last).bit_length(), czyli numeru najstarszego bitu, na którym k różni się od last.
+# - insert / decrease_key: klucz musi być >= last, wrzucamy uchwyt do kubełka, O(1) (przy decrease_key najpierw
+#   wyjmujemy uchwyt z jego kubełka: zamieniamy go z ostatnim uchwytem w kubełku i skracamy listę).
+# - extract_min: jeśli kubełek 0 jest pusty, to bierzemy pierwszy niepusty kubełek i, ustawiamy last na najmniejszy klucz
+#   w nim i rozrzucamy jego elementy od nowa. Wszystkie trafią do kubełków o numerach < i (najstarszy różniący bit jest
+#   teraz niżej), więc każdy element może zostać przeniesiony co najwyżej 64 razy.
+# Kubełków jest 65, więc klucze muszą być z przedziału [0, 2^64) - większe odrzucamy w insert (ValueError).
+#
+
+class RadixHandle:
+    __slots__ = ('key', 'item', 'bucket', 'index')
+
+    def __init__(self, key, item):
+        self.key = key
+        self.item = item
+        self.bucket = -1
+        self.index = -1
+
+class RadixHeap:
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def put(self, h):
+        b = (h.key ^ self.last).bit_length()
+        bucket = self.buckets[b]
+        h.bucket = b
+        h.index = len(bucket)
+        bucket.append(h)
+
+    def remove(self, h):
+        bucket = self.buckets[h.bucket]
+        last = bucket.pop()
+        if last is not h:
+            bucket[h.index] = last
+            last.index = h.index
+
+    def insert(self, key, item=None):
+        if key < self.last:
+            raise ValueError('klucz mniejszy od ostatnio wyjętego')
+        if key >> 64:
+            raise ValueError('klucz musi być mniejszy od 2^64')
+        h = RadixHandle(key, item)
+        self.put(h)
+        self.count += 1
+        return h
+
+    def decrease_key(self, h, key):
+        # Wyjęty uchwyt ma bucket = -1 (extract_min)
+        if h.bucket < 0:
+            raise ValueError('elementu nie ma w kolejce')
+        if key > h.key or key < self.last:
+            raise ValueError('klucz musi być z przedziału [last, h.key]')
+        self.remove(h)
+        h.key = key
+        self.put(h)
+
+    def refill(self):
+        if self.buckets[0]:
+            return
+        i = 1
+        while not self.buckets[i]:
+            i += 1
+        bucket = self.buckets[i]
+        self.buckets[i] = []
+        self.last = min(h.key for h in bucket)
+        for h in bucket:
+            self.put(h)
+
+    def minimum(self):
+        if not self.count:
+            raise IndexError('kolejka jest pusta')
+        self.refill()
+        h = self.buckets[0][-1]
+        return h.key, h.item
+
+    def extract_min(self):
+        if not self.count:
+            raise IndexError('kolejka jest pusta')
+        self.refill()
+        h = self.buckets[0].pop()
+        h.bucket = -1
+        self.count -= 1
+        return h.key, h.item
+
+PRIORITY_QUEUES = {
+    'binary': BinaryHeap,
+    'pairing': PairingHeap,
+    'radix': RadixHeap,
+}
+
+#
+# Złożoność obliczeniowa: insert i decrease_key to O(1), extract_min to zamortyzowane O(lgC), gdzie C to największy klucz
+# (każdy element przechodzi przez co najwyżej lgC+1 kubełków). Działa tylko dla monotonicznych kolejek i kluczy całkowitych.
+# Złożoność pamięciowa: Theta(n) dla wszystkich trzech kolejek.
+#
+#   d) kolejka priorytetowa dla wielu wątków (ShardedPriorityQueue):
+# Kolejka, do której pisze wiele wątków naraz, musi być chroniona blokadą (lock). Jedna blokada na cały kopiec (jak
+# w queue.PriorityQueue) sprawia, że wątki czekają na siebie przy każdej operacji. Zamiast tego dzielimy kolejkę na S
+# niezależnych kopców (shardów), każdy z własną blokadą:
+# - put: wybieramy shard po kolei (round-robin z licznika) i wstawiamy pod blokadą tylko tego shardu. put_many wstawia całą
+#   paczkę do jednego shardu pod jedną blokadą.
+# - get: bez blokad podglądamy wierzchołki wszystkich shardów (odczyt h[0] z listy jest atomowy), wybieramy najmniejszy,
+#   blokujemy tylko ten shard i wyjmujemy z niego element. Jeśli w międzyczasie ktoś opróżnił shard, próbujemy od nowa.
+#   Kolejność jest więc prawie ścisła: przy równoczesnych operacjach get może zwrócić element nieznacznie większy od
+#   aktualnego minimum (tak działają wszystkie kolejki z shardami, w zamian za brak wspólnej blokady).
+# - Liczbę elementów pilnują dwa liczniki pod jedną wspólną, ale krótko trzymaną blokadą: available (get czeka na
+#   warunku not_empty, aż coś będzie w kolejce) i reserved (tylko dla maxsize > 0: put czeka na warunku not_full, aż zwolni
+#   się miejsce - backpressure, producenci nie zasypią konsumentów). Operacje na kopcach są już poza tą blokadą.
+# - get_many(k) rezerwuje do k gotowych elementów naraz i wyjmuje je z najlepszego shardu pod jedną blokadą, dopóki
+#   nie są większe od wierzchołka drugiego najlepszego shardu.
+# - async_get: wersja get dla asyncio. Jeśli kolejka jest pusta, korutyna zapisuje się na liście czekających (future) i
+#   oddaje sterowanie pętli zdarzeń, a put budzi ją przez loop.call_soon_threadsafe - bez blokowania wątku pętli.
+# Brak elementu / miejsca przy block=False albo po timeout zgłaszamy wyjątkami queue.Empty / queue.Full, tak jak
+# queue.PriorityQueue. Same kopce w shardach to heapq (kopiec binarny z punktu 1, tylko zaimplementowany w C).
+# Elementy to trójki (priorytet, numer, item) - numer rozstrzyga remisy i sprawia, że itemów nigdy nie porównujemy.
+#
+
+def wake_future(future):
+    if not future.done():
+        future.set_result(None)
+
+class ShardedPriorityQueue:
+    def __init__(self, shards=None, maxsize=0):
+        self.shards = [[] for _ in range(shards or os.cpu_count() or 4)]
+        self.locks = [threading.Lock() for _ in self.shards]
+        self.counter = itertools.count()
+        self.maxsize = maxsize
+        # Liczniki pod krótką wspólną blokadą: elementy gotowe do wyjęcia i miejsca zajęte (razem z wstawianymi)
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.available = 0
+        self.reserved = 0
+        self.waiting_get = 0
+        self.waiting_put = 0
+        self.waiters = []
+
+    def qsize(self):
+        return self.available
+
+    def empty(self):
+        return self.available == 0
+
+    # Czeka na condition, dopóki blocked() jest prawdą; False, gdy skończył się czas
+    def wait(self, condition, blocked, block, timeout):
+        if not blocked():
+            return True
+        if not block:
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while blocked():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            condition.wait(remaining)
+        return True
+
+    def reserve(self, n, block, timeout):
+        if not self.maxsize:
+            return
+        with self.lock:
+            # Paczka większa niż maxsize wchodzi do pustej kolejki, inaczej czekałaby w nieskończoność
+            def blocked():
+                return self.reserved + n > self.maxsize and self.reserved > 0
+            self.waiting_put += 1
+            ok = self.wait(self.not_full, blocked, block, timeout)
+            self.waiting_put -= 1
+            if not ok:
+                raise queue.Full
+            self.reserved += n
+
+    def push(self, entries):
+        i = next(self.counter) % len(self.shards)
+        with self.locks[i]:
+            h = self.shards[i]
+            if len(entries) > len(h):
+                h.extend(entries)
+                heapq.heapify(h)
+            else:
+                for entry in entries:
+                    heapq.heappush(h, entry)
+        with self.lock:
+            self.available += len(entries)
+            if self.waiting_get:
+                self.not_empty.notify(len(entries))
+            n = len(entries)
+            while n and self.waiters:
+                loop, future = self.waiters.pop()
+                # Anulowane korutyny zostawiają na liście zakończone future
+                if not future.done():
+                    loop.call_soon_threadsafe(wake_future, future)
+                    n -= 1
+
+    def put(self, priority, item, block=True, timeout=None):
+        self.reserve(1, block, timeout)
+        self.push([(priority, next(self.counter), item)])
+
+    def put_many(self, pairs, block=True, timeout=None):
+        entries = [(priority, next(self.counter), item) for priority, item in pairs]
+        if entries:
+            self.reserve(len(entries), block, timeout)
+            self.push(entries)
+
+    # Rezerwuje do k elementów do wyjęcia (co najmniej jeden, czekając jak get)
+    def take(self, k, block, timeout):
+        with self.lock:
+            self.waiting_get += 1
+            ok = self.wait(self.not_empty, lambda: self.available == 0, block, timeout)
+            self.waiting_get -= 1
+            if not ok:
+                raise queue.Empty
+            m = min(k, self.available)
+            self.available -= m
+            return m
+
+    # Wyjmuje m elementów, o których wiemy (take), że są w shardach. Z najlepszego shardu bierzemy elementy, dopóki nie są
+    # większe od wierzchołka drugiego najlepszego shardu
+    def pop(self, m):
+        out = []
+        while len(out) < m:
+            best = second = None
+            for i, h in enumerate(self.shards):
+                try:
+                    entry = h[0]
+                except IndexError:
+                    continue
+                if best is None or entry < best[1]:
+                    best, second = (i, entry), best
+                elif second is None or entry < second[1]:
+                    second = (i, entry)
+            if best is None:
+                continue
+            limit = second[1] if second is not None else None
+            with self.locks[best[0]]:
+                h = self.shards[best[0]]
+                while h and len(out) < m and (limit is None or h[0] <= limit or not out):
+                    entry = heapq.heappop(h)
+                    out.append((entry[0], entry[2]))
+        if self.maxsize:
+            with self.lock:
+                self.reserved -= m
+                if self.waiting_put:
+                    self.not_full.notify_all()
+        return out
+
+    def get(self, block=True, timeout=None):
+        return self.pop(self.take(1, block, timeout))[0]
+
+    def get_many(self, k, block=True, timeout=None):
+        return self.pop(self.take(k, block, timeout))
+
+    async def async_get(self):
+        # Import asyncio (~50 ms) płacimy dopiero przy pierwszym użyciu, a nie przy każdym imporcie modułu
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.lock:
+                if self.available:
+                    self.available -= 1
+                    break
+                future = loop.create_future()
+                self.waiters.append((loop, future))
+            await future
+        return self.pop(1)[0]
+
+#
+# Złożoność obliczeniowa: put to O(lgn) (n/S elementów w shardzie), put_many z k elementami to O(n/S + k) (heapify),
+# get to O(S + lgn) - podgląd S wierzchołków i wyjęcie z jednego kopca. W CPythonie z GIL wątki i tak nie wykonują kodu
+# Pythona równolegle, więc shardy skracają głównie czas czekania na blokady. Pojedyncze put/get są przez to wolniejsze niż
+# w queue.PriorityQueue (podgląd shardów kosztuje), a zysk dają operacje paczkami: put_many/get_many płacą za blokady
+# i podgląd raz na paczkę.
+# Złożoność pamięciowa: Theta(n + S).
 # =================================================================================================
 #
 # =================================================================================================
@@ -112,7 +602,8 @@ def hash_insert(T, k, hash):
     i = 0
     while i < m:
         j = hash(k,i)
-        if T[j] == 'NIL':
+        # Miejsce po usuniętym kluczu (DELETED, opis niżej) też jest wolne
+        if T[j] == 'NIL' or T[j] == 'DELETED':
             T[j] = k
             return j
         else: 
@@ -143,6 +634,14 @@ def hash_search(T, k, hash):
 # miejsce nowy element. Jeśli mamy do czynienia z sytuacją, gdzie będziemy chcieli usuwać klucze, to lepiej stosować metodę
 # łańcuchową omówioną w wyższych punktach.
 #
+
+def hash_delete(T, k, hash):
+    j = hash_search(T, k, hash)
+    if j != 'NIL':
+        T[j] = 'DELETED'
+    return j
+
+#
 # Implementacja funkcji hashującej:
 # Na wykładzie omawiane były trzy możliwości. Adresowanie liniowe, kwadratowe, oraz hashowanie dwukrotne. Żadna z tych opcji nie
 # daje nam funkcji, która spełnia własność prostego równomiernego hashowania, gdyż choć wszystkie generują permutacje zbioru 
@@ -157,6 +656,721 @@ def hash_search(T, k, hash):
 # - liczba porównań w wyszukiwaniu, gdy nie ma elementu jest:        <= 1/(1-alfa)
 # - liczba porównań w wyszukiwaniu, gdy element się znajduje jest:   <= (1/alfa) * ln[1/(1-alfa)]
 # - liczba porównań we wstawianiu elementu do tablicy jest:          <= 1/(1-alfa)
+#
+#   d) biblioteka funkcji hashujących:
+# Żeby nie pisać funkcji h'(k) za każdym razem od nowa, poniżej są gotowe rodziny funkcji hashujących. Każda najpierw liczy
+# 64-bitowy hash klucza (hash64), a potem sprowadza go do przedziału {0,1,...,m-1} (reduce). Obiekt rodziny można wywołać
+# jak zwykłą funkcję h(k, m), a metoda many hashuje od razu całą tablicę kluczy (np. array('q')) i zwraca tablicę typowaną.
+# Klucze niebędące liczbami całkowitymi zamieniamy najpierw na liczbę wbudowaną funkcją hash Pythona.
+#
+# - dzielenie: h(k) = k mod m, dokładnie jak w punkcie b). Dobre dla m pierwszego (np. 701), złe dla m = 2^p.
+# - mnożenie (Knuth): zamiast floor(m*(A*k mod 1)) na liczbach zmiennoprzecinkowych liczymy to samo na liczbach całkowitych.
+#   Niech A' = floor(A * 2^64), gdzie A = (sqrt(5)-1)/2. Wtedy (A'*k) mod 2^64 to część ułamkowa A*k zapisana na 64 bitach,
+#   a dla m = 2^p h(k) = ((A'*k) mod 2^64) >> (64-p), czyli p najstarszych bitów części ułamkowej. Zamiast dzielenia mamy
+#   jedno mnożenie, maskę i przesunięcie.
+# - haszowanie uniwersalne (Carter-Wegman): h_(a,b)(k) = ((a*k + b) mod P) mod m, gdzie P = 2^61 - 1 jest liczbą pierwszą,
+#   a a, b losujemy (z ziarna). Dla dowolnych dwóch różnych kluczy < P prawdopodobieństwo kolizji po losowaniu (a,b) wynosi
+#   co najwyżej 1/m, niezależnie od tego, jakie klucze dostaniemy - nawet złośliwy użytkownik nie wymusi wielu kolizji.
+# - haszowanie tabelaryczne (simple tabulation): klucz 64-bitowy dzielimy na 8 bajtów, dla każdej pozycji bajtu mamy tablicę
+#   256 losowych liczb 64-bitowych i wynik to XOR ośmiu wylosowanych wartości. Tylko odczyty z małych tablic i XOR, a
+#   teoretycznie zachowuje się prawie jak w pełni losowa funkcja (m.in. dobre gwarancje dla adresowania liniowego).
+# Dla wszystkich rodzin oprócz dzielenia reduce to (hash64 * m) >> 64, co dla m = 2^p daje p najstarszych bitów, a dla
+# innych m też jest równomierne (i nie wymaga dzielenia).
+#
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+
+def key_to_int(k):
+    return k if isinstance(k, int) else hash(k)
+
+class HashFamily:
+    # Czy rodzinę można przelosować (konstruktor przyjmuje seed)
+    randomized = False
+
+    def hash64(self, k):
+        raise NotImplementedError
+
+    def reduce(self, h, m):
+        return (h * m) >> 64
+
+    def __call__(self, k, m):
+        return self.reduce(self.hash64(key_to_int(k)), m)
+
+    def many(self, keys, m):
+        # Tablica typowana liczb całkowitych nie potrzebuje key_to_int; wynik wpisujemy wprost do array('Q'), bez listy
+        if not (isinstance(keys, array.array) and keys.typecode in 'bBhHiIlLqQ'):
+            keys = map(key_to_int, keys)
+        return array.array('Q', map(self.reduce, map(self.hash64, keys), itertools.repeat(m)))
+
+class DivisionHash(HashFamily):
+    def hash64(self, k):
+        return k & MASK64
+
+    def reduce(self, h, m):
+        return h % m
+
+class MultiplicativeHash(HashFamily):
+    # A' = floor(2^64 * (sqrt(5)-1)/2)
+    def __init__(self, A=11400714819323198485):
+        self.A = A
+
+    def hash64(self, k):
+        return (k * self.A) & MASK64
+
+class UniversalHash(HashFamily):
+    P = 2**61 - 1
+    randomized = True
+
+    def __init__(self, seed=None):
+        rng = random.Random(seed)
+        self.a = rng.randrange(1, self.P)
+        self.b = rng.randrange(0, self.P)
+
+    def hash64(self, k):
+        h = (self.a * k + self.b) % self.P
+        # Wynik ma 61 bitów, rozciągamy go na 64 (3 najstarsze bity trafiają na koniec)
+        return ((h << 3) | (h >> 58)) & MASK64
+
+class TabulationHash(HashFamily):
+    randomized = True
+
+    def __init__(self, seed=None):
+        rng = random.Random(seed)
+        self.tables = [[rng.getrandbits(64) for _ in range(256)] for _ in range(8)]
+
+    def hash64(self, k):
+        h = 0
+        for table in self.tables:
+            h ^= table[k & 0xFF]
+            k >>= 8
+        return h
+
+HASH_FAMILIES = {
+    'division': DivisionHash,
+    'multiplicative': MultiplicativeHash,
+    'universal': UniversalHash,
+    'tabulation': TabulationHash,
+}
+
+#
+# Złożoność obliczeniowa: O(1) na klucz dla każdej rodziny (tabelaryczne robi 8 odczytów), many to Theta(n).
+# Złożoność pamięciowa: O(1), poza tabelarycznym, które trzyma 8*256 liczb (16 KB).
+#
+#   e) słownik na adresowaniu otwartym (HashTable):
+# Procedury hash_insert, hash_search i hash_delete działają na tablicy o stałym rozmiarze, a funkcję h(k,i) musimy napisać
+# sami. Z powyższych wzorów widać, że gdy alfa zbliża się do 1, to liczba porównań rośnie jak 1/(1-alfa), więc w praktyce
+# tablicę powiększamy, gdy alfa przekroczy ustalony próg (np. 0.5). Powiększenie to przepisanie wszystkich kluczy do nowej
+# tablicy (nowe m, więc nowe wartości h), czyli Theta(n) - w zamortyzowanym sensie O(1) na wstawienie, jak w tablicy
+# dynamicznej, bo tablicę podwajamy. Problem w tym, że to jedno wstawienie, które wywołało powiększenie, trwa Theta(n), co przy
+# milionach kluczy jest odczuwalną przerwą. Dlatego przepisujemy stopniowo (incremental rehash): po rozpoczęciu powiększania
+# trzymamy dwie tablice - starą i nową. Nowe klucze trafiają do nowej, a każde wstawienie lub usunięcie przenosi przy okazji
+# kilka kolejnych komórek ze starej tablicy do nowej. Wyszukiwanie sprawdza obie tablice. Liczbę przenoszonych komórek
+# dobieramy tak, żeby stara tablica opróżniła się, zanim nowa dojdzie do progu alfa.
+#
+# Usunięte klucze zostawiają komórki DELETED (tzw. nagrobki, tombstones). Nie zmniejszają one liczby kluczy, ale wydłużają
+# wyszukiwania tak samo jak prawdziwe klucze, więc do progu alfa liczymy klucze razem z nagrobkami. Jeśli próg przekroczyły
+# głównie nagrobki (kluczy jest mniej niż połowa progu), to zamiast podwajać tablicę, przepisujemy ją do tablicy tego samego
+# rozmiaru - wtedy wszystkie nagrobki znikają (kompaktowanie). Kompaktowanie też odbywa się stopniowo.
+#
+# Rozmiar tablicy m to zawsze potęga dwójki, a funkcję h'(k) bierzemy domyślnie multiplikatywną z punktu d) (starsze bity
+# iloczynu, więc nie dotyczy jej problem "k mod 2^p bierze tylko najmłodsze bity"), ale można podać dowolną rodzinę z d).
+# Przy m = 2^p wszystkie trzy metody adresowania przechodzą przez całą tablicę:
+# - liniowe:      h(k,i) = (h'(k) + i) mod m
+# - kwadratowe:   h(k,i) = (h'(k) + (i + i^2)/2) mod m, czyli A = B = 1/2 - kolejne liczby trójkątne dają permutację {0...m-1}
+# - dwukrotne:    h(k,i) = (h_1(k) + i*h_2(k)) mod m, gdzie h_2(k) jest nieparzyste, więc względnie pierwsze z m
+#
+
+# Tablica dla hash_insert / hash_search: T[j] to klucz, T.values[j] to wartość przypisana do klucza
+class HashSlots:
+    def __init__(self, m):
+        self.size = m
+        self.keys = ['NIL'] * m
+        self.values = [None] * m
+
+    def __getitem__(self, j):
+        return self.keys[j]
+
+    def __setitem__(self, j, k):
+        self.keys[j] = k
+
+def linear_probing(h, m):
+    def probe(k, i):
+        return (h(k, m) + i) & (m - 1)
+    return probe
+
+def quadratic_probing(h, m):
+    def probe(k, i):
+        return (h(k, m) + (i + i*i) // 2) & (m - 1)
+    return probe
+
+def double_hashing(h, m):
+    # Druga funkcja hashująca: inne bity 64-bitowego hasha, jeśli h to rodzina z d), a dla zwykłej funkcji h(k, m)
+    # wbudowany hash(k)
+    if hasattr(h, 'hash64'):
+        def h2(k):
+            return h.hash64(key_to_int(k))
+    else:
+        h2 = hash
+    def probe(k, i):
+        # Wymuszona nieparzystość, więc krok jest względnie pierwszy z m
+        return (h(k, m) + i * ((h2(k) >> 1) | 1)) & (m - 1)
+    return probe
+
+PROBINGS = {
+    'linear': linear_probing,
+    'quadratic': quadratic_probing,
+    'double': double_hashing,
+}
+
+# Znacznik braku wartości w HashTable - w odróżnieniu od None czy 'NIL' nie może być wartością w tablicy
+_MISSING = object()
+
+class HashTable:
+    def __init__(self, probing='linear', max_load=0.5, capacity=8, h=None):
+        if not 0 < max_load < 1:
+            raise ValueError("Współczynnik zapełnienia alfa musi należeć do przedziału (0,1)")
+        self.make_probe = PROBINGS[probing]
+        self.h = h if h is not None else MultiplicativeHash()
+        self.max_load = max_load
+        # Liczba komórek przenoszonych przy każdej operacji podczas stopniowego przepisywania
+        self.step = int(2 / max_load) + 2
+        m = 1
+        while m < capacity:
+            m *= 2
+        self.table = HashSlots(m)
+        self.probe = self.make_probe(self.h, m)
+        self.count = 0
+        self.used = 0           # klucze + nagrobki w self.table
+        self.old = None         # tablica, z której aktualnie przepisujemy
+        self.old_probe = None
+        self.cursor = 0
+
+    def __len__(self):
+        return self.count
+
+    def search(self, k, default=None):
+        j = hash_search(self.table, k, self.probe)
+        if j != 'NIL':
+            return self.table.values[j]
+        if self.old is not None:
+            j = hash_search(self.old, k, self.old_probe)
+            if j != 'NIL':
+                return self.old.values[j]
+        return default
+
+    def insert(self, k, v):
+        self.migrate()
+        j = hash_search(self.table, k, self.probe)
+        if j != 'NIL':
+            self.table.values[j] = v
+            return
+        if self.old is not None and hash_delete(self.old, k, self.old_probe) != 'NIL':
+            self.count -= 1
+        if self.used + 1 > self.max_load * self.table.size:
+            self.start_rehash()
+        j = hash_insert(self.table, k, self.probe)
+        self.table.values[j] = v
+        self.count += 1
+        self.used += 1
+
+    def delete(self, k):
+        self.migrate()
+        j = hash_delete(self.table, k, self.probe)
+        if j == 'NIL' and self.old is not None:
+            j = hash_delete(self.old, k, self.old_probe)
+        if j == 'NIL':
+            return False
+        self.count -= 1
+        return True
+
+    def start_rehash(self):
+        # Nie zaczynamy nowego przepisywania, dopóki trwa poprzednie
+        self.finish_rehash()
+        live = self.count
+        m = self.table.size
+        if live >= self.max_load * m / 2:
+            m *= 2
+        self.old = self.table
+        self.old_probe = self.probe
+        self.cursor = 0
+        self.table = HashSlots(m)
+        self.probe = self.make_probe(self.h, m)
+        self.used = 0
+
+    def migrate(self, steps=None):
+        if self.old is None:
+            return
+        if steps is None:
+            steps = self.step
+        end = min(self.old.size, self.cursor + steps)
+        for j in range(self.cursor, end):
+            k = self.old[j]
+            if k != 'NIL' and k != 'DELETED':
+                slot = hash_insert(self.table, k, self.probe)
+                self.table.values[slot] = self.old.values[j]
+                self.used += 1
+                # Przeniesiony klucz nie może zostać znaleziony w starej tablicy
+                self.old[j] = 'DELETED'
+        self.cursor = end
+        if self.cursor == self.old.size:
+            self.old = None
+            self.old_probe = None
+
+    def finish_rehash(self):
+        if self.old is not None:
+            self.migrate(self.old.size)
+
+    def items(self):
+        for T in (self.table, self.old):
+            if T is None:
+                continue
+            for j in range(T.size):
+                if T[j] != 'NIL' and T[j] != 'DELETED':
+                    yield T[j], T.values[j]
+
+    # Żeby dało się używać tablicy jak zwykłego słownika Pythona
+    def __getitem__(self, k):
+        v = self.search(k, _MISSING)
+        if v is _MISSING:
+            raise KeyError(k)
+        return v
+
+    def __setitem__(self, k, v):
+        self.insert(k, v)
+
+    def __delitem__(self, k):
+        if not self.delete(k):
+            raise KeyError(k)
+
+    def __contains__(self, k):
+        return self.search(k, _MISSING) is not _MISSING
+
+#
+# Złożoność obliczeniowa: przy alfa ograniczonym przez stały próg < 1 wstawianie, wyszukiwanie i usuwanie mają oczekiwany czas
+# O(1) (wzory powyżej), a dzięki stopniowemu przepisywaniu także pesymistyczny koszt pojedynczego wstawienia związany ze zmianą
+# rozmiaru to O(1/alfa) przeniesionych komórek zamiast Theta(n). W trakcie przepisywania wyszukiwanie sprawdza dwie tablice.
+# Złożoność pamięciowa: Theta(n/alfa), w trakcie przepisywania chwilowo do 3 razy więcej (stara i dwa razy większa nowa).
+# Uwaga: 'NIL' i 'DELETED' są zarezerwowane jako znaczniki pustych komórek, więc nie mogą być kluczami. search przy braku
+# klucza zwraca default (domyślnie None), jak pozostałe mapy w tym pliku.
+#
+#   f) tablica Robin Hood z bajtami kontrolnymi (jak SwissTable) dla kluczy całkowitych:
+# HashTable trzyma klucze i wartości jako obiekty Pythona w listach, a przy każdej komórce porównuje pełny klucz. Dla dużych
+# tablic z kluczami całkowitymi można zrobić dużo lepiej:
+#
+# - Klucze i wartości trzymamy w dwóch równoległych tablicach typowanych (array('q') - 8 bajtów na liczbę zamiast obiektu).
+# - Obok trzymamy tablicę bajtów kontrolnych: dla zajętej komórki jest to 7-bitowy "odcisk" hasha (fingerprint, bity
+#   24...30, które nie pokrywają się z najstarszymi bitami wybierającymi komórkę), a dla pustej bajt 0x80 (EMPTY). Porównanie
+#   pełnego klucza robimy tylko w komórkach, których odcisk się zgadza, czyli średnio w 1/128 komórek z niepasującym kluczem.
+# - Bajty kontrolne sprawdzamy grupami po 8 naraz: 8 bajtów to jedna 64-bitowa liczba, a to, które bajty są równe odciskowi,
+#   sprawdza się kilkoma operacjami bitowymi (SWAR, "SIMD within a register"). Niech x = grupa XOR (odcisk powtórzony 8 razy).
+#   Bajty równe odciskowi są w x zerami, a zerowe bajty wskazuje maska (x - 0x0101...01) & ~x & 0x8080...80. Maska może
+#   dać fałszywy alarm (przeniesienie z niższego bajtu), ale i tak porównujemy potem pełny klucz, więc to nie szkodzi.
+#   Pusta komórka w grupie to bajt z ustawionym najstarszym bitem: grupa & 0x8080...80. Żeby grupa zaczynająca się pod koniec
+#   tablicy nie musiała "zawijać", pierwsze 8 bajtów kontrolnych jest skopiowane za koniec tablicy.
+# - Kolizje rozwiązujemy adresowaniem liniowym z regułą Robin Hooda: przy wstawianiu każdy klucz "pamięta", jak daleko jest
+#   od swojej komórki domowej (dist). Jeśli nowy klucz jest dalej od domu niż klucz, który stoi w komórce, to zabiera mu
+#   miejsce ("zabiera bogatym, daje biednym"), a wyrzucony klucz szuka miejsca dalej. Dzięki temu odległości od domu są
+#   wyrównane - wariancja długości przeszukiwania jest mała, a najdłuższe przeszukiwanie rośnie jak O(lgn).
+# - Przy usuwaniu nie ma nagrobków: kolejne klucze z dist > 0 przesuwamy o jedno miejsce w lewo (backward shift). Dzięki
+#   temu klucz zawsze stoi w ciągłym bloku zajętych komórek zaczynającym się od jego domu, więc wyszukiwanie kończymy na
+#   pierwszej grupie z pustą komórką, albo gdy przekroczymy największą odległość od domu w tablicy.
+# - Odległość od domu trzymamy w jednym bajcie. Przekroczenie 255 przy zapełnieniu co najmniej max_load/2 oznacza po
+#   prostu tłok, więc tablicę powiększamy. Przy mniejszym zapełnieniu winna jest funkcja hashująca (np. dzielenie
+#   i klucze co m) - powiększanie niczego nie naprawi, a tablica rosłaby bez końca. Wtedy rodzinę losową (universal,
+#   tabulation) losujemy od nowa z innym ziarnem (co najwyżej MAX_RESEEDS razy), a dla pozostałych zgłaszamy ValueError.
+#   Zanim cokolwiek zapiszemy, insert sprawdza (overflows), czy przekroczenie nastąpi, więc błąd zostawia tablicę bez
+#   zmian, a przebudowa, która się nie uda, przywraca poprzednie tablice.
+#
+
+GROUP = 8
+EMPTY = 0x80
+LSB = 0x0101010101010101
+MSB = 0x8080808080808080
+MAX_RESEEDS = 3
+
+# Wewnętrzny sygnał: przy przebudowie któryś klucz byłby dalej niż 255 komórek od domu
+class ProbeOverflow(Exception):
+    pass
+
+class RobinHoodHashTable:
+    def __init__(self, capacity=16, max_load=0.875, value_type='q', h=None):
+        self.h = h if h is not None else MultiplicativeHash()
+        self.max_load = max_load
+        self.value_type = value_type
+        self.reseeds = 0
+        m = GROUP
+        while m < capacity:
+            m *= 2
+        self.allocate(m)
+
+    def allocate(self, m):
+        self.m = m
+        self.p = m.bit_length() - 1
+        self.ctrl = bytearray([EMPTY]) * (m + GROUP)
+        self.dist = bytearray(m)
+        self.keys = array.array('q', bytes(8 * m))
+        self.values = array.array(self.value_type, bytes(array.array(self.value_type).itemsize * m))
+        self.count = 0
+        self.max_dist = 0
+
+    def __len__(self):
+        return self.count
+
+    def set_ctrl(self, i, byte):
+        self.ctrl[i] = byte
+        if i < GROUP:
+            self.ctrl[self.m + i] = byte
+
+    # Zwraca indeks komórki z kluczem k albo -1
+    def find(self, k):
+        h = self.h.hash64(k)
+        fp = (h >> 24) & 0x7F
+        pattern = fp * LSB
+        mask = self.m - 1
+        pos = self.h.reduce(h, self.m)
+        d = 0
+        while d <= self.max_dist:
+            group = int.from_bytes(self.ctrl[pos:pos+GROUP], 'little')
+            x = group ^ pattern
+            matches = (x - LSB) & ~x & MSB
+            while matches:
+                bit = matches & -matches
+                slot = (pos + ((bit.bit_length() - 1) >> 3)) & mask
+                if self.keys[slot] == k:
+                    return slot
+                matches ^= bit
+            if group & MSB:
+                return -1
+            pos = (pos + GROUP) & mask
+            d += GROUP
+        return -1
+
+    def search(self, k, default=None):
+        slot = self.find(k)
+        return default if slot < 0 else self.values[slot]
+
+    def insert(self, k, v):
+        slot = self.find(k)
+        if slot >= 0:
+            self.values[slot] = v
+            return
+        if self.count + 1 > self.max_load * self.m:
+            self.resize(2 * self.m)
+        # Wędrujący klucz jest co najwyżej 1 dalej od domu niż max_dist, więc przy mniejszym max_dist nie ma ryzyka
+        while self.max_dist >= 255 and self.overflows(k):
+            self.overflow()
+        self.place(k, v)
+
+    def place(self, k, v):
+        mask = self.m - 1
+        h = self.h.hash64(k)
+        fp = (h >> 24) & 0x7F
+        pos = self.h.reduce(h, self.m)
+        d = 0
+        while True:
+            if self.ctrl[pos] == EMPTY:
+                self.keys[pos] = k
+                self.values[pos] = v
+                self.dist[pos] = d
+                self.set_ctrl(pos, fp)
+                self.count += 1
+                self.max_dist = max(self.max_dist, d)
+                return
+            # Robin Hood: biedniejszy (dalej od domu) zabiera miejsce
+            if self.dist[pos] < d:
+                k, self.keys[pos] = self.keys[pos], k
+                v, self.values[pos] = self.values[pos], v
+                d, self.dist[pos] = self.dist[pos], d
+                old_fp = self.ctrl[pos]
+                self.set_ctrl(pos, fp)
+                fp = old_fp
+                self.max_dist = max(self.max_dist, self.dist[pos])
+            pos = (pos + 1) & mask
+            d += 1
+            # Odległość trzymamy w jednym bajcie (insert sprawdza to wcześniej, tu trafiamy tylko przy przebudowie)
+            if d > 255:
+                raise ProbeOverflow
+
+    # To samo przejście co w place, ale bez zapisów - czy wstawienie k przekroczy odległość 255
+    def overflows(self, k):
+        mask = self.m - 1
+        pos = self.h.reduce(self.h.hash64(k), self.m)
+        d = 0
+        while self.ctrl[pos] != EMPTY:
+            if self.dist[pos] < d:
+                d = self.dist[pos]
+            pos = (pos + 1) & mask
+            d += 1
+            if d > 255:
+                return True
+        return False
+
+    def overflow(self):
+        # Tłok - wystarczy powiększyć tablicę
+        if self.count >= self.max_load * self.m / 2:
+            try:
+                self.rebuild(2 * self.m, self.h)
+                return
+            except ProbeOverflow:
+                pass
+        # Przy małym zapełnieniu winna jest funkcja hashująca - losujemy nową albo zgłaszamy błąd
+        while self.h.randomized and self.reseeds < MAX_RESEEDS:
+            self.reseeds += 1
+            try:
+                self.rebuild(self.m, type(self.h)(seed=random.getrandbits(64)))
+                return
+            except ProbeOverflow:
+                pass
+        raise ValueError(f'przeszukiwanie dłuższe niż 255 komórek przy zapełnieniu {self.count}/{self.m} - '
+                         f'{type(self.h).__name__} nie rozprasza tych kluczy')
+
+    def delete(self, k):
+        slot = self.find(k)
+        if slot < 0:
+            return False
+        mask = self.m - 1
+        nxt = (slot + 1) & mask
+        # Backward shift: cofamy kolejne klucze, które nie stoją w swoim domu
+        while self.ctrl[nxt] != EMPTY and self.dist[nxt] > 0:
+            self.keys[slot] = self.keys[nxt]
+            self.values[slot] = self.values[nxt]
+            self.dist[slot] = self.dist[nxt] - 1
+            self.set_ctrl(slot, self.ctrl[nxt])
+            slot = nxt
+            nxt = (nxt + 1) & mask
+        self.set_ctrl(slot, EMPTY)
+        self.dist[slot] = 0
+        self.count -= 1
+        return True
+
+    def resize(self, m):
+        try:
+            self.rebuild(m, self.h)
+        except ProbeOverflow:
+            self.overflow()
+
+    # Przepisuje wszystkie klucze do tablicy o rozmiarze m z funkcją h; jeśli się nie uda, tablica zostaje bez zmian
+    def rebuild(self, m, h):
+        old = (self.h, self.m, self.p, self.ctrl, self.dist, self.keys, self.values, self.count, self.max_dist)
+        self.h = h
+        self.allocate(m)
+        try:
+            for i in range(old[1]):
+                if old[3][i] != EMPTY:
+                    self.place(old[5][i], old[6][i])
+        except ProbeOverflow:
+            self.h, self.m, self.p, self.ctrl, self.dist, self.keys, self.values, self.count, self.max_dist = old
+            raise
+
+    def search_many(self, keys, default=0):
+        out = array.array(self.value_type)
+        for k in keys:
+            slot = self.find(k)
+            out.append(default if slot < 0 else self.values[slot])
+        return out
+
+    def items(self):
+        for i in range(self.m):
+            if self.ctrl[i] != EMPTY:
+                yield self.keys[i], self.values[i]
+
+#
+# Złożoność obliczeniowa: oczekiwany czas wyszukiwania, wstawiania i usuwania to O(1), a najdłuższe przeszukiwanie to O(lgn)
+# z dużym prawdopodobieństwem (Robin Hood). Wyszukiwanie czyta bajty kontrolne po 8 naraz i porównuje pełny klucz średnio
+# w O(1 + alfa/128) komórkach. Powiększenie to Theta(n), jednorazowo (tu bez stopniowego przepisywania).
+# Złożoność pamięciowa: m*(8 + 8 + 1 + 1) bajtów (klucz, wartość, odległość, bajt kontrolny), bez obiektów na każdy wpis.
+# Klucze i wartości muszą mieścić się w typie tablicy (dla 'q' to liczby 64-bitowe ze znakiem).
+#
+#   g) metoda łańcuchowa na płaskich tablicach (ChainedHashMap):
+# Metoda łańcuchowa z punktu b) trzyma w każdym wiaderku osobną listę, czyli osobny obiekt na każde wiaderko i na każdy
+# element. Jeśli większość kluczy znamy z góry (budujemy słownik z dużej tablicy par klucz/wartość), to wszystkie łańcuchy
+# można trzymać w jednej tablicy, jeden za drugim, posortowane po numerze wiaderka (tak jak macierze rzadkie w formacie
+# CSR). Wtedy offsets[b] to początek łańcucha wiaderka b w tablicach keys/values, a counts[b] to jego długość.
+#
+# - Budowa (build): to jest counting sort z sorting.py z numerem wiaderka jako kluczem. Jedno przejście liczy wiaderka
+#   (hashujemy wszystkie klucze naraz metodą many) i zlicza ich rozmiary, sumy prefiksowe dają offsets, a drugie przejście
+#   rozkłada pary na miejsca. Dwa liniowe przejścia po tablicach typowanych, żadnych list w wiaderkach.
+#   Jeśli klucz powtarza się w danych, wygrywa ostatnie wystąpienie: drugie przejście idzie od końca danych i przed
+#   wpisaniem klucza sprawdza już wpisaną część jego łańcucha (średnio O(alfa) porównań). Powtórzenie pomijamy, a
+#   wiaderko kończy się wtedy przed końcem swojego miejsca (counts[b] < offsets[b+1] - offsets[b]), jak po usunięciu.
+# - Wstawianie po budowie: klucz już obecny aktualizujemy w miejscu. Nowy klucz trafia do obszaru przepełnienia - osobnych
+#   tablic ov_keys/ov_values z łańcuchami przez indeksy (ov_next, heads[b] to pierwszy element łańcucha wiaderka b, -1 to NIL).
+#   Gdy n/m przekroczy max_load, budujemy wszystko od nowa dla dwa razy większego m (wtedy obszar przepełnienia znika).
+# - Usuwanie: w części CSR zamieniamy usuwany element z ostatnim w łańcuchu i zmniejszamy counts[b], w obszarze
+#   przepełnienia odpinamy element z łańcucha i dokładamy jego komórkę do listy wolnych (free).
+# - Wyszukiwanie wielu kluczy naraz (search_many): najpierw many liczy wszystkie wiaderka, potem przeglądamy łańcuchy.
+#
+
+class ChainedHashMap:
+    def __init__(self, keys=(), values=(), max_load=1.0, value_type='q', h=None):
+        self.h = h if h is not None else MultiplicativeHash()
+        self.max_load = max_load
+        self.value_type = value_type
+        self.build(keys, values)
+
+    def build(self, keys, values, m=1):
+        keys = keys if isinstance(keys, array.array) and keys.typecode == 'q' else array.array('q', keys)
+        values = values if isinstance(values, array.array) else array.array(self.value_type, values)
+        n = len(keys)
+        while m * self.max_load < n:
+            m *= 2
+        self.m = m
+        buckets = self.h.many(keys, m)
+        # Przejście 1: rozmiary wiaderek i sumy prefiksowe
+        counts = array.array('q', bytes(8 * m))
+        for b in buckets:
+            counts[b] += 1
+        offsets = array.array('q', [0])
+        offsets.extend(itertools.accumulate(counts))
+        # Przejście 2 (od końca, żeby wygrało ostatnie wystąpienie): rozkładamy pary na miejsca, pomijając powtórzenia
+        out_keys = array.array('q', bytes(8 * n))
+        out_values = array.array(self.value_type, bytes(values.itemsize * n))
+        fill = array.array('q', offsets)
+        for b, k, v in zip(reversed(buckets), reversed(keys), reversed(values)):
+            j = fill[b]
+            start = offsets[b]
+            while start < j:
+                if out_keys[start] == k:
+                    break
+                start += 1
+            else:
+                out_keys[j] = k
+                out_values[j] = v
+                fill[b] = j + 1
+        counts = array.array('q', map(operator.sub, fill, offsets))
+        del counts[m]
+        count = sum(counts)
+        self.keys = out_keys
+        self.values = out_values
+        self.offsets = offsets
+        self.counts = counts
+        self.count = count
+        self.heads = array.array('q', [-1]) * m
+        self.ov_keys = array.array('q')
+        self.ov_values = array.array(self.value_type)
+        self.ov_next = array.array('q')
+        self.free = -1
+
+    def __len__(self):
+        return self.count
+
+    # Zwraca (1, indeks) dla części CSR, (2, indeks) dla obszaru przepełnienia albo (0, -1)
+    def find(self, k, b):
+        start = self.offsets[b]
+        for j in range(start + self.counts[b] - 1, start - 1, -1):
+            if self.keys[j] == k:
+                return 1, j
+        j = self.heads[b]
+        while j != -1:
+            if self.ov_keys[j] == k:
+                return 2, j
+            j = self.ov_next[j]
+        return 0, -1
+
+    def search(self, k, default=None):
+        where, j = self.find(k, self.h(k, self.m))
+        if where == 1:
+            return self.values[j]
+        if where == 2:
+            return self.ov_values[j]
+        return default
+
+    def __contains__(self, k):
+        return self.find(k, self.h(k, self.m))[0] != 0
+
+    def search_many(self, keys, default=0):
+        keys = keys if isinstance(keys, array.array) and keys.typecode == 'q' else array.array('q', keys)
+        buckets = self.h.many(keys, self.m)
+        out = array.array(self.value_type, bytes(array.array(self.value_type).itemsize * len(keys)))
+        find = self.find
+        for i in range(len(keys)):
+            where, j = find(keys[i], buckets[i])
+            out[i] = self.values[j] if where == 1 else self.ov_values[j] if where == 2 else default
+        return out
+
+    def insert(self, k, v):
+        b = self.h(k, self.m)
+        where, j = self.find(k, b)
+        if where == 1:
+            self.values[j] = v
+            return
+        if where == 2:
+            self.ov_values[j] = v
+            return
+        if self.count + 1 > self.max_load * self.m:
+            keys, values = self.arrays()
+            keys.append(k)
+            values.append(v)
+            self.build(keys, values, 2 * self.m)
+            return
+        if self.free != -1:
+            j = self.free
+            self.free = self.ov_next[j]
+            self.ov_keys[j] = k
+            self.ov_values[j] = v
+            self.ov_next[j] = self.heads[b]
+        else:
+            j = len(self.ov_keys)
+            self.ov_keys.append(k)
+            self.ov_values.append(v)
+            self.ov_next.append(self.heads[b])
+        self.heads[b] = j
+        self.count += 1
+
+    def remove_csr(self, b, j):
+        last = self.offsets[b] + self.counts[b] - 1
+        self.keys[j] = self.keys[last]
+        self.values[j] = self.values[last]
+        self.counts[b] -= 1
+        self.count -= 1
+
+    def delete(self, k):
+        b = self.h(k, self.m)
+        where, j = self.find(k, b)
+        if where == 1:
+            self.remove_csr(b, j)
+            return True
+        if where == 0:
+            return False
+        prev = -1
+        cur = self.heads[b]
+        while cur != j:
+            prev = cur
+            cur = self.ov_next[cur]
+        if prev == -1:
+            self.heads[b] = self.ov_next[j]
+        else:
+            self.ov_next[prev] = self.ov_next[j]
+        self.ov_next[j] = self.free
+        self.free = j
+        self.count -= 1
+        return True
+
+    def items(self):
+        for b in range(self.m):
+            start = self.offsets[b]
+            for j in range(start, start + self.counts[b]):
+                yield self.keys[j], self.values[j]
+            j = self.heads[b]
+            while j != -1:
+                yield self.ov_keys[j], self.ov_values[j]
+                j = self.ov_next[j]
+
+    # Wszystkie pary jako dwie tablice typowane (np. do przebudowy)
+    def arrays(self):
+        keys = array.array('q')
+        values = array.array(self.value_type)
+        for k, v in self.items():
+            keys.append(k)
+            values.append(v)
+        return keys, values
+
+#
+# Złożoność obliczeniowa: budowa z n par to Theta(n + m) - dwa przejścia jak w counting sorcie. Wyszukiwanie, wstawianie
+# i usuwanie w średnim przypadku O(1 + alfa), jak w zwykłej metodzie łańcuchowej. Przebudowa po przekroczeniu max_load
+# to Theta(n), ale podwaja m, więc zamortyzowany koszt wstawiania pozostaje O(1).
+# Złożoność pamięciowa: Theta(n + m) - dwie tablice typowane na pary, offsets i counts na wiaderka, a obszar przepełnienia
+# dodatkowo po 8 bajtów na indeks następnika.
 # =================================================================================================
 #
 # =================================================================================================
@@ -195,9 +1409,9 @@ def tree_search(node, k):
     if node == 'NIL' or node.key == k:
         return node
     if k < node.key:
-        tree_search(node.left, k)
+        return tree_search(node.left, k)
     else:
-        tree_search(node.right, k)
+        return tree_search(node.right, k)
 
 def iterative_tree_search(node, k):
     while node != 'NIL' and node.key != k:
@@ -272,7 +1486,7 @@ def insert_node(T, node):
 
 def successor(node):
     if node.right != 'NIL':
-        return maximum(node.right)
+        return minimum(node.right)
     prev = node.parent
 
     # korzystamy z logicznego zaprzeczenia: 
@@ -344,13 +1558,13 @@ def remove_node(T, node):
         transplant(T, node, node.left)
     # Dwójka dzieci, y to następnik
     else:
-        y = successor(node.right)
+        y = minimum(node.right)
         # Schowany głębiej w drzewie, szykujemy do wstawienia
         if y.parent != node:
             transplant(T, y, y.right)
             y.right = node.right
             y.right.parent = y
-        transplant(T, node.left, y.left)
+        transplant(T, node, y)
         y.left = node.left
         y.left.parent = y
 
@@ -389,8 +1603,8 @@ def remove_node(T, node):
 # czarne o n-węzłach ma wysokość h <= 2*lg(n+1). Można to udowodnić wpierw dowodząc w sposób indukcyjny lemat stanowiący, że
 # poddrzewo o korzeniu x ma co najwyżej 2^(bh(x)) - 1 węzłów wewnętrznych i połączyć to z faktem, że bh(T) >= n/2.
 # Dla drzew czerwono-czarnych należy zmodyfikować operację wstawiania oraz usuwania węzłów. Są one skomplikowane ze względu
-# na ilość przypadków, które należy rozpatrzeć - szczególnie usuwanie węzłów, którego nie omówiliśmy na wykładzie, dlatego
-# też nie będę o nim pisał.
+# na ilość przypadków, które należy rozpatrzeć - szczególnie usuwanie węzłów, którego nie omówiliśmy na wykładzie (jest
+# opisane w punkcie d) za Cormenem).
 #
 #   b) rotacje na węźle:
 # Procedura wykonująca rotację na danym węźle jest procedurą pomocniczą potrzebną do późniejszego usuwania węzłów.
@@ -418,11 +1632,11 @@ def left_rotate(T, x):
     y = x.right
     # Zajęcie się betą
     x.right = y.left
-    if y.left != 'NIL':
+    if y.left != T.nil:
         y.left.parent = x
     y.parent = x.parent
     # x jest korzeniem / lewym poddrzewem / prawym poddrzewem
-    if x.parent == 'NIL':
+    if x.parent == T.nil:
         T.root = y
     elif x == x.parent.left:
         x.parent.left = y 
@@ -431,13 +1645,33 @@ def left_rotate(T, x):
     # Dopięcie x jako lewego poddrzewa
     y.left = x
     x.parent = y
+    # Rozmiary poddrzew (punkt e): zmieniają się tylko w x i y
+    y.size = x.size
+    x.size = x.left.size + x.right.size + 1
 
-# Analogicznie, zostawiam pustą funkcję by interpreter się nie czepiał w dalszej notatce 
-def right_rotate(T,x):
-    return
+# Lustrzane odbicie left_rotate: zamieniamy left <-> right
+def right_rotate(T, y):
+    x = y.left
+    # Zajęcie się betą
+    y.left = x.right
+    if x.right != T.nil:
+        x.right.parent = y
+    x.parent = y.parent
+    # y jest korzeniem / lewym poddrzewem / prawym poddrzewem
+    if y.parent == T.nil:
+        T.root = x
+    elif y == y.parent.left:
+        y.parent.left = x
+    else:
+        y.parent.right = x
+    # Dopięcie y jako prawego poddrzewa
+    x.right = y
+    y.parent = x
+    x.size = y.size
+    y.size = y.left.size + y.right.size + 1
 
 #
-# Rotacja w prawo analogicznie. Złożoność obliczeniowa tych algorytmów to O(1).
+# Złożoność obliczeniowa tych algorytmów to O(1).
 #
 #   c) wstawianie węzła do RB-tree:
 # Wstawianie węzła może naruszyć dwie własności drzewa: własności II i IV. Dzieje się tak dlatego, że wpierw wstawiamy
@@ -473,7 +1707,7 @@ def right_rotate(T,x):
 #
 # Po każdym wykonanym scenariuszu wracamy do sprawdzania warunku pętli, czyli do sprawdzenia, czy rodzic naszego nowego węzła z
 # jest czerwony. Na samym końcu, gdy wychodzimy z pętli, czyli rodzic z jest koloru czarnego, sprawdzamy, czy korzeń jest czerwony
-# i ewentualnie naprawiamy to, kończąc procedurę. Co ważne, dwa pierwsze scenariusze podmieniają z na inny węzeł z którego kontynuujemy
+# i ewentualnie naprawiamy to, kończąc procedurę. Co ważne, dwa pierwsze scenariusze podmieniają z na inny węzł z którego kontynuujemy
 # sprawdzanie, a przypadek trzeci tego nie robi. Dzieje się tak dlatego, że po wykonaniu trzeciego przypadku kończymy całą procedurę, 
 # wtedy drzewo jest już naprawione. Dwa pierwsze przypadki to próba ustawienia trzeciego przypadku, będącego tym docelowym.
 #
@@ -496,14 +1730,14 @@ def insert_fixup(T, z):
                 if z == z.parent.right:
                     z = z.parent
                     left_rotate(T, z)
-                # Przypadek 1.3: linia prosta
+                # Przypadek 1.3: linia prosta, rotacja na dziadku
                 else:
                     z.parent.color = 'BLACK'
                     z.parent.parent.color = 'RED'
-                    right_rotate(T, z)
+                    right_rotate(T, z.parent.parent)
         # Przypadek 2: wujek po lewej, wszystko symetrycznie
         else:
-            y = z.parent.left
+            y = z.parent.parent.left
             if y.color == 'RED':
                 z.parent.color = 'BLACK'
                 y.color = 'BLACK'
@@ -516,11 +1750,1256 @@ def insert_fixup(T, z):
                 else:
                     z.parent.color = 'BLACK'
                     z.parent.parent.color = 'RED'
-                    left_rotate(T, z)
+                    left_rotate(T, z.parent.parent)
     # Została do naprawienia własność II:
     T.root.color = 'BLACK'
 
+# Wstawienie jak w BST (insert_node), tylko z T.nil zamiast 'NIL', zliczaniem rozmiarów poddrzew na ścieżce i naprawą
+def rb_insert(T, z):
+    y = T.nil
+    x = T.root
+    while x != T.nil:
+        y = x
+        x.size += 1
+        if z.key < x.key:
+            x = x.left
+        else:
+            x = x.right
+    z.parent = y
+    if y == T.nil:
+        T.root = z
+    elif z.key < y.key:
+        y.left = z
+    else:
+        y.right = z
+    z.left = T.nil
+    z.right = T.nil
+    z.color = 'RED'
+    z.size = 1
+    insert_fixup(T, z)
+
 # 
 # Złożoność obliczeniowa tego algorytmu to O(lgn). Na wykładzie był pokazany dowód poprzez niezmiennik pętli, ale 
 # jest bardzo długi i bardzo mało prawdopodobne, by trzeba było go znać. Na razie go pomijam.
+#
+#   d) usuwanie węzła z RB-tree:
+# Usuwanie zaczyna się tak samo jak w BST (remove_node): węzeł z co najwyżej jednym dzieckiem zastępujemy tym dzieckiem,
+# a węzeł z dwójką dzieci zastępujemy jego następnikiem y, który wcześniej wypinamy z jego miejsca. Dodatkowo pamiętamy:
+# - y: węzeł, który faktycznie znika ze swojego miejsca w drzewie (z albo jego następnik) i jego pierwotny kolor,
+# - x: węzeł, który wchodzi na miejsce y (może to być T.nil, dlatego ustawiamy mu x.parent - stąd jeden wspólny liść).
+# Jeśli y był czerwony, to nic się nie psuje: czarne wysokości się nie zmieniają, a dwóch czerwonych pod rząd nie będzie.
+# Jeśli y był czarny, to każda ścieżka przez x straciła jeden czarny węzeł. Umawiamy się, że x niesie "dodatkową czerń"
+# i przesuwamy ją w górę drzewa, aż da się ją pozbyć. Niech w będzie bratem x (x jest lewym dzieckiem, drugi przypadek symetrycznie):
+#
+# - brat w jest czerwony: zamieniamy kolory w i rodzica, rotacja w lewo na rodzicu. Teraz bratem x jest czarny węzeł
+# (dawne dziecko w), więc przechodzimy do jednego z trzech pozostałych przypadków.
+# - w jest czarny i ma dwoje czarnych dzieci: zdejmujemy czerń z x i z w (w staje się czerwony) i przenosimy ją na rodzica,
+# x = x.parent. Jeśli rodzic był czerwony, to pętla się kończy i na końcu kolorujemy go na czarno.
+# - w jest czarny, jego lewe dziecko czerwone, a prawe czarne: zamieniamy kolory w i jego lewego dziecka, rotacja w prawo
+# na w. Nowy brat ma czerwone prawe dziecko, czyli mamy ostatni przypadek.
+# - w jest czarny, jego prawe dziecko czerwone: w dostaje kolor rodzica, rodzic i prawe dziecko w stają się czarne,
+# rotacja w lewo na rodzicu. Dodatkowa czerń trafiła do nowego węzła na ścieżce, koniec (x = T.root).
+#
+# Tylko drugi przypadek idzie w górę drzewa, pozostałe wykonują co najwyżej 3 rotacje i kończą pętlę.
+#
+
+def rb_transplant(T, u, v):
+    if u.parent == T.nil:
+        T.root = v
+    elif u == u.parent.left:
+        u.parent.left = v
+    else:
+        u.parent.right = v
+    # Bez warunku: także T.nil dostaje rodzica, bo delete_fixup z niego korzysta
+    v.parent = u.parent
+
+def rb_minimum(T, node):
+    while node.left != T.nil:
+        node = node.left
+    return node
+
+def rb_delete(T, z):
+    y = z
+    y_original_color = y.color
+    if z.left == T.nil:
+        x = z.right
+        rb_transplant(T, z, z.right)
+    elif z.right == T.nil:
+        x = z.left
+        rb_transplant(T, z, z.left)
+    else:
+        y = rb_minimum(T, z.right)
+        y_original_color = y.color
+        x = y.right
+        if y.parent == z:
+            x.parent = y
+        else:
+            rb_transplant(T, y, y.right)
+            y.right = z.right
+            y.right.parent = y
+        rb_transplant(T, z, y)
+        y.left = z.left
+        y.left.parent = y
+        y.color = z.color
+    # Rozmiary: od miejsca, z którego zniknął węzeł, do korzenia
+    node = x.parent
+    while node != T.nil:
+        node.size = node.left.size + node.right.size + 1
+        node = node.parent
+    if y_original_color == 'BLACK':
+        delete_fixup(T, x)
+
+def delete_fixup(T, x):
+    while x != T.root and x.color == 'BLACK':
+        # Przypadek 1: x jest lewym dzieckiem
+        if x == x.parent.left:
+            w = x.parent.right
+            # Przypadek 1.1: brat czerwony
+            if w.color == 'RED':
+                w.color = 'BLACK'
+                x.parent.color = 'RED'
+                left_rotate(T, x.parent)
+                w = x.parent.right
+            # Przypadek 1.2: brat czarny z czarnymi dziećmi
+            if w.left.color == 'BLACK' and w.right.color == 'BLACK':
+                w.color = 'RED'
+                x = x.parent
+            else:
+                # Przypadek 1.3: bliższe dziecko brata czerwone
+                if w.right.color == 'BLACK':
+                    w.left.color = 'BLACK'
+                    w.color = 'RED'
+                    right_rotate(T, w)
+                    w = x.parent.right
+                # Przypadek 1.4: dalsze dziecko brata czerwone
+                w.color = x.parent.color
+                x.parent.color = 'BLACK'
+                w.right.color = 'BLACK'
+                left_rotate(T, x.parent)
+                x = T.root
+        # Przypadek 2: x jest prawym dzieckiem, wszystko symetrycznie
+        else:
+            w = x.parent.left
+            if w.color == 'RED':
+                w.color = 'BLACK'
+                x.parent.color = 'RED'
+                right_rotate(T, x.parent)
+                w = x.parent.left
+            if w.right.color == 'BLACK' and w.left.color == 'BLACK':
+                w.color = 'RED'
+                x = x.parent
+            else:
+                if w.left.color == 'BLACK':
+                    w.right.color = 'BLACK'
+                    w.color = 'RED'
+                    left_rotate(T, w)
+                    w = x.parent.left
+                w.color = x.parent.color
+                x.parent.color = 'BLACK'
+                w.left.color = 'BLACK'
+                right_rotate(T, x.parent)
+                x = T.root
+    x.color = 'BLACK'
+
+#
+# Złożoność obliczeniowa usuwania to O(lgn): znalezienie następnika i poprawianie rozmiarów to O(h), a delete_fixup
+# wykonuje O(h) przejść w górę (przypadek 2) i co najwyżej 3 rotacje.
+#
+#   e) drzewo z rozmiarami poddrzew (order-statistic tree) i mapa uporządkowana (RBTreeMap):
+# Każdy węzeł trzyma dodatkowo size - liczbę węzłów w swoim poddrzewie (T.nil ma size = 0), więc
+# x.size = x.left.size + x.right.size + 1. Wstawianie zwiększa size na ścieżce od korzenia, usuwanie poprawia je od miejsca
+# usunięcia w górę, a rotacje przeliczają size tylko dla dwóch obracanych węzłów - augmentacja nie psuje więc O(lgn).
+# Dzięki temu w czasie O(lgn) mamy:
+# - select(i): i-ty najmniejszy klucz (i = 1, 2, ..., n). Jeśli i = x.left.size + 1, to jest nim x, jeśli mniej, to
+# szukamy w lewym poddrzewie, a jeśli więcej, to szukamy (i - x.left.size - 1)-tego klucza w prawym poddrzewie.
+# - rank(k): ile kluczy jest mniejszych od k. Idziemy w dół jak przy wyszukiwaniu, a za każdym razem, gdy skręcamy w prawo,
+# dodajemy x.left.size + 1 (x i całe jego lewe poddrzewo są mniejsze od k).
+# - count_range(lo, hi): liczba kluczy z przedziału [lo, hi) to rank(hi) - rank(lo).
+# - floor(k) / ceiling(k): największy klucz <= k / najmniejszy klucz >= k, znów jedno zejście w dół.
+#
+# Węzły mają __slots__ (mniej pamięci i szybszy dostęp do pól), a zamiast napisu 'NIL' wszystkie drzewa używają jednego
+# wspólnego czarnego węzła NIL - T.nil z punktu a). Mapa nie dopuszcza duplikatów: wstawienie istniejącego klucza podmienia wartość.
+# Samo drzewo T (korzeń, T.nil, tworzenie i zwalnianie węzłów) jest osobnym obiektem - domyślnie NodeTree z węzłami RBNode,
+# a w punkcie f) wersja na tablicach.
+#
+
+class RBNode:
+    __slots__ = ('key', 'value', 'color', 'left', 'right', 'parent', 'size')
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.color = 'BLACK'
+        self.left = self.right = self.parent = NIL
+        self.size = 0
+
+# Wspólny liść T.nil: czarny, size = 0, wszystkie wskaźniki na siebie
+NIL = RBNode.__new__(RBNode)
+NIL.key = NIL.value = None
+NIL.color = 'BLACK'
+NIL.left = NIL.right = NIL.parent = NIL
+NIL.size = 0
+
+# Drzewo T z węzłami-obiektami: korzeń, wspólny liść i tworzenie węzłów
+class NodeTree:
+    def __init__(self):
+        self.nil = NIL
+        self.root = NIL
+
+    def new_node(self, key, value=None):
+        return RBNode(key, value)
+
+    def free_node(self, node):
+        pass
+
+class RBTreeMap:
+    def __init__(self, items=(), T=None):
+        self.T = T if T is not None else NodeTree()
+        for k, v in items:
+            self[k] = v
+
+    def __len__(self):
+        return self.T.root.size
+
+    def find(self, k):
+        nil = self.T.nil
+        x = self.T.root
+        while x != nil and x.key != k:
+            x = x.left if k < x.key else x.right
+        return x
+
+    def search(self, k, default=None):
+        x = self.find(k)
+        return default if x == self.T.nil else x.value
+
+    def __contains__(self, k):
+        return self.find(k) != self.T.nil
+
+    def __getitem__(self, k):
+        x = self.find(k)
+        if x == self.T.nil:
+            raise KeyError(k)
+        return x.value
+
+    def __setitem__(self, k, v):
+        x = self.find(k)
+        if x == self.T.nil:
+            rb_insert(self.T, self.T.new_node(k, v))
+        else:
+            x.value = v
+
+    def insert(self, k, v=None):
+        self[k] = v
+
+    def delete(self, k):
+        T = self.T
+        x = self.find(k)
+        if x == T.nil:
+            return False
+        rb_delete(T, x)
+        # T.nil mógł dostać rodzica w rb_transplant, odpinamy go
+        T.nil.parent = T.nil
+        T.free_node(x)
+        return True
+
+    def __delitem__(self, k):
+        if not self.delete(k):
+            raise KeyError(k)
+
+    def floor(self, k):
+        nil = self.T.nil
+        x = self.T.root
+        best = nil
+        while x != nil:
+            if x.key == k:
+                return x.key
+            if x.key < k:
+                best = x
+                x = x.right
+            else:
+                x = x.left
+        # Przy ArrayTree klucz węzła NIL to keys[0] == 0, więc nie zwracamy go jako wyniku
+        return None if best == nil else best.key
+
+    def ceiling(self, k):
+        nil = self.T.nil
+        x = self.T.root
+        best = nil
+        while x != nil:
+            if x.key == k:
+                return x.key
+            if x.key > k:
+                best = x
+                x = x.left
+            else:
+                x = x.right
+        return None if best == nil else best.key
+
+    def select(self, i):
+        if not 1 <= i <= len(self):
+            raise IndexError(i)
+        x = self.T.root
+        while True:
+            r = x.left.size + 1
+            if i == r:
+                return x.key
+            if i < r:
+                x = x.left
+            else:
+                i -= r
+                x = x.right
+
+    def rank(self, k):
+        nil = self.T.nil
+        x = self.T.root
+        r = 0
+        while x != nil:
+            if x.key < k:
+                r += x.left.size + 1
+                x = x.right
+            else:
+                x = x.left
+        return r
+
+    def count_range(self, lo, hi):
+        return max(0, self.rank(hi) - self.rank(lo))
+
+    # Inorder iteracyjnie (stos zamiast rekurencji), opcjonalnie tylko klucze z [lo, hi)
+    def items(self, lo=None, hi=None):
+        nil = self.T.nil
+        stack = []
+        x = self.T.root
+        while stack or x != nil:
+            if x != nil:
+                # Poddrzewo lewe ma same klucze < x.key, pomijamy je, gdy x.key < lo
+                if lo is not None and x.key < lo:
+                    x = x.right
+                else:
+                    stack.append(x)
+                    x = x.left
+            else:
+                x = stack.pop()
+                if hi is not None and x.key >= hi:
+                    return
+                yield x.key, x.value
+                x = x.right
+
+    def __iter__(self):
+        for k, _ in self.items():
+            yield k
+
+#
+# Złożoność obliczeniowa: find, wstawianie, usuwanie, floor, ceiling, select, rank i count_range to O(lgn). Pełne
+# przejście items to Theta(n), a items(lo, hi) to O(lgn + m), gdzie m to liczba zwróconych par.
+# Złożoność pamięciowa: Theta(n) węzłów po 7 pól, a stos w items ma O(lgn) elementów.
+#
+#   f) drzewo na tablicach (struct of arrays):
+# Węzeł-obiekt w Pythonie kosztuje dużo: sam RBNode z __slots__ to ~88 bajtów (72 bajty obiektu + nagłówek dla
+# odśmiecacza), a jeśli klucze i wartości są osobnymi obiektami int (po 28-32 bajty), to ~120-150 bajtów na klucz.
+# Przy dziesiątkach milionów kluczy to gigabajty. Zamiast tego węzeł może być po prostu indeksem i, a jego pola leżą
+# w równoległych tablicach typowanych: keys[i], values[i], left[i], right[i], parent[i], size[i] (array) i color[i]
+# (bytearray, 1 to czerwony). Indeks 0 to T.nil (czarny, size = 0), a wskaźnik NIL to po prostu 0. Na jeden klucz
+# przypada wtedy 8 + 8 + 4*4 + 1 = 33 bajty (dla kluczy i wartości 'q' i indeksów 'i', czyli do 2^31 węzłów) - około
+# 3.5-4.5 razy mniej niż węzły-obiekty, a nie o rząd wielkości.
+#
+# Zwolnione indeksy trzymamy na liście wolnych (free list): pole left wolnego węzła wskazuje następny wolny, a free to
+# pierwszy z nich (0, gdy lista jest pusta). new_node bierze indeks z listy, a gdy jest pusta, dokłada go na końcu tablic.
+#
+# Żeby procedury z punktów 5 i 6 działały bez zmian, dostają zamiast węzła uchwyt NodeRef(T, i) - mały obiekt, którego
+# atrybuty key, left, parent, color itd. czytają i zapisują odpowiednie tablice. Uchwyty są porównywane po indeksie, a uchwyt
+# na T.nil jest równy napisowi 'NIL', więc zwykłe BST (insert_node, tree_search, successor, transplant...) też na nim działają.
+# Uchwyty powstają tylko na czas operacji i nie są nigdzie przechowywane, więc nie zwiększają pamięci drzewa.
+#
+
+class NodeRef:
+    __slots__ = ('T', 'i')
+
+    def __init__(self, T, i):
+        self.T = T
+        self.i = i
+
+    def __eq__(self, other):
+        if isinstance(other, NodeRef):
+            return self.i == other.i and self.T is other.T
+        return self.i == 0 and other == 'NIL'
+
+    def __hash__(self):
+        return self.i
+
+def ref_field(name):
+    def get(self):
+        return NodeRef(self.T, getattr(self.T, name)[self.i])
+    def set(self, node):
+        getattr(self.T, name)[self.i] = 0 if node == 'NIL' else node.i
+    return property(get, set)
+
+def value_field(name):
+    def get(self):
+        return getattr(self.T, name)[self.i]
+    def set(self, value):
+        getattr(self.T, name)[self.i] = value
+    return property(get, set)
+
+def get_color(self):
+    return 'RED' if self.T.color[self.i] else 'BLACK'
+
+def set_color(self, color):
+    self.T.color[self.i] = color == 'RED'
+
+NodeRef.left = ref_field('left')
+NodeRef.right = ref_field('right')
+NodeRef.parent = ref_field('parent')
+NodeRef.key = value_field('keys')
+NodeRef.value = value_field('values')
+NodeRef.size = value_field('size')
+NodeRef.color = property(get_color, set_color)
+
+class ArrayTree:
+    def __init__(self, key_type='q', value_type='q', index_type='i'):
+        # Indeks 0 to T.nil
+        self.keys = array.array(key_type, [0])
+        self.values = array.array(value_type, [0])
+        self.left = array.array(index_type, [0])
+        self.right = array.array(index_type, [0])
+        self.parent = array.array(index_type, [0])
+        self.size = array.array(index_type, [0])
+        self.color = bytearray(1)
+        self.root_index = 0
+        self.free = 0
+
+    @property
+    def nil(self):
+        return NodeRef(self, 0)
+
+    @property
+    def root(self):
+        return NodeRef(self, self.root_index)
+
+    @root.setter
+    def root(self, node):
+        self.root_index = 0 if node == 'NIL' else node.i
+
+    def new_node(self, key, value=0):
+        i = self.free
+        if i:
+            self.free = self.left[i]
+            self.keys[i] = key
+            self.values[i] = value
+            self.left[i] = self.right[i] = self.parent[i] = 0
+            self.size[i] = 1
+            self.color[i] = 0
+        else:
+            i = len(self.keys)
+            self.keys.append(key)
+            self.values.append(value)
+            self.left.append(0)
+            self.right.append(0)
+            self.parent.append(0)
+            self.size.append(1)
+            self.color.append(0)
+        return NodeRef(self, i)
+
+    def free_node(self, node):
+        self.left[node.i] = self.free
+        self.free = node.i
+
+    def memory(self):
+        return sum(a.itemsize * len(a) for a in (self.keys, self.values, self.left, self.right, self.parent, self.size)) + len(self.color)
+
+#
+# Użycie: RBTreeMap(T=ArrayTree()) to ta sama mapa z punktu e), ale na tablicach. Zwykłe BST: T = ArrayTree(),
+# insert_node(T, T.new_node(k)), tree_search(T.root, k) itd.
+# Złożoność obliczeniowa: taka sama jak dla węzłów-obiektów, każdy dostęp do pola to dodatkowo utworzenie uchwytu (O(1),
+# ale w praktyce operacje są ok. 10 razy wolniejsze niż na RBNode - płacimy czasem za pamięć). Tablice rosną przez append,
+# czyli zamortyzowane O(1).
+# Złożoność pamięciowa: Theta(n), ok. 33 bajty na klucz zamiast ~120-150 dla węzłów-obiektów z kluczami i wartościami.
+#
+#   g) budowa drzewa z posortowanych danych i scalanie drzew:
+# Budowa drzewa przez n wywołań wstawiania kosztuje O(nlgn), a dla zwykłego BST i danych posortowanych dostajemy listę
+# o wysokości n. Jeśli dane są już posortowane, to zbalansowane drzewo da się zbudować w Theta(n): korzeniem jest środkowy
+# element, a lewe i prawe poddrzewo budujemy tak samo z lewej i prawej połowy (jak w merge sorcie, tylko bez scalania).
+# Każdy element odwiedzamy raz, a rozmiar poddrzewa znamy od razu (hi - lo).
+#
+# Takie drzewo ma wysokość h = floor(lgn) i wszystkie liście są na głębokościach h-1 i h. Żeby było poprawnym drzewem
+# czerwono-czarnym, wystarczy pokolorować na czerwono węzły na głębokości h (o ile h > 0, korzeń jest czarny), a resztę
+# na czarno. Wtedy każda ścieżka od korzenia do liścia T.nil przechodzi przez dokładnie h czarnych węzłów (własność V),
+# a czerwone węzły mają tylko dzieci T.nil (własność IV). Zwykłe procedury BST kolory po prostu ignorują.
+#
+# Scalanie dwóch drzew (merge_maps): przechodzimy oba inorder jednocześnie, tak jak merge w merge sorcie scala dwie
+# posortowane tablice, a z wyniku budujemy nowe drzewo jak wyżej. Razem Theta(n + m), bez żadnych rotacji. Jeśli klucz
+# jest w obu drzewach, wygrywa wartość z drugiego.
+#
+
+# Posortowane pary (klucz, wartość) bez powtórzeń: z równych kluczy zostaje ostatni
+def unique_sorted(items):
+    keys = []
+    values = []
+    for k, v in items:
+        if keys and k <= keys[-1]:
+            if k < keys[-1]:
+                raise ValueError('klucze nie są posortowane')
+            values[-1] = v
+        else:
+            keys.append(k)
+            values.append(v)
+    return keys, values
+
+def build_balanced(T, keys, values):
+    n = len(keys)
+    h = n.bit_length() - 1
+
+    # Poddrzewo z keys[lo...hi-1], korzeń na głębokości depth
+    def build(lo, hi, depth, parent):
+        if lo >= hi:
+            return T.nil
+        mid = (lo + hi) // 2
+        x = T.new_node(keys[mid], values[mid])
+        x.parent = parent
+        x.color = 'RED' if depth == h and h > 0 else 'BLACK'
+        x.left = build(lo, mid, depth + 1, x)
+        x.right = build(mid + 1, hi, depth + 1, x)
+        x.size = hi - lo
+        return x
+
+    T.root = build(0, n, 0, T.nil)
+    return T
+
+def bulk_load(items, T=None):
+    M = RBTreeMap(T=T)
+    keys, values = unique_sorted(items)
+    build_balanced(M.T, keys, values)
+    return M
+
+# Scalanie dwóch posortowanych strumieni par, przy równych kluczach wygrywa b
+def merge_items(a, b):
+    a = iter(a)
+    b = iter(b)
+    x = next(a, None)
+    y = next(b, None)
+    while x is not None and y is not None:
+        if x[0] < y[0]:
+            yield x
+            x = next(a, None)
+        elif y[0] < x[0]:
+            yield y
+            y = next(b, None)
+        else:
+            yield y
+            x = next(a, None)
+            y = next(b, None)
+    while x is not None:
+        yield x
+        x = next(a, None)
+    while y is not None:
+        yield y
+        y = next(b, None)
+
+def merge_maps(A, B, T=None):
+    return bulk_load(merge_items(A.items(), B.items()), T)
+
+#
+# Złożoność obliczeniowa: unique_sorted i build_balanced to Theta(n), merge_maps to Theta(n + m).
+# Złożoność pamięciowa: Theta(n) na listy kluczy i wartości (plus samo drzewo), rekursja ma głębokość O(lgn).
 # =================================================================================================
+#
+# =================================================================================================
+# 7. Stack:
+# Stos (LIFO - last in, first out) ma dwie operacje: push wkłada element na wierzch, a pop zdejmuje element z wierzchu.
+# W Pythonie zwykle używa się listy, ale lista trzyma wskaźniki na obiekty - każda liczba to osobny obiekt (28 bajtów
+# + 8 bajtów wskaźnika). Dla numerów wierzchołków, indeksów itp. wystarczy tablica typowana (array), gdzie liczba zajmuje
+# 8 bajtów i nie jest osobnym obiektem. Tablica rośnie przy append przez podwajanie (tak jak lista), więc push i pop
+# to zamortyzowane O(1). Dodatkowo push_many / pop_many przenoszą całe paczki jednym kopiowaniem pamięci.
+#
+
+class ArrayStack:
+    def __init__(self, typecode='q', values=()):
+        self.data = array.array(typecode, values)
+
+    def __len__(self):
+        return len(self.data)
+
+    def empty(self):
+        return not self.data
+
+    def push(self, x):
+        self.data.append(x)
+
+    def pop(self):
+        if not self.data:
+            raise IndexError('stos jest pusty')
+        return self.data.pop()
+
+    def top(self):
+        return self.data[-1]
+
+    def push_many(self, values):
+        self.data.extend(values)
+
+    # Zdejmuje do k elementów, zwraca je w kolejności od wierzchu
+    def pop_many(self, k):
+        k = min(k, len(self.data))
+        out = self.data[len(self.data) - k:]
+        del self.data[len(self.data) - k:]
+        out.reverse()
+        return out
+
+#
+# Złożoność obliczeniowa: push i pop to zamortyzowane O(1), push_many i pop_many z k elementami to O(k).
+# Złożoność pamięciowa: Theta(n) - itemsize bajtów na element (8 dla 'q').
+# =================================================================================================
+#
+# =================================================================================================
+# 8. Queue:
+# Kolejka (FIFO - first in, first out) ma operacje enqueue (wstaw na koniec) i dequeue (wyjmij z początku). Wyjmowanie
+# z początku listy (list.pop(0)) przesuwa wszystkie elementy, czyli O(n). Zamiast tego używamy bufora cyklicznego (ring
+# buffer): tablicy o stałym rozmiarze m z dwoma indeksami - head (pierwszy element) i tail (miejsce na następny). Oba
+# indeksy idą tylko do przodu i "zawijają się" na początek tablicy: i = (i + 1) mod m. Dla m = 2^p mod to maska bitowa
+# (i & (m - 1)), tak jak w tablicach z hashowaniem. Kolejka ma z góry ustaloną pojemność (capacity zaokrąglamy w górę do
+# potęgi dwójki) - wstawienie do pełnej kolejki to błąd, a w BFS wiemy, że wystarczy |V| miejsc.
+# enqueue_many / dequeue_many przenoszą paczki co najwyżej dwoma kopiowaniami (do końca tablicy i od jej początku).
+#
+
+class RingQueue:
+    def __init__(self, capacity, typecode='q'):
+        m = 1
+        while m < capacity:
+            m *= 2
+        self.data = array.array(typecode, [0]) * m
+        self.mask = m - 1
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def empty(self):
+        return self.count == 0
+
+    def full(self):
+        return self.count > self.mask
+
+    def enqueue(self, x):
+        if self.count > self.mask:
+            raise IndexError('kolejka jest pełna')
+        self.data[(self.head + self.count) & self.mask] = x
+        self.count += 1
+
+    def dequeue(self):
+        if not self.count:
+            raise IndexError('kolejka jest pusta')
+        x = self.data[self.head]
+        self.head = (self.head + 1) & self.mask
+        self.count -= 1
+        return x
+
+    def peek(self):
+        if not self.count:
+            raise IndexError('kolejka jest pusta')
+        return self.data[self.head]
+
+    def enqueue_many(self, values):
+        values = values if isinstance(values, array.array) else array.array(self.data.typecode, values)
+        k = len(values)
+        m = self.mask + 1
+        if self.count + k > m:
+            raise IndexError('kolejka jest pełna')
+        tail = (self.head + self.count) & self.mask
+        first = min(k, m - tail)
+        self.data[tail:tail + first] = values[:first]
+        self.data[:k - first] = values[first:]
+        self.count += k
+
+    def dequeue_many(self, k):
+        k = min(k, self.count)
+        m = self.mask + 1
+        first = min(k, m - self.head)
+        out = self.data[self.head:self.head + first]
+        out.extend(self.data[:k - first])
+        self.head = (self.head + k) & self.mask
+        self.count -= k
+        return out
+
+#
+# Złożoność obliczeniowa: enqueue i dequeue to O(1) (bez żadnego przepisywania - rozmiar jest stały), paczki z k
+# elementami to O(k).
+# Złożoność pamięciowa: Theta(capacity) - itemsize bajtów na miejsce, niezależnie od tego, ile elementów jest w kolejce.
+# =================================================================================================
+#
+# =================================================================================================
+# 9. B+-drzewa:
+# W drzewie BST każdy poziom to osobny węzeł gdzieś w pamięci, więc wyszukiwanie w drzewie z 10^8 kluczami to ~27 skoków
+# po wskaźnikach i prawie każdy z nich to chybienie w pamięci podręcznej procesora (cache miss). B-drzewo zmniejsza liczbę
+# poziomów: węzeł ma nie 2, a nawet kilkuset potomków (fanout), a jego klucze leżą obok siebie w jednej tablicy. Wysokość
+# spada do log_B(n) (dla B = 128 i n = 10^8 to 4 poziomy), a wewnątrz węzła szukamy binarnie (bisect) w ciągłej tablicy.
+#
+# B+-drzewo to wariant, w którym:
+# - węzły wewnętrzne trzymają tylko klucze rozdzielające (separatory) i wskaźniki na dzieci: jeśli węzeł ma klucze
+#   s_1 < ... < s_m, to ma m+1 dzieci, a dziecko i zawiera klucze z przedziału [s_i, s_(i+1)). Właściwe dziecko dla k
+#   to bisect_right(keys, k),
+# - wszystkie pary (klucz, wartość) są w liściach, na tej samej głębokości,
+# - liście są połączone w listę dwukierunkową (next, prev), więc przejście po przedziale kluczy to zejście do pierwszego
+#   liścia, a potem czytanie kolejnych liści po kolei, bez wracania do korzenia.
+#
+# Parametr order to maksymalna liczba kluczy w węźle, każdy węzeł poza korzeniem ma ich co najmniej order // 2.
+# - Wstawianie: schodzimy do liścia, zapamiętując ścieżkę. Wstawiamy klucz na miejsce z bisect_left. Jeśli liść ma teraz
+#   więcej niż order kluczy, to dzielimy go na pół, a pierwszy klucz prawej połowy wstawiamy do rodzica jako separator.
+#   Rodzic może się przepełnić - wtedy dzielimy go tak samo, ale środkowy klucz przechodzi w górę (nie zostaje w żadnej
+#   połowie). Jeśli podzielił się korzeń, to drzewo rośnie o jeden poziom (nowy korzeń z jednym separatorem).
+# - Usuwanie: usuwamy parę z liścia. Jeśli węzeł ma za mało kluczy, to pożyczamy jeden klucz od sąsiedniego brata (i
+#   poprawiamy separator w rodzicu), a gdy brat też ma minimum, to scalamy węzeł z bratem i usuwamy separator z rodzica,
+#   który może mieć wtedy za mało kluczy - i tak w górę. Korzeń bez kluczy zastępujemy jego jedynym dzieckiem.
+#   Separatory nie muszą być kluczami, które są w drzewie, wystarczy, że rozdzielają poddrzewa, więc po usunięciu
+#   pierwszego klucza z liścia nie musimy ich poprawiać.
+# - minimum / maksimum: pierwszy klucz skrajnie lewego / ostatni klucz skrajnie prawego liścia.
+# - następnik / poprzednik klucza k (k nie musi być w drzewie): bisect w liściu, do którego trafiłby k, a jeśli jesteśmy
+#   na brzegu liścia, to sąsiedni liść z listy.
+#
+
+class BPlusLeaf:
+    __slots__ = ('keys', 'values', 'next', 'prev')
+    leaf = True
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+        self.next = None
+        self.prev = None
+
+class BPlusInner:
+    __slots__ = ('keys', 'children')
+    leaf = False
+
+    def __init__(self, keys, children):
+        self.keys = keys
+        self.children = children
+
+class BPlusTree:
+    def __init__(self, order=64, items=()):
+        if order < 3:
+            raise ValueError('order musi wynosić co najmniej 3')
+        self.order = order
+        self.root = BPlusLeaf([], [])
+        self.count = 0
+        for k, v in items:
+            self[k] = v
+
+    def __len__(self):
+        return self.count
+
+    def find_leaf(self, k, path=None):
+        node = self.root
+        while not node.leaf:
+            i = bisect_right(node.keys, k)
+            if path is not None:
+                path.append((node, i))
+            node = node.children[i]
+        return node
+
+    def search(self, k, default=None):
+        leaf = self.find_leaf(k)
+        i = bisect_left(leaf.keys, k)
+        if i < len(leaf.keys) and leaf.keys[i] == k:
+            return leaf.values[i]
+        return default
+
+    def __contains__(self, k):
+        leaf = self.find_leaf(k)
+        i = bisect_left(leaf.keys, k)
+        return i < len(leaf.keys) and leaf.keys[i] == k
+
+    def __getitem__(self, k):
+        leaf = self.find_leaf(k)
+        i = bisect_left(leaf.keys, k)
+        if i < len(leaf.keys) and leaf.keys[i] == k:
+            return leaf.values[i]
+        raise KeyError(k)
+
+    def __setitem__(self, k, v):
+        self.insert(k, v)
+
+    def insert(self, k, v=None):
+        path = []
+        node = self.find_leaf(k, path)
+        i = bisect_left(node.keys, k)
+        if i < len(node.keys) and node.keys[i] == k:
+            node.values[i] = v
+            return
+        node.keys.insert(i, k)
+        node.values.insert(i, v)
+        self.count += 1
+        if len(node.keys) <= self.order:
+            return
+        # Podział liścia, pierwszy klucz prawej połowy idzie do rodzica
+        mid = len(node.keys) // 2
+        new = BPlusLeaf(node.keys[mid:], node.values[mid:])
+        del node.keys[mid:]
+        del node.values[mid:]
+        new.next = node.next
+        if node.next is not None:
+            node.next.prev = new
+        new.prev = node
+        node.next = new
+        separator = new.keys[0]
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, new)
+            if len(parent.keys) <= self.order:
+                return
+            # Podział węzła wewnętrznego, środkowy klucz idzie w górę
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            new = BPlusInner(parent.keys[mid+1:], parent.children[mid+1:])
+            del parent.keys[mid:]
+            del parent.children[mid+1:]
+        self.root = BPlusInner([separator], [self.root, new])
+
+    def delete(self, k):
+        path = []
+        node = self.find_leaf(k, path)
+        i = bisect_left(node.keys, k)
+        if i == len(node.keys) or node.keys[i] != k:
+            return False
+        del node.keys[i]
+        del node.values[i]
+        self.count -= 1
+        low = self.order // 2
+        while path and len(node.keys) < low:
+            parent, i = path.pop()
+            left = parent.children[i-1] if i > 0 else None
+            right = parent.children[i+1] if i + 1 < len(parent.children) else None
+            if node.leaf:
+                if left is not None and len(left.keys) > low:
+                    node.keys.insert(0, left.keys.pop())
+                    node.values.insert(0, left.values.pop())
+                    parent.keys[i-1] = node.keys[0]
+                elif right is not None and len(right.keys) > low:
+                    node.keys.append(right.keys.pop(0))
+                    node.values.append(right.values.pop(0))
+                    parent.keys[i] = right.keys[0]
+                else:
+                    # Scalamy z lewym bratem (albo prawego brata z węzłem), prawy z pary znika z listy liści
+                    if left is not None:
+                        i -= 1
+                    else:
+                        left, node = node, right
+                    left.keys += node.keys
+                    left.values += node.values
+                    left.next = node.next
+                    if node.next is not None:
+                        node.next.prev = left
+                    del parent.keys[i]
+                    del parent.children[i+1]
+            else:
+                if left is not None and len(left.keys) > low:
+                    node.keys.insert(0, parent.keys[i-1])
+                    node.children.insert(0, left.children.pop())
+                    parent.keys[i-1] = left.keys.pop()
+                elif right is not None and len(right.keys) > low:
+                    node.keys.append(parent.keys[i])
+                    node.children.append(right.children.pop(0))
+                    parent.keys[i] = right.keys.pop(0)
+                else:
+                    # Scalanie: separator z rodzica schodzi między klucze obu węzłów
+                    if left is not None:
+                        i -= 1
+                    else:
+                        left, node = node, right
+                    left.keys.append(parent.keys[i])
+                    left.keys += node.keys
+                    left.children += node.children
+                    del parent.keys[i]
+                    del parent.children[i+1]
+            node = parent
+        if not self.root.leaf and not self.root.keys:
+            self.root = self.root.children[0]
+        return True
+
+    def __delitem__(self, k):
+        if not self.delete(k):
+            raise KeyError(k)
+
+    def first_leaf(self):
+        node = self.root
+        while not node.leaf:
+            node = node.children[0]
+        return node
+
+    def last_leaf(self):
+        node = self.root
+        while not node.leaf:
+            node = node.children[-1]
+        return node
+
+    def minimum(self):
+        leaf = self.first_leaf()
+        return leaf.keys[0] if leaf.keys else None
+
+    def maximum(self):
+        leaf = self.last_leaf()
+        return leaf.keys[-1] if leaf.keys else None
+
+    # Najmniejszy klucz > k
+    def successor(self, k):
+        leaf = self.find_leaf(k)
+        i = bisect_right(leaf.keys, k)
+        if i < len(leaf.keys):
+            return leaf.keys[i]
+        return leaf.next.keys[0] if leaf.next is not None else None
+
+    # Największy klucz < k
+    def predecessor(self, k):
+        leaf = self.find_leaf(k)
+        i = bisect_left(leaf.keys, k)
+        if i > 0:
+            return leaf.keys[i-1]
+        return leaf.prev.keys[-1] if leaf.prev is not None else None
+
+    # Pary z kluczami z [lo, hi), kolejnymi liśćmi z listy
+    def items(self, lo=None, hi=None):
+        if lo is None:
+            leaf = self.first_leaf()
+            i = 0
+        else:
+            leaf = self.find_leaf(lo)
+            i = bisect_left(leaf.keys, lo)
+        while leaf is not None:
+            keys = leaf.keys
+            j = len(keys) if hi is None else bisect_left(keys, hi)
+            for t in range(i, j):
+                yield keys[t], leaf.values[t]
+            if j < len(keys):
+                return
+            leaf = leaf.next
+            i = 0
+
+    def __iter__(self):
+        for k, _ in self.items():
+            yield k
+
+    def height(self):
+        h = 1
+        node = self.root
+        while not node.leaf:
+            node = node.children[0]
+            h += 1
+        return h
+
+#
+# Złożoność obliczeniowa: wysokość to O(log_B(n)) dla B = order/2, a w każdym węźle bisect kosztuje O(lgB), więc
+# wyszukiwanie, następnik i poprzednik to O(log_B(n) * lgB) = O(lgn) porównań, ale tylko O(log_B(n)) skoków po pamięci.
+# Wstawianie i usuwanie dodatkowo przesuwają elementy w tablicy węzła, czyli O(B * log_B(n)) (przesunięcia to szybkie
+# kopiowanie ciągłej pamięci). Przejście po przedziale to O(log_B(n) + m) dla m zwróconych par.
+# Złożoność pamięciowa: Theta(n), węzły są zapełnione co najmniej w połowie.
+#
+#   B+-drzewo na dysku (DiskBPlusTree):
+# Drzewa w pamięci po restarcie programu trzeba budować od nowa, a przy kilku GB danych to minuty. B+-drzewo nadaje się
+# do trzymania w pliku: węzeł to strona o stałym rozmiarze (domyślnie 4096 bajtów, tyle co strona pamięci), a wskaźnik na
+# dziecko to numer strony. Plik otwieramy przez mmap - system operacyjny sam wczytuje strony, do których się odwołujemy,
+# i trzyma je w swojej pamięci podręcznej, więc po restarcie pierwsze wyszukiwanie czyta tylko h stron (kilka milisekund),
+# a nie cały plik.
+#
+# Układ pliku (liczby little-endian, klucze i wartości to liczby 64-bitowe 'q'):
+# - strona 0: nagłówek - magiczne bajty, rozmiar strony, numer strony korzenia, liczba kluczy, liczba stron, wysokość,
+# - liść: typ (1), liczba kluczy, next, prev (numery stron, 0 to NIL), potem tablica kluczy i tablica wartości,
+# - węzeł wewnętrzny: typ (0), liczba kluczy, potem tablica kluczy i tablica numerów stron dzieci.
+# Przy stronie 4096 bajtów w węźle mieści się 254 kluczy, więc 10^8 kluczy to tylko 4 poziomy.
+#
+# Odczytanie strony to zamiana bajtów na tablice (array.frombytes), co też kosztuje, więc ostatnio używane strony trzymamy
+# już zdekodowane w pamięci podręcznej LRU (OrderedDict: trafienie przesuwa stronę na koniec, a przy przepełnieniu
+# wyrzucamy stronę z początku) o rozmiarze cache_pages. Zmiany zapisujemy od razu do mmap (write-through), więc
+# wyrzucenie strony z pamięci podręcznej nic nie kosztuje. Nagłówek (korzeń, liczba kluczy, liczba stron, wysokość)
+# też zapisujemy do mmap przy każdej jego zmianie - najpierw nową stronę, potem nagłówek, który na nią wskazuje - więc
+# po zakończeniu procesu bez close() plik jest spójny i ponowne otwarcie widzi wszystkie wstawione klucze. flush tylko
+# prosi system o zrzut stron na dysk (potrzebne dopiero przy awarii całego systemu, a nie samego procesu).
+#
+# - Budowa z posortowanych danych (disk_bulk_load): liście zapisujemy po kolei na stronach 1, 2, ..., zapełnione w
+#   ułamku fill (zostawiamy miejsce na późniejsze wstawienia), zapamiętując pierwszy klucz każdej strony. Potem z tych
+#   par budujemy kolejne poziomy węzłów wewnętrznych, aż zostanie jeden - korzeń. Wszystko jednym przejściem po danych
+#   i sekwencyjnym zapisem do pliku, Theta(n).
+# - Wstawianie: jak w BPlusTree, przepełnione strony dzielimy, a nowe strony dokładamy na końcu pliku (plik i mmap
+#   powiększamy dwukrotnie, gdy brakuje miejsca). Usuwania nie ma - indeks odbudowujemy przez disk_bulk_load.
+# - Przejście po przedziale: schodzimy do pierwszego liścia i czytamy kolejne liście przez next. Liście czytamy z
+#   pominięciem pamięci podręcznej, żeby jedno duże przejście nie wyrzuciło z niej górnych poziomów drzewa.
+#
+
+PAGE_SIZE = 4096
+FILE_HEADER = struct.Struct('<4sIqqqq')
+PAGE_HEADER = struct.Struct('<HHqq')
+MAGIC = b'BPT1'
+
+class DiskPage:
+    __slots__ = ('number', 'leaf', 'keys', 'values', 'children', 'next', 'prev')
+
+    def __init__(self, number, leaf, keys, values=None, children=None, next=0, prev=0):
+        self.number = number
+        self.leaf = leaf
+        self.keys = keys
+        self.values = values
+        self.children = children
+        self.next = next
+        self.prev = prev
+
+def page_capacity(page_size):
+    # Liść: 2 tablice po cap liczb; węzeł wewnętrzny: cap kluczy i cap+1 dzieci
+    return (page_size - PAGE_HEADER.size - 8) // 16
+
+def encode_page(page, page_size):
+    cap = page_capacity(page_size)
+    out = bytearray(page_size)
+    n = len(page.keys)
+    PAGE_HEADER.pack_into(out, 0, page.leaf, n, page.next, page.prev)
+    start = PAGE_HEADER.size
+    out[start:start + 8*n] = page.keys.tobytes()
+    start += 8 * cap
+    second = page.values if page.leaf else page.children
+    out[start:start + 8*len(second)] = second.tobytes()
+    return out
+
+def decode_page(number, buffer, page_size):
+    cap = page_capacity(page_size)
+    leaf, n, next, prev = PAGE_HEADER.unpack_from(buffer, 0)
+    start = PAGE_HEADER.size
+    keys = array.array('q', buffer[start:start + 8*n])
+    start += 8 * cap
+    if leaf:
+        return DiskPage(number, True, keys, values=array.array('q', buffer[start:start + 8*n]), next=next, prev=prev)
+    return DiskPage(number, False, keys, children=array.array('q', buffer[start:start + 8*(n+1)]))
+
+class DiskBPlusTree:
+    def __init__(self, path, cache_pages=1024, page_size=PAGE_SIZE):
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as f:
+                f.write(FILE_HEADER.pack(MAGIC, page_size, 1, 0, 2, 1).ljust(page_size, b'\0'))
+                f.write(encode_page(DiskPage(1, True, array.array('q'), values=array.array('q')), page_size))
+        self.file = open(path, 'r+b')
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+        magic, self.page_size, self.root, self.count, self.pages, self.height = FILE_HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} nie jest plikiem B+-drzewa')
+        self.capacity = page_capacity(self.page_size)
+        self.cache_pages = cache_pages
+        self.cache = OrderedDict()
+
+    def __len__(self):
+        return self.count
+
+    def read(self, number):
+        offset = number * self.page_size
+        return decode_page(number, self.mm[offset:offset + self.page_size], self.page_size)
+
+    def page(self, number):
+        page = self.cache.get(number)
+        if page is not None:
+            self.cache.move_to_end(number)
+            return page
+        page = self.read(number)
+        self.remember(page)
+        return page
+
+    def remember(self, page):
+        self.cache[page.number] = page
+        if len(self.cache) > self.cache_pages:
+            self.cache.popitem(last=False)
+
+    def write(self, page):
+        offset = page.number * self.page_size
+        self.mm[offset:offset + self.page_size] = encode_page(page, self.page_size)
+
+    def write_header(self):
+        FILE_HEADER.pack_into(self.mm, 0, MAGIC, self.page_size, self.root, self.count, self.pages, self.height)
+
+    def allocate(self, page):
+        page.number = self.pages
+        self.pages += 1
+        if self.pages * self.page_size > len(self.mm):
+            size = 2 * len(self.mm)
+            self.mm.resize(size)
+        self.remember(page)
+        self.write(page)
+        self.write_header()
+
+    def find_leaf(self, k, path=None):
+        page = self.page(self.root)
+        while not page.leaf:
+            i = bisect_right(page.keys, k)
+            if path is not None:
+                path.append((page, i))
+            page = self.page(page.children[i])
+        return page
+
+    def search(self, k, default=None):
+        leaf = self.find_leaf(k)
+        i = bisect_left(leaf.keys, k)
+        if i < len(leaf.keys) and leaf.keys[i] == k:
+            return leaf.values[i]
+        return default
+
+    def __contains__(self, k):
+        return self.search(k) is not None
+
+    def __getitem__(self, k):
+        leaf = self.find_leaf(k)
+        i = bisect_left(leaf.keys, k)
+        if i < len(leaf.keys) and leaf.keys[i] == k:
+            return leaf.values[i]
+        raise KeyError(k)
+
+    def __setitem__(self, k, v):
+        self.insert(k, v)
+
+    def __iter__(self):
+        for k, _ in self.items():
+            yield k
+
+    def insert(self, k, v):
+        path = []
+        page = self.find_leaf(k, path)
+        i = bisect_left(page.keys, k)
+        if i < len(page.keys) and page.keys[i] == k:
+            page.values[i] = v
+            self.write(page)
+            return
+        page.keys.insert(i, k)
+        page.values.insert(i, v)
+        self.count += 1
+        if len(page.keys) <= self.capacity:
+            self.write(page)
+            self.write_header()
+            return
+        mid = len(page.keys) // 2
+        new = DiskPage(0, True, page.keys[mid:], values=page.values[mid:], next=page.next, prev=page.number)
+        del page.keys[mid:]
+        del page.values[mid:]
+        self.allocate(new)
+        if new.next:
+            right = self.page(new.next)
+            right.prev = new.number
+            self.write(right)
+        page.next = new.number
+        self.write(page)
+        separator = new.keys[0]
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, new.number)
+            if len(parent.keys) <= self.capacity:
+                self.write(parent)
+                self.write_header()
+                return
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            new = DiskPage(0, False, parent.keys[mid+1:], children=parent.children[mid+1:])
+            del parent.keys[mid:]
+            del parent.children[mid+1:]
+            self.write(parent)
+            self.allocate(new)
+        root = DiskPage(0, False, array.array('q', [separator]), children=array.array('q', [self.root, new.number]))
+        self.allocate(root)
+        self.root = root.number
+        self.height += 1
+        self.write_header()
+
+    def minimum(self):
+        page = self.page(self.root)
+        while not page.leaf:
+            page = self.page(page.children[0])
+        return page.keys[0] if page.keys else None
+
+    def maximum(self):
+        page = self.page(self.root)
+        while not page.leaf:
+            page = self.page(page.children[-1])
+        return page.keys[-1] if page.keys else None
+
+    # Pary z kluczami z [lo, hi), liście czytane po kolei z pominięciem pamięci podręcznej
+    def items(self, lo=None, hi=None):
+        page = self.page(self.root)
+        while not page.leaf:
+            i = 0 if lo is None else bisect_right(page.keys, lo)
+            page = self.page(page.children[i])
+        i = 0 if lo is None else bisect_left(page.keys, lo)
+        while True:
+            keys = page.keys
+            j = len(keys) if hi is None else bisect_left(keys, hi)
+            for t in range(i, j):
+                yield keys[t], page.values[t]
+            if j < len(keys) or not page.next:
+                return
+            page = self.read(page.next)
+            i = 0
+
+    def flush(self):
+        self.write_header()
+        self.mm.flush()
+
+    def close(self):
+        self.flush()
+        self.cache.clear()
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def disk_bulk_load(path, items, fill=1.0, cache_pages=1024, page_size=PAGE_SIZE):
+    cap = page_capacity(page_size)
+    per_page = max(2, int(cap * fill))
+    with open(path, 'wb') as f:
+        f.write(bytes(page_size))
+        # (pierwszy klucz, numer strony) dla każdej strony bieżącego poziomu
+        level = []
+        keys = array.array('q')
+        values = array.array('q')
+        count = 0
+
+        def write_leaf(next):
+            number = len(level) + 1
+            f.write(encode_page(DiskPage(number, True, keys, values=values, next=next, prev=number - 1 if level else 0),
+                                page_size))
+            level.append((keys[0] if keys else 0, number))
+
+        for k, v in items:
+            if keys and k <= keys[-1]:
+                if k < keys[-1]:
+                    raise ValueError('klucze nie są posortowane')
+                values[-1] = v
+                continue
+            if len(keys) == per_page:
+                write_leaf(len(level) + 2)
+                keys = array.array('q')
+                values = array.array('q')
+            keys.append(k)
+            values.append(v)
+            count += 1
+        write_leaf(0)
+        pages = len(level) + 1
+        height = 1
+        # Kolejne poziomy: grupy po per_page + 1 dzieci, ostatnia grupa ma co najmniej 2 dzieci
+        while len(level) > 1:
+            groups = [level[i:i + per_page + 1] for i in range(0, len(level), per_page + 1)]
+            if len(groups) > 1 and len(groups[-1]) == 1:
+                groups[-1].insert(0, groups[-2].pop())
+            level = []
+            for group in groups:
+                page = DiskPage(pages, False, array.array('q', [key for key, _ in group[1:]]),
+                                children=array.array('q', [number for _, number in group]))
+                f.write(encode_page(page, page_size))
+                level.append((group[0][0], pages))
+                pages += 1
+            height += 1
+        f.seek(0)
+        f.write(FILE_HEADER.pack(MAGIC, page_size, level[0][1], count, pages, height))
+    return DiskBPlusTree(path, cache_pages, page_size)
+
+#
+# Złożoność obliczeniowa: wyszukiwanie i wstawianie czytają O(log_B(n)) stron (B ~ 254), a z ciepłą pamięcią podręczną
+# górne poziomy są już w pamięci, więc z dysku czytamy zwykle tylko liść. disk_bulk_load to Theta(n) z zapisem
+# sekwencyjnym, przejście po przedziale to O(log_B(n) + m/B) odczytanych stron dla m zwróconych par. Otwarcie pliku to
+# O(1) - mmap nic nie wczytuje od razu.
+# Złożoność pamięciowa: plik ma ~n/(B*fill) stron, w pamięci procesu trzymamy co najwyżej cache_pages zdekodowanych stron.
+# =================================================================================================
+
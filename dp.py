@@ -46,6 +46,14 @@
 # 5. Problem wydawania reszty
 # =================================================================================================
 
+import array
+import math
+import mmap
+import os
+import time
+from collections import OrderedDict
+from operator import add, mul
+
 # =================================================================================================
 # Kod i wyjaśnienia:
 #
@@ -116,9 +124,10 @@ def print_parenthesis(s, i, j):
         print_parenthesis(s, k+1, j)
         print(")", end='')
 
-m, s = mcm(p, INF)
-print_parenthesis(s, 1, len(p) - 1)
-print() # Wyłącznie dla testowania w konsoli
+if __name__ == '__main__':
+    m, s = mcm(p, INF)
+    print_parenthesis(s, 1, len(p) - 1)
+    print() # Wyłącznie dla testowania w konsoli
 
 # Złożoność obliczeniowa:
 # Bez DP sprawdzamy każdą możliwość, więc dla ciągu n macierzy jest to n-1 liczba Catalana, więc
@@ -128,6 +137,181 @@ print() # Wyłącznie dla testowania w konsoli
 #   a) Time Complexity: Theta(n^3) - uwaga, na wykładzie było Omega(n^3), nie wiem dlaczego
 #   b) Space Complexity: Theta(n^2)
 
+# MCM dla długich łańcuchów (n w tysiącach):
+#   a) wiersze i kolumny zamiast pojedynczych komórek: dla ustalonego (i,j) wszystkie kandydaty k = i...j-1 to
+#      m[i][k] + m[k+1][j] + p_(i-1)*p_k*p_j, czyli wycinek wiersza i tablicy m, wycinek kolumny j oraz wycinek p.
+#      Trzymamy dodatkowo transpozycję mt[j][k] = m[k][j], żeby kolumna też była ciągłą listą, i liczymy minimum jednym
+#      przejściem zip + min zamiast pętli z porównaniami. Przekątne (długości v) liczymy jak w mcm, od najkrótszych.
+#      Uwaga: optymalizacja Knutha (s[i][j-1] <= s[i][j] <= s[i+1][j], co daje O(n^2)) NIE działa dla MCM - koszt
+#      p_(i-1)*p_k*p_j nie spełnia nierówności czworokąta (np. dla p = [1, 1, 2, 3, 1] daje koszt 10 zamiast 9).
+#   b) heurystyka Hu-Shinga w O(n): korzystamy z równoważności MCM i triangulacji wielokąta o wierzchołkach V_0, ..., V_n
+#      z wagami p_0, ..., p_n (macierz A_i to bok V_(i-1)V_i, koszt trójkąta to iloczyn wag). Niech V_1 ma najmniejszą
+#      wagę. Dla czworokąta V_1, V_s, V_t, V_c odcięcie V_t (przekątna V_sV_c) jest tańsze od przekątnej V_1V_t wtedy,
+#      gdy 1/w_1 + 1/w_t < 1/w_s + 1/w_c. Przechodzimy wierzchołki po kolei od V_1, trzymając je na stosie; dopóki
+#      wierzchołek na szczycie spełnia ten warunek z sąsiadem pod nim i bieżącym wierzchołkiem, odcinamy go (trójkąt
+#      s-t-c). Na koniec stos jest "wachlarzem" z V_1. Wynik jest co najwyżej o 15.47% droższy od optimum
+#      (2/sqrt(3) - 1). Dokładny algorytm Hu-Shinga w O(n log n) jest dużo bardziej skomplikowany i go tu nie ma.
+#
+# Zamiast wypisywać nawiasowanie zwracamy plan: listę kroków (i, k, j) w kolejności wykonywania (postorder), gdzie krok
+# oznacza A_(i,j) = A_(i,k) * A_(k+1,j). Oba argumenty kroku są już policzone (albo są pojedynczymi macierzami), więc
+# plan można wykonać jedną pętlą. s może być tablicą z mcm albo słownikiem słowników z hu_shing_approx_split -
+# wystarczy s[i][j].
+
+# cost(a, b, c) zastępuje p_a * p_b * p_c (patrz triangulacja wielokąta), wtedy p to tylko lista wierzchołków
+def mcm_split(p, cost=None):
+    n = len(p)-1
+    m = [[0] * (n+1) for _ in range(n+1)]
+    mt = [[0] * (n+1) for _ in range(n+1)]
+    s = [[0] * (n+1) for _ in range(n+1)]
+
+    for v in range(2, n+1):
+        for i in range(1, n-v+2):
+            j = i + v - 1
+            if cost is None:
+                pij = p[i-1] * p[j]
+                q = [a + b + pij*pk for a, b, pk in zip(m[i][i:j], mt[j][i+1:j+1], p[i:j])]
+            else:
+                q = [a + b + cost(i-1, k, j) for a, b, k in zip(m[i][i:j], mt[j][i+1:j+1], range(i, j))]
+            best = min(q)
+            m[i][j] = mt[j][i] = best
+            s[i][j] = i + q.index(best)
+
+    return m[1][n], s
+
+def hu_shing_approx_split(p):
+    n = len(p)-1
+    s = {i: {} for i in range(1, n+1)}
+    if n < 2:
+        return 0, s
+    first = min(range(n+1), key=p.__getitem__)
+    w1 = p[first]
+    triangles = []
+    stack = [first, (first+1) % (n+1)]
+    for t in range(2, n+1):
+        c = (first+t) % (n+1)
+        wc = p[c]
+        while len(stack) >= 2:
+            ws, wt = p[stack[-2]], p[stack[-1]]
+            # 1/w_1 + 1/w_t < 1/w_s + 1/w_c po przemnożeniu przez w_1*w_s*w_t*w_c
+            if ws*wt*wc + w1*ws*wc < w1*ws*wt + w1*wt*wc:
+                triangles.append((stack[-2], stack.pop(), c))
+            else:
+                break
+        stack.append(c)
+    for a, b in zip(stack[1:], stack[2:]):
+        triangles.append((first, a, b))
+
+    cost = 0
+    for t in triangles:
+        a, b, c = sorted(t)
+        # Trójkąt a < b < c dzieli ciąg A_(a+1), ..., A_c na A_(a+1,b) * A_(b+1,c)
+        s[a+1][c] = b
+        cost += p[a] * p[b] * p[c]
+    return cost, s
+
+# Plan mnożenia A_(i,j) jako lista kroków (i, k, j) - bez rekurencji, bo dla n w tysiącach drzewo może być głębokie
+def mcm_steps(s, i, j):
+    steps = []
+    stack = [(i, j)]
+    while stack:
+        i, j = stack.pop()
+        if i == j:
+            continue
+        k = s[i][j]
+        steps.append((i, k, j))
+        stack.append((i, k))
+        stack.append((k+1, j))
+    steps.reverse()
+    return steps
+
+# Ten sam plan jako drzewo: liść to numer macierzy, węzeł to para (lewe poddrzewo, prawe poddrzewo)
+def mcm_tree(steps):
+    if not steps:
+        return 1
+    done = {}
+    for i, k, j in steps:
+        done[i, j] = (done.pop((i, k), i), done.pop((k+1, j), j))
+    return done.popitem()[1]
+
+def plan_cost(p, steps):
+    return sum(p[i-1] * p[k] * p[j] for i, k, j in steps)
+
+# Złożoność obliczeniowa:
+#   a) Time Complexity: mcm_split Theta(n^3) (jak mcm, ale wewnętrzna pętla idzie przez zip/min), hu_shing_approx_split O(n),
+#      mcm_steps i mcm_tree O(n)
+#   b) Space Complexity: mcm_split Theta(n^2) (trzy tablice), hu_shing_approx_split O(n)
+
+# Wykonanie planu na prawdziwych macierzach:
+# Macierze trzymamy jako listy wierszy (lista list liczb). Wymiary p_0, ..., p_n odczytujemy z samych macierzy
+# (A_i ma p_(i-1) wierszy i p_i kolumn) i sprawdzamy, czy sąsiednie macierze da się pomnożyć. Plan zależy tylko od
+# krotki wymiarów, więc trzymamy go w słowniku PLAN_CACHE - kolejne wywołania z tymi samymi kształtami pomijają DP.
+# Domyślnie (exact_limit=None) każdy łańcuch planujemy dokładnie przez mcm_split. Wywołujący może podać exact_limit,
+# wtedy łańcuchy dłuższe niż exact_limit planujemy heurystyką hu_shing_approx_split w O(n) zamiast Theta(n^3).
+# Heurystyka może dać plan do 15.47% droższy od optymalnego, więc plan i raport mają pole approximate - wywołujący
+# wie, że nie dostał optymalnej kolejności. Macierz bez wierszy nie ma wymiarów do odczytania - to ValueError.
+#
+# Koszt w notatkach to liczba mnożeń skalarnych p_(i-1)*p_k*p_j. W raporcie podajemy FLOPs = 2 * mnożenia (mnożenie
+# i dodawanie): estimated_flops z planu, measured_flops policzone z wymiarów macierzy faktycznie mnożonych w trakcie
+# wykonania (mają się zgadzać), left_to_right_flops dla naiwnego ((A_1 * A_2) * A_3) * ... oraz czas wykonania.
+
+def matmul(A, B):
+    BT = list(zip(*B))
+    return [[sum(map(mul, row, col)) for col in BT] for row in A]
+
+PLAN_CACHE = {}
+
+def plan_key(p, exact_limit):
+    return tuple(p), exact_limit is not None and len(p)-1 > exact_limit
+
+# Zwraca (koszt, kroki, approximate)
+def chain_plan(p, exact_limit=None):
+    key = plan_key(p, exact_limit)
+    plan = PLAN_CACHE.get(key)
+    if plan is None:
+        n = len(p)-1
+        approximate = key[1]
+        cost, s = hu_shing_approx_split(p) if approximate else mcm_split(p)
+        plan = PLAN_CACHE[key] = (cost, mcm_steps(s, 1, n), approximate)
+    return plan
+
+def chain_multiply(matrices, exact_limit=None):
+    n = len(matrices)
+    if n == 0:
+        raise ValueError('pusty ciąg macierzy')
+    for i, M in enumerate(matrices, 1):
+        if not M:
+            raise ValueError(f'A_{i} nie ma wierszy')
+    p = [len(matrices[0])] + [len(M[0]) for M in matrices]
+    for i in range(1, n):
+        if len(matrices[i]) != p[i]:
+            raise ValueError(f'A_{i} ma {p[i]} kolumn, a A_{i+1} ma {len(matrices[i])} wierszy')
+
+    planned = plan_key(p, exact_limit) not in PLAN_CACHE
+    cost, steps, approximate = chain_plan(p, exact_limit)
+
+    start = time.perf_counter()
+    done = {}
+    mults = 0
+    for i, k, j in steps:
+        L = done.pop((i, k)) if i < k else matrices[i-1]
+        R = done.pop((k+1, j)) if k+1 < j else matrices[j-1]
+        mults += len(L) * len(R) * len(R[0])
+        done[i, j] = matmul(L, R)
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        'planned': planned,
+        'approximate': approximate,
+        'estimated_flops': 2 * cost,
+        'measured_flops': 2 * mults,
+        'left_to_right_flops': 2 * sum(p[0] * p[k] * p[k+1] for k in range(1, n)),
+        'time': elapsed,
+    }
+    return (done[1, n] if n > 1 else matrices[0]), stats
+
+# Złożoność obliczeniowa: planowanie jak w mcm_split / hu_shing_approx_split (raz dla danej krotki wymiarów), wykonanie
+# to Theta(koszt planu) operacji, słownik done trzyma O(głębokość planu) pośrednich wyników naraz.
+
 # Triangulacja wielokąta:
 # Mamy n-kąt, który podzielimy na trójkąty. Liczba wynikowych trójkątów jest równa n-2, więc problem triangulacji
 # n+1 kąta (na n-1 trójkątów) odpowiada problemowi nawiasowania n macierzy (n-1 mnożeń). Dane są punkty A_1, A_2, ..., A_n.
@@ -137,7 +321,127 @@ print() # Wyłącznie dla testowania w konsoli
 # który ma wszystkie krawędzie A_(i,i+1), A_(i+1,i+2), ..., A_(j-1,j).
 # Właśność optymalnej podstruktury polega na tym, że gdy już podzielimy wielokąt na dwa wielokąty i trójkąt, to generuje nam
 # to dwa podproblemy, które również muszą być rozwiązane optymalnie.
-# ... ... ... 
+#
+# 2. Równanie rekurencyjne: numerujemy wierzchołki V_0, V_1, ..., V_n, a t[i,j] to koszt triangulacji wielokąta
+# V_(i-1), V_i, ..., V_j (tak jak m[i,j] w MCM, bok V_(i-1)V_i odpowiada macierzy A_i):
+#   a) t[i,j] = 0, i = j (wielokąt "dwukąt", czyli sam bok)
+#   b) t[i,j] = min(t[i,k] + t[k+1,j] + w(V_(i-1), V_k, V_j)), i <= k < j
+# Jedyna różnica względem MCM to koszt trójkąta w zamiast p_(i-1) * p_k * p_j, więc używamy mcm_split z parametrem
+# cost (te same przekątne i wycinki wierszy / kolumn), a kroki (i, k, j) planu z mcm_steps to trójkąty (i-1, k, j).
+# Domyślny koszt to obwód trójkąta (suma długości boków), ale można podać dowolną funkcję trzech punktów.
+
+def perimeter(a, b, c):
+    return math.dist(a, b) + math.dist(b, c) + math.dist(a, c)
+
+def triangulate(points, weight=perimeter):
+    n = len(points)-1
+    if n < 2:
+        return 0, []
+    cost, s = mcm_split(points, lambda a, b, c: weight(points[a], points[b], points[c]))
+    return cost, [(i-1, k, j) for i, k, j in mcm_steps(s, 1, n)]
+
+# Złożoność obliczeniowa: jak mcm_split, czyli Theta(n^3) czasu i Theta(n^2) pamięci dla n+1 wierzchołków.
+
+# Diamenty: tablica R x C z liczbą diamentów w każdym polu, zaczynamy w lewym górnym rogu (0,0), kończymy w prawym dolnym
+# (R-1,C-1) i możemy iść tylko w prawo albo w dół. Chcemy zebrać jak najwięcej diamentów (tu indeksujemy od 0, bo
+# wiersze mogą pochodzić wprost z pliku).
+#
+# 1. Optymalna podstruktura: do pola (r,c) wchodzimy z (r-1,c) albo z (r,c-1), więc optymalna ścieżka do (r,c) to
+# optymalna ścieżka do jednego z tych pól plus pole (r,c).
+#
+# 2. Równanie rekurencyjne:
+#   a) d[0,0] = g[0,0]
+#   b) d[r,c] = max(d[r-1,c], d[r,c-1]) + g[r,c] (brakującego sąsiada spoza tablicy pomijamy)
+#
+# 3. Wiersz po wierszu: d[r] zależy tylko od d[r-1] i g[r], więc wystarczy jeden wiersz "row", który nadpisujemy
+# od lewej - row[c] to jeszcze d[r-1,c], a row[c-1] to już d[r,c-1]. Wiersze tablicy czytamy strumieniowo - mogą to
+# być listy, generator albo MmapGrid: plik z liczbami int64 zapisanymi wierszami, otwarty przez mmap. Wiersz MmapGrid
+# to memoryview na fragment pliku (bez kopiowania), więc tablica 10^5 x 10^5 (80 GB) nie musi mieścić się w pamięci -
+# system operacyjny wczytuje strony pliku na żądanie.
+#
+# 4. Rekonstrukcja z punktami kontrolnymi: cofając się z (r,c), wiemy że wartość poprzedniego pola to d[r,c] - g[r,c].
+# Jeśli d[r,c-1] jest jej równe, to przyszliśmy z lewej, w przeciwnym razie z góry - potrzebujemy więc tylko wiersza d[r].
+# W pierwszym przejściu zapamiętujemy co K-ty wiersz d (K ~ sqrt(R)). W drugim przejściu idziemy blokami od dołu:
+# odtwarzamy wiersze bloku z jego punktu kontrolnego, cofamy ścieżkę przez blok i zwalniamy go. Pamięć to
+# O(C * (R/K + K)) = O(C * sqrt(R)) zamiast O(R*C), kosztem dwukrotnego przejścia po tablicy.
+
+class MmapGrid:
+    def __init__(self, path, cols, typecode='q'):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.cells = memoryview(self.map).cast(typecode)
+        self.cols = cols
+
+    def __len__(self):
+        return len(self.cells) // self.cols
+
+    def __getitem__(self, r):
+        if not 0 <= r < len(self):
+            raise IndexError(r)
+        return self.cells[r*self.cols:(r+1)*self.cols]
+
+    def close(self):
+        self.cells.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def diamonds_row(row, g):
+    if row is None:
+        row = [0] * len(g)
+        acc = 0
+        for c, x in enumerate(g):
+            acc += x
+            row[c] = acc
+        return row
+    left = row[0] = row[0] + g[0]
+    for c in range(1, len(g)):
+        up = row[c]
+        left = row[c] = (up if up > left else left) + g[c]
+    return row
+
+def diamonds_value(rows):
+    row = None
+    for g in rows:
+        row = diamonds_row(row, g)
+    return row[-1]
+
+# grid musi pozwalać na grid[r] (lista wierszy albo MmapGrid), bo wiersze czytamy dwa razy
+def diamonds_path(grid, checkpoint=None):
+    R = len(grid)
+    K = checkpoint or max(1, math.isqrt(R))
+    checkpoints = {}
+    row = None
+    for r in range(R):
+        row = diamonds_row(row, grid[r])
+        if r % K == 0:
+            checkpoints[r] = row[:]
+    best = row[-1]
+
+    path = []
+    c = len(row) - 1
+    for start in range((R-1) // K * K, -1, -K):
+        block = [checkpoints.pop(start)]
+        for r in range(start+1, min(start+K, R)):
+            block.append(diamonds_row(block[-1][:], grid[r]))
+        for r in range(start + len(block) - 1, start - 1, -1):
+            d, g = block[r - start], grid[r]
+            path.append((r, c))
+            while c > 0 and d[c-1] == d[c] - g[c]:
+                c -= 1
+                path.append((r, c))
+            block.pop()
+    path.reverse()
+    return best, path
+
+# Złożoność obliczeniowa (tablica R x C):
+#   a) Time Complexity: Theta(R*C) dla diamonds_value, Theta(R*C) dla diamonds_path (dwa przejścia po tablicy)
+#   b) Space Complexity: Theta(C) dla diamonds_value, Theta(C * sqrt(R) + R + C) dla diamonds_path
 
 # Dyskretny problem plecakowy: dysponujemy n przedmiotami, każdy ma wagę w_i oraz wartość v_i. Mamy także plecak zdolny do 
 # zapakowania W kilograrmów. Musimy tak dobrać przedmioty, aby w tym plecaku była jak najbardziej wartościowa ich kombinacja.
@@ -181,13 +485,105 @@ def discrete_knapsack(W, N, v, w):
     print(f"Maksymalny zysk: {dp[N][W]}")
     return dp
 
-dp = discrete_knapsack(W, N, v, w)
+if __name__ == '__main__':
+    dp = discrete_knapsack(W, N, v, w)
 
 # Złożoność obliczeniowa:
 #   a) Time Complexity: Theta(N*W)
 #   b) Space Complexity: Theta(N*W)
 # Można to uprościć do Theta(n^2), ale pierwszy zapis jest dokładniejszy  
 
+# Plecak w pamięci O(W):
+# Wiersz dp[i] zależy tylko od wiersza dp[i-1], więc wystarczy jedna tablica row[0...W]. Jeśli aktualizujemy ją od
+# największej pojemności w dół (cw = W, W-1, ..., w_i), to row[cw - w_i] jest jeszcze wartością z wiersza i-1, więc każdy
+# przedmiot zostanie wzięty co najwyżej raz (przy aktualizacji w górę dostalibyśmy plecak z nieograniczoną liczbą kopii).
+# Przy okazji pomijamy pojemności cw < w_i - tam wiersz się nie zmienia, więc nie ma czego kopiować.
+# Uwaga praktyczna: w CPythonie aktualizacja całego wiersza naraz (wycinki + map(max, ...) albo list comprehension) jest
+# wolniejsza od tej pętli, bo i tak każda komórka przechodzi przez interpreter, a pętla zapisuje tylko poprawione komórki.
+#
+# Z jednym wierszem tracimy tablicę potrzebną do backtrackingu. Są dwa sposoby, by odzyskać zbiór przedmiotów:
+#   a) wiersze decyzji jako bitsety: dla każdego przedmiotu zapamiętujemy tylko bit "wzięty dla pojemności cw"
+#      (liczba int z W+1 bitami). To N*(W+1)/8 bajtów zamiast N*(W+1) liczb, ale wciąż O(N*W).
+#   b) dziel i zwyciężaj w stylu Hirschberga: dzielimy przedmioty na połowy lo...mid oraz mid+1...hi i liczymy dwa wiersze
+#      F (pierwsza połowa) i B (druga połowa). row[c] to najlepszy zysk przy wadze co najwyżej c, więc optymalne
+#      rozwiązanie rozdziela pojemność na c dla pierwszej połowy i W-c dla drugiej, gdzie c maksymalizuje F[c] + B[W-c].
+#      Rekurencyjnie rozwiązujemy oba podproblemy. Na poziomie k mamy 2^k podproblemów po N/2^k przedmiotów, a ich
+#      pojemności sumują się do W, więc poziom kosztuje N*W/2^k i całość to nadal O(N*W). Wiersze zwalniamy przed
+#      zejściem niżej, więc pamięć to O(W + log N).
+
+# Wiersz row[0...W] dla przedmiotów lo...hi (tablice v i w są 1-indexed, jak w discrete_knapsack)
+def knapsack_row(W, v, w, lo, hi):
+    row = [0] * (W+1)
+    for i in range(lo, hi+1):
+        wi, vi = w[i], v[i]
+        if wi > W or vi <= 0:
+            continue
+        for cw in range(W, wi-1, -1):
+            q = row[cw-wi] + vi
+            if q > row[cw]:
+                row[cw] = q
+    return row
+
+def knapsack_value(W, N, v, w):
+    return knapsack_row(W, v, w, 1, N)[W]
+
+# a) Rekonstrukcja z bitsetów decyzji - bit cw liczby take[i] mówi, czy przedmiot i jest wzięty przy pojemności cw
+BITS = bytes.maketrans(b'\x00\x01', b'01')
+
+def knapsack_items_bitset(W, N, v, w):
+    row = [0] * (W+1)
+    take = [0] * (N+1)
+    for i in range(1, N+1):
+        wi, vi = w[i], v[i]
+        if wi > W or vi <= 0:
+            continue
+        decision = bytearray(W+1)
+        for cw in range(W, wi-1, -1):
+            q = row[cw-wi] + vi
+            if q > row[cw]:
+                row[cw] = q
+                decision[cw] = 1
+        # Bajty 0/1 zamieniamy na napis '0'/'1' i parsujemy jako liczbę binarną (bit 0 = pojemność 0)
+        take[i] = int(decision.translate(BITS)[::-1], 2)
+
+    items = []
+    cw = W
+    for i in range(N, 0, -1):
+        if take[i] >> cw & 1:
+            items.append(i)
+            cw -= w[i]
+    items.reverse()
+    return row[W], items
+
+# b) Rekonstrukcja Hirschberga - pamięć O(W)
+def knapsack_items(W, N, v, w):
+    items = []
+    knapsack_split(W, v, w, 1, N, items)
+    items.sort()
+    return sum(v[i] for i in items), items
+
+def knapsack_split(W, v, w, lo, hi, items):
+    if lo > hi:
+        return
+    if lo == hi:
+        if w[lo] <= W and v[lo] > 0:
+            items.append(lo)
+        return
+    mid = (lo + hi) // 2
+    F = knapsack_row(W, v, w, lo, mid)
+    B = knapsack_row(W, v, w, mid+1, hi)
+    # c maksymalizuje F[c] + B[W-c]
+    total = list(map(add, F, reversed(B)))
+    c = total.index(max(total))
+    del F, B, total
+    knapsack_split(c, v, w, lo, mid, items)
+    knapsack_split(W-c, v, w, mid+1, hi, items)
+
+# Złożoność obliczeniowa:
+#   a) Time Complexity: Theta(N*W) dla knapsack_value i knapsack_items_bitset, O(N*W) dla knapsack_items (około 2 razy
+#      więcej pracy niż sam wiersz)
+#   b) Space Complexity: Theta(W) dla knapsack_value i knapsack_items, Theta(N*W/8) bajtów dla knapsack_items_bitset
+
 # Problem wydawania reszty: mamy do dyspozycji nieskończenie wiele nominałów o wartościach z tablicy N.
 # Chcemy wydać kwotę K za pomocą jak najmniejszej liczby monet z tablicy N. Liczba różnych nominałów to length(N) = L.
 #
@@ -225,12 +621,463 @@ def coin_change(N, L, K):
     print(f"Minimalna liczba monet potrzebna: {dp[L][K]}")
     return dp
 
-coin_change(N, L, K)
+if __name__ == '__main__':
+    coin_change(N, L, K)
 
 # Złożoność obliczeniowa:
 #   a) Time Complexity: Theta(K*L)
 #   b) Space Complexity: Theta(K*L)
 
+# Wydawanie reszty dla wielu kwot:
+# Przy nieograniczonej liczbie monet wiersz i w powyższej tabeli nie jest potrzebny - wystarczy jednowymiarowa tablica
+# best[0...K], gdzie best[j] = min(best[j - N[i]] + 1) po wszystkich monetach N[i] <= j, oraz best[0] = 0. Każda kwota
+# zależy tylko od mniejszych kwot, więc tablicę można w każdej chwili przedłużyć z K do K' > K bez liczenia od nowa.
+# Dla ustalonego zbioru nominałów liczymy ją raz (do największej kwoty, o jaką ktoś zapytał), a kolejne zapytania to
+# odczyt best[j]. Tablice dla zbiorów nominałów trzymamy w słowniku COIN_TABLES (klucz to posortowana krotka nominałów).
+#
+# Rekonstrukcja: last[j] zapamiętuje monetę, która dała minimum dla kwoty j, więc zbiór monet dla kwoty K odczytujemy
+# idąc K -> K - last[K] -> ... -> 0 (co najwyżej best[K] kroków).
+#
+# Liczba sposobów: ways[i][j] = liczba różnych multizbiorów monet N[0...i] o sumie j, czyli
+# ways[i][j] = ways[i-1][j] (bez monety N[i]) + ways[i][j - N[i]] (z co najmniej jedną monetą N[i]). Moneta N[i]
+# wchodzi tylko przez swój wiersz, więc każdy multizbiór liczymy raz, a nie każdą permutację osobno. Zwykle trzyma się
+# tylko jeden wiersz z pętlą zewnętrzną po monetach, ale wtedy tablicy nie da się przedłużyć - do większego K trzeba by
+# liczyć wszystko od nowa. Trzymając wiersz dla każdego prefiksu monet, kolumnę j liczymy z kolumn < j, więc tak jak
+# best tablicę przedłużamy tylko o nowe kwoty, kosztem pamięci Theta(K*L) zamiast Theta(K). Liczba sposobów rośnie
+# wykładniczo z K, ale int w Pythonie nie ma ograniczenia rozmiaru. Dla bardzo dużych K wygodniej liczyć modulo
+# (np. 10^9 + 7), żeby liczby nie rosły - dla każdego mod trzymamy osobne wiersze.
+#
+# Kwoty, których nie da się wydać, oznaczamy w best własnym znacznikiem UNREACHABLE (największa wartość typu 'q'),
+# a nie INF z wykładu - tablica nie zależy wtedy od stałej z notatek.
+
+# Ujemna kwota nie ma sensu, a jako indeks tablicy czytałaby od końca
+def check_amount(K):
+    if K < 0:
+        raise ValueError(f'ujemna kwota: {K}')
+
+class CoinTable:
+    UNREACHABLE = 2**63 - 1
+
+    def __init__(self, coins):
+        self.coins = sorted(set(c for c in coins if c > 0))
+        self.best = array.array('q', [0])
+        self.last = array.array('q', [0])
+        self.ways = {}
+
+    # Przedłuża tablice best i last do kwoty K
+    def extend(self, K):
+        best, last, coins = self.best, self.last, self.coins
+        unreachable = self.UNREACHABLE
+        for j in range(len(best), K+1):
+            b, bc = unreachable, 0
+            for c in coins:
+                if c > j:
+                    break
+                if best[j-c] < b:
+                    b, bc = best[j-c], c
+            best.append(b+1 if b < unreachable else unreachable)
+            last.append(bc)
+
+    # Minimalna liczba monet albo None, jeśli kwoty nie da się wydać
+    def min_coins(self, K):
+        check_amount(K)
+        if K >= len(self.best):
+            self.extend(K)
+        return self.best[K] if self.best[K] < self.UNREACHABLE else None
+
+    def min_coins_many(self, amounts):
+        amounts = list(amounts)
+        if amounts:
+            check_amount(min(amounts))
+            self.extend(max(amounts))
+        best, unreachable = self.best, self.UNREACHABLE
+        return [best[K] if best[K] < unreachable else None for K in amounts]
+
+    # Monety (posortowane) wydające kwotę K optymalnie, albo None
+    def change(self, K):
+        if self.min_coins(K) is None:  # min_coins sprawdza też K < 0
+            return None
+        out = []
+        while K > 0:
+            out.append(self.last[K])
+            K -= self.last[K]
+        out.sort()
+        return out
+
+    # Liczba multizbiorów monet o sumie K (dokładnie albo modulo mod)
+    def count_ways(self, K, mod=None):
+        check_amount(K)
+        if not self.coins:
+            ways = 1 if K == 0 else 0
+            return ways if mod is None else ways % mod
+        # rows[i] - wiersz ways[i] dla monet coins[0...i], przedłużany o brakujące kwoty
+        rows = self.ways.get(mod)
+        if rows is None:
+            rows = self.ways[mod] = [[1] for _ in self.coins]
+        for j in range(len(rows[0]), K+1):
+            w = 0
+            for c, row in zip(self.coins, rows):
+                if c <= j:
+                    w += row[j-c]
+                    if mod is not None:
+                        w %= mod
+                row.append(w)
+        return rows[-1][K] if mod is None else rows[-1][K] % mod
+
+COIN_TABLES = {}
+
+def coin_table(coins):
+    key = tuple(sorted(set(c for c in coins if c > 0)))
+    if key not in COIN_TABLES:
+        COIN_TABLES[key] = CoinTable(key)
+    return COIN_TABLES[key]
+
+# Złożoność obliczeniowa (L nominałów, K największa kwota):
+#   a) Time Complexity: Theta(K*L) raz dla zbioru nominałów, potem O(1) na zapytanie o liczbę monet i O(best[K]) na
+#      rekonstrukcję. count_ways to łącznie Theta(K*L) operacji na liczbach, które bez mod mają O(K) cyfr - przy
+#      rosnących K liczymy tylko nowe kwoty, a zapytanie o już policzone K to O(1).
+#   b) Space Complexity: Theta(K) - dwie tablice po 8 bajtów na kwotę (plus Theta(K*L) liczb na wiersze ways dla
+#      każdego mod, jeśli liczymy sposoby)
+
+# Spamiętywanie jako osobny mechanizm:
+# Wszystkie powyższe algorytmy to ręcznie napisane tabele bottom-up. Tymczasem równanie rekurencyjne wystarczy zapisać
+# raz, jako dwie funkcje stanu (podproblemu):
+#   a) deps(state) - lista podproblemów, od których zależy state (pusta dla warunków brzegowych),
+#   b) combine(state, values) - wartość state, gdy values[t] to wartość deps(state)[t].
+# Recurrence potrafi taką rekurencję policzyć na dwa sposoby:
+#   a) top_down(state) - spamiętywanie, ale bez rekurencji Pythona (limit ~1000 wywołań): jawny stos ramek
+#      (state, deps, values). Ramka zbiera wartości swoich zależności po kolei - trafienie w cache od razu dokłada
+#      wartość, chybienie kładzie na stos nową ramkę, a jej wynik wraca do rodzica. Odwiedzamy tylko stany osiągalne
+#      ze state, więc przy rzadkiej przestrzeni (np. plecak z W = 10^9 i kilkoma przedmiotami) liczymy mało stanów.
+#      Cache jest wymienny - zwykły dict (bez limitu), LRUCache (wyrzuca najdawniej używany) albo BoundedCache (wyrzuca
+#      najdawniej wstawiony). Wartości z cache wyrzucone za wcześnie zostaną po prostu policzone ponownie (liczniki
+#      hits / misses pokazują, ile to kosztuje), a wartości potrzebne ramkom na stosie są w ramkach, więc nic nie ginie.
+#      Cache o rozmiarze 0 nie ma sensu (nie ma czego wyrzucić przy pierwszym wstawieniu) - maxsize < 1 to ValueError.
+#   b) bottom_up(state) - najpierw przeszukiwanie w głąb od state wyznacza porządek topologiczny osiągalnych stanów
+#      (postorder - każdy stan po swoich zależnościach) i liczbę użyć każdego stanu, a potem liczymy stany w tej
+#      kolejności. Wartość stanu usuwamy, gdy policzyliśmy wszystkie stany, które jej używały, więc pamięć to tylko
+#      "front" obliczeń (peak_live), a nie cała tablica.
+# Cykl w zależnościach oznacza, że rekurencja jest źle zdefiniowana - zgłaszamy ValueError zamiast pętlić się w
+# nieskończoność.
+
+MISSING = object()
+
+class LRUCache:
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError('maxsize musi być co najmniej 1')
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        value = self.data.get(key, MISSING)
+        if value is MISSING:
+            return default
+        self.data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+# Słownik z limitem rozmiaru - dict pamięta kolejność wstawiania, więc najstarszy klucz to next(iter(data))
+class BoundedCache:
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError('maxsize musi być co najmniej 1')
+        self.maxsize = maxsize
+        self.data = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __setitem__(self, key, value):
+        if key not in self.data and len(self.data) >= self.maxsize:
+            del self.data[next(iter(self.data))]
+        self.data[key] = value
+
+class Recurrence:
+    def __init__(self, deps, combine, cache=None):
+        self.deps = deps
+        self.combine = combine
+        self.cache = {} if cache is None else cache
+        self.hits = 0
+        self.misses = 0
+        self.evaluated = 0
+        self.peak_live = 0
+
+    def top_down(self, state):
+        cache = self.cache
+        value = cache.get(state, MISSING)
+        if value is not MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        stack = [(state, list(self.deps(state)), [])]
+        active = {state}
+        while True:
+            s, ds, values = stack[-1]
+            if len(values) < len(ds):
+                d = ds[len(values)]
+                value = cache.get(d, MISSING)
+                if value is not MISSING:
+                    self.hits += 1
+                    values.append(value)
+                    continue
+                if d in active:
+                    raise ValueError(f'cykl w zależnościach: {d}')
+                self.misses += 1
+                stack.append((d, list(self.deps(d)), []))
+                active.add(d)
+                continue
+            stack.pop()
+            active.discard(s)
+            value = self.combine(s, values)
+            self.evaluated += 1
+            cache[s] = value
+            if not stack:
+                return value
+            stack[-1][2].append(value)
+
+    # Porządek topologiczny stanów osiągalnych ze state oraz liczba użyć każdego stanu
+    def order(self, state):
+        order = []
+        uses = {state: 0}
+        active = {state}
+        stack = [(state, iter(self.deps(state)))]
+        while stack:
+            s, it = stack[-1]
+            for d in it:
+                if d in uses:
+                    if d in active:
+                        raise ValueError(f'cykl w zależnościach: {d}')
+                    uses[d] += 1
+                    continue
+                uses[d] = 1
+                active.add(d)
+                stack.append((d, iter(self.deps(d))))
+                break
+            else:
+                stack.pop()
+                active.discard(s)
+                order.append(s)
+        return order, uses
+
+    def bottom_up(self, state):
+        order, uses = self.order(state)
+        live = {}
+        for s in order:
+            ds = list(self.deps(s))
+            live[s] = self.combine(s, [live[d] for d in ds])
+            self.evaluated += 1
+            if len(live) > self.peak_live:
+                self.peak_live = len(live)
+            for d in ds:
+                uses[d] -= 1
+                if uses[d] == 0:
+                    del live[d]
+        return live[state]
+
+# Przykłady - te same rekurencje co wyżej, zapisane jako deps + combine:
+
+# Plecak: stan (i, cw) - najlepszy zysk z przedmiotów 1...i przy pojemności cw
+def knapsack_recurrence(v, w, cache=None):
+    def deps(state):
+        i, cw = state
+        if i == 0:
+            return []
+        if w[i] > cw:
+            return [(i-1, cw)]
+        return [(i-1, cw), (i-1, cw - w[i])]
+
+    def combine(state, values):
+        if not values:
+            return 0
+        if len(values) == 1:
+            return values[0]
+        return max(values[0], values[1] + v[state[0]])
+
+    return Recurrence(deps, combine, cache)
+
+# MCM: stan (i, j) - koszt A_(i,j); zależności to pary (i,k), (k+1,j) dla kolejnych k
+def mcm_recurrence(p, cache=None):
+    def deps(state):
+        i, j = state
+        out = []
+        for k in range(i, j):
+            out.append((i, k))
+            out.append((k+1, j))
+        return out
+
+    def combine(state, values):
+        i, j = state
+        if i == j:
+            return 0
+        return min(values[2*t] + values[2*t+1] + p[i-1]*p[i+t]*p[j] for t in range(j-i))
+
+    return Recurrence(deps, combine, cache)
+
+# Złożoność obliczeniowa (S - liczba stanów osiągalnych ze state, D - suma długości list deps):
+#   a) Time Complexity: bottom_up i top_down z nieograniczonym cache Theta(S + D) wywołań deps/combine i operacji
+#      na słownikach (top_down wywołuje deps raz na chybienie). Przy cache z limitem stany mogą być liczone wielokrotnie,
+#      w najgorszym razie wykładniczo wiele razy - tak jak rekurencja bez spamiętywania.
+#   b) Space Complexity: top_down O(rozmiar cache + głębokość stosu * D), bottom_up O(S) na porządek i liczniki
+#      plus O(peak_live) wartości.
+
+# Równoległe wypełnianie tabeli falą (wavefront):
+# W tabelach typu LCS / odległość edycyjna komórka (i,j) zależy od (i-1,j), (i,j-1) i (i-1,j-1), więc wszystkie komórki
+# na jednej antyprzekątnej (i + j = const) są od siebie niezależne. Pojedyncza komórka to za mało pracy dla osobnego
+# procesu, dlatego dzielimy tabelę na kafelki tile x tile. Kafelek (bi,bj) zależy tylko od kafelków (bi-1,bj) i
+# (bi,bj-1) (kafelek po skosie jest policzony wcześniej niż oba), więc kafelki na jednej antyprzekątnej kafelków
+# można liczyć równolegle. Nie czekamy jednak na całą antyprzekątną - kafelek wysyłamy do puli procesów, gdy tylko
+# oba jego poprzedniki są gotowe (licznik brakujących zależności, jak przy sortowaniu topologicznym).
+#
+# Tabela (n+1) x (m+1) leży we wspólnej pamięci (shared_memory) jako tablica typowana wierszami (komórka (i,j) ma
+# indeks i*(m+1) + j), więc procesy przesyłają sobie tylko współrzędne kafelków. Ciągi a i b oraz jądro (kernel)
+# dostaje każdy proces raz, przy starcie (jak w sample_sort w sorting.py). Jądro to obiekt z dwiema metodami:
+# boundary wypełnia wiersz 0 i kolumnę 0, a tile liczy komórki kafelka sekwencyjnie, wiersz po wierszu. Każdy kafelek
+# liczy ta sama funkcja na tych samych danych w kolejności zgodnej z zależnościami, więc wynik jest identyczny
+# z wypełnieniem sekwencyjnym (workers=1 robi dokładnie to, bez procesów i wspólnej pamięci).
+# MCM się tu nie nadaje - m[i,j] zależy od całego wiersza i kolumny, a nie od sąsiadów, więc kafelki na przekątnej
+# musiałyby czytać wyniki prawie wszystkich wcześniejszych kafelków.
+
+class LCSKernel:
+    # Najdłuższy wspólny podciąg - tabela zer na brzegach
+    def boundary(self, T, n, m):
+        pass
+
+    def tile(self, T, a, b, i0, i1, j0, j1):
+        W = len(b) + 1
+        for i in range(i0, i1):
+            ai = a[i-1]
+            row, prev = i*W, (i-1)*W
+            left = T[row + j0 - 1]
+            for j in range(j0, j1):
+                if ai == b[j-1]:
+                    left = T[prev + j - 1] + 1
+                else:
+                    up = T[prev + j]
+                    if up > left:
+                        left = up
+                T[row + j] = left
+
+class EditDistanceKernel:
+    # Odległość Levenshteina - d[i,0] = i, d[0,j] = j
+    def boundary(self, T, n, m):
+        for j in range(m+1):
+            T[j] = j
+        for i in range(n+1):
+            T[i*(m+1)] = i
+
+    def tile(self, T, a, b, i0, i1, j0, j1):
+        W = len(b) + 1
+        for i in range(i0, i1):
+            ai = a[i-1]
+            row, prev = i*W, (i-1)*W
+            left = T[row + j0 - 1]
+            for j in range(j0, j1):
+                diag = T[prev + j - 1] + (ai != b[j-1])
+                up = T[prev + j] + 1
+                left += 1
+                if up < left:
+                    left = up
+                if diag < left:
+                    left = diag
+                T[row + j] = left
+
+WAVEFRONT_KERNELS = {
+    'lcs': LCSKernel(),
+    'edit': EditDistanceKernel(),
+}
+
+def tile_bounds(n, tile, bi):
+    return 1 + bi*tile, min(n, (bi+1)*tile) + 1
+
+# Stan procesu roboczego - ustawiany raz, przy starcie procesu w puli
+_wavefront = {}
+
+def _wavefront_init(name, typecode, kernel, a, b, tile):
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    _wavefront.update(shm=shm, T=shm.buf.cast(typecode), kernel=kernel, a=a, b=b, tile=tile)
+
+def _wavefront_tile(block):
+    bi, bj = block
+    st = _wavefront
+    i0, i1 = tile_bounds(len(st['a']), st['tile'], bi)
+    j0, j1 = tile_bounds(len(st['b']), st['tile'], bj)
+    st['kernel'].tile(st['T'], st['a'], st['b'], i0, i1, j0, j1)
+    return block
+
+# Zwraca (d[n,m], tabela jako array.array albo None, jeśli keep_table=False)
+def wavefront(kernel, a, b, tile=256, workers=None, typecode='i', keep_table=False):
+    if isinstance(kernel, str):
+        kernel = WAVEFRONT_KERNELS[kernel]
+    n, m = len(a), len(b)
+    cells = (n+1) * (m+1)
+    rows, cols = (n + tile - 1) // tile, (m + tile - 1) // tile
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1 or rows * cols <= 1:
+        T = array.array(typecode, [0]) * cells
+        kernel.boundary(T, n, m)
+        for bi in range(rows):
+            for bj in range(cols):
+                kernel.tile(T, a, b, *tile_bounds(n, tile, bi), *tile_bounds(m, tile, bj))
+        return T[cells-1], (T if keep_table else None)
+
+    import queue
+    from multiprocessing import Pool, shared_memory
+    itemsize = array.array(typecode).itemsize
+    shm = shared_memory.SharedMemory(create=True, size=cells * itemsize)
+    T = shm.buf.cast(typecode)
+    try:
+        # Nowy segment pamięci współdzielonej jest wyzerowany przez system, nie trzeba go zapisywać drugi raz
+        kernel.boundary(T, n, m)
+
+        # missing[bi][bj] - ile poprzedników kafelka (bi,bj) nie jest jeszcze policzonych
+        missing = [[(bi > 0) + (bj > 0) for bj in range(cols)] for bi in range(rows)]
+        finished = queue.SimpleQueue()
+        with Pool(workers, initializer=_wavefront_init, initargs=(shm.name, typecode, kernel, a, b, tile)) as pool:
+            def submit(block):
+                pool.apply_async(_wavefront_tile, (block,), callback=finished.put, error_callback=finished.put)
+
+            submit((0, 0))
+            for _ in range(rows * cols):
+                done = finished.get()
+                if isinstance(done, BaseException):
+                    raise done
+                bi, bj = done
+                for nb in ((bi+1, bj), (bi, bj+1)):
+                    if nb[0] < rows and nb[1] < cols:
+                        missing[nb[0]][nb[1]] -= 1
+                        if missing[nb[0]][nb[1]] == 0:
+                            submit(nb)
+
+        value = T[cells-1]
+        table = array.array(typecode, T) if keep_table else None
+    finally:
+        # Widok na bufor trzeba zwolnić przed close, także gdy jądro zgłosiło wyjątek
+        T.release()
+        shm.close()
+        shm.unlink()
+    return value, table
+
+# Złożoność obliczeniowa (tabela (n+1) x (m+1), P procesów, k = tile):
+#   a) Time Complexity: Theta(n*m) pracy, a czas przy P procesach to około n*m/P + (n/k + m/k) * k^2 - druga część to
+#      "rozbieg" i "wybieg" fali, gdy gotowych kafelków jest mniej niż procesów
+#   b) Space Complexity: Theta(n*m) - cała tabela (itemsize bajtów na komórkę, 4 dla 'i'), plus O((n/k) * (m/k))
+#      liczników kafelków
+
 # Inne typowe problemy używające DP:
 # 1. Floyd-Warshall - najkrótsze ścieżki między wszystkimi parami wierzchołków grafu ważonego
 # 2. Problem komiwojażera - znajdowanie cykli Hamiltona w grafach
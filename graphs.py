@@ -37,6 +37,10 @@
 # 6. Najkrótsze ścieżki między wszystkimi parami wierzchołków, algorytm Floyda-Warshalla
 # =================================================================================================
 
+import array
+
+from data_structures import ArrayStack, RingQueue
+
 # =================================================================================================
 # 1. Przechodzenie po grafach:
 #
@@ -86,16 +90,17 @@ def BFS(G, s):
                 v.colour = 'GRAY'
                 v.distance = u.distance + 1
                 v.parent = u
-                ENQUEUE(v)
+                ENQUEUE(Q, v)
         # Zakończ przetwarzanie aktualnego wierzchołka
         u.colour = 'BLACK'
 
-# Atrapy funkcji, aby interpreter się nie czepiał w IDE że piszę pseudokod w Pythonie
+# Atrapy funkcji, aby interpreter się nie czepiał w IDE że piszę pseudokod w Pythonie. BFS powyżej to notatka z wykładu
+# (wierzchołki jako obiekty z kolorami) - działająca wersja na tablicach z kolejką RingQueue to bfs z punktu 1.c)
 def create_queue():
     return
-def ENQUEUE():
+def ENQUEUE(Q, x):
     return
-def DEQUEUE():
+def DEQUEUE(Q):
     return
 
 #
@@ -103,7 +108,7 @@ def DEQUEUE():
 # Na początku każdej iteracji pętli while, kolejka Q posiada wszystkie odwiedzone wierzchołki, czekające na przetworzenie.
 # - Inicjalizacja: Przed pierwszą iteracją w Q jest tylko szare źródło
 # - Utrzymanie: Podczas każdej iteracji dodajemy nowe wierzchołki pokolorowane na szaro. Jedynym szarym wierzchołkiem pozostaje
-# usunięty z kolejki w linijce 81 'u'. Przywracamy niezmiennik poprzez pokolorowanie go na czarno - ponownie wszystkie szare
+# usunięty z kolejki na początku iteracji 'u'. Przywracamy niezmiennik poprzez pokolorowanie go na czarno - ponownie wszystkie szare
 # wierzchołki znajdują się w kolejce.
 # - Zakończenie: Po przetworzeniu ostatniego wierzchołka z kolejki jest ona pusta, nie ma już żadnych wierzchołków do przetworzenia.
 #
@@ -211,6 +216,89 @@ def DFS_VISIT(node):
 # 
 # Ostatnią rzeczą na temat krawędzi jest twierdzenie dotyczące sytuacji, gdy mamy do czynienia z grarfem nieskierowanym:
 # Wykonując DFS na grafie nieskierowanym, każda krawędź będzie albo drzewowa, albo powrotna.
+#
+#   c) BFS i DFS na numerach wierzchołków:
+# Powyższe procedury to pseudokod na obiektach-wierzchołkach. W praktyce wierzchołki to zwykle numery 0...|V|-1, a graf
+# to lista sąsiedztwa adj, gdzie adj[u] to lista numerów sąsiadów u. Wtedy kolory, odległości, rodzice i czasy trzymamy
+# w tablicach indeksowanych numerem wierzchołka (bytearray / array), a kolejkę w BFS i stos w DFS mamy na tablicach
+# typowanych z data_structures.py (RingQueue, ArrayStack) - bez osobnego obiektu na każdy element. NIL i INF to -1.
+# Pojedyncze enqueue/dequeue na RingQueue są wolniejsze od collections.deque (każde to kilka operacji w Pythonie), więc
+# BFS przetwarza kolejkę warstwami: dequeue_many zdejmuje całą warstwę, a odkryte wierzchołki wracają jednym
+# enqueue_many. Kolejność odwiedzania jest ta sama co przy zdejmowaniu po jednym wierzchołku.
+#
+# DFS robimy iteracyjnie, bez rekurencji (rekurencyjny DFS_VISIT na ścieżce z 10^5 wierzchołków przekroczyłby limit
+# rekurencji Pythona). Stos symuluje stos wywołań: na wierzchu jest aktualnie przetwarzany (szary) wierzchołek u,
+# a next_edge[u] pamięta, którego sąsiada sprawdzamy następnego - to odpowiednik miejsca w pętli for w DFS_VISIT.
+# Jeśli u ma jeszcze białego sąsiada, to go odwiedzamy i wkładamy na stos, a jeśli nie, to zdejmujemy u i kończymy jego
+# przetwarzanie. Kolejność odwiedzania i czasy wychodzą dokładnie takie jak w wersji rekurencyjnej.
+#
+
+WHITE, GRAY, BLACK = 0, 1, 2
+
+def bfs(adj, s):
+    n = len(adj)
+    colour = bytearray(n)
+    distance = array.array('q', [-1]) * n
+    parent = array.array('q', [-1]) * n
+    colour[s] = GRAY
+    distance[s] = 0
+    Q = RingQueue(n)
+    Q.enqueue(s)
+    while not Q.empty():
+        # Cała warstwa naraz: wszystkie wierzchołki w kolejce mają tę samą odległość, a nowo odkryte (białe) wierzchołki
+        # zbieramy w jednej tablicy i wkładamy do kolejki jednym enqueue_many
+        layer = Q.dequeue_many(len(Q))
+        found = array.array('q')
+        for u in layer:
+            d = distance[u] + 1
+            for v in adj[u]:
+                if colour[v] == WHITE:
+                    colour[v] = GRAY
+                    distance[v] = d
+                    parent[v] = u
+                    found.append(v)
+            colour[u] = BLACK
+        Q.enqueue_many(found)
+    return distance, parent
+
+def dfs(adj):
+    n = len(adj)
+    colour = bytearray(n)
+    parent = array.array('q', [-1]) * n
+    visit_time = array.array('q', bytes(8 * n))
+    finish_time = array.array('q', bytes(8 * n))
+    next_edge = array.array('q', bytes(8 * n))
+    S = ArrayStack()
+    time = 0
+    for s in range(n):
+        if colour[s] != WHITE:
+            continue
+        colour[s] = GRAY
+        time += 1
+        visit_time[s] = time
+        S.push(s)
+        while not S.empty():
+            u = S.top()
+            neighbors = adj[u]
+            if next_edge[u] < len(neighbors):
+                v = neighbors[next_edge[u]]
+                next_edge[u] += 1
+                if colour[v] == WHITE:
+                    colour[v] = GRAY
+                    parent[v] = u
+                    time += 1
+                    visit_time[v] = time
+                    S.push(v)
+            else:
+                S.pop()
+                colour[u] = BLACK
+                time += 1
+                finish_time[u] = time
+    return visit_time, finish_time, parent
+
+#
+# Złożoność obliczeniowa: tak jak wyżej, Theta(V+E) dla obu procedur - każda krawędź jest sprawdzana raz.
+# Złożoność pamięciowa: Theta(V) na tablice pomocnicze, kolejkę i stos (po kilka bajtów na wierzchołek).
 # =================================================================================================
 
 # =================================================================================================
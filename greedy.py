@@ -73,9 +73,10 @@ def iterative_activity_selector(s, f):
             i = m
     return ans
 
-A = recursive_activity_selector(s, f, 0, n)
-B = iterative_activity_selector(s, f)
-print(f"A: {A}\nB: {B}")
+if __name__ == '__main__':
+    A = recursive_activity_selector(s, f, 0, n)
+    B = iterative_activity_selector(s, f)
+    print(f"A: {A}\nB: {B}")
 
 # Złożoność obliczeniowa:
 #   a) Time Complexity: Theta(N)
@@ -20,6 +20,47 @@
 # 4. Sortowanie przez kopcowanie (heap sort)
 # 5. Sortownie szybkie (quick sort)
 # 6. Sortowania niewykorzystujące porówań (counting sort, radix sort)
+#
+# Dodatkowo (poza materiałem z wykładu):
+# 7. Sortowanie po kluczu z ładunkiem (argsort)
+# 8. Selekcja i sortowanie częściowe (quickselect, nth_element, partial sort, top-k)
+# 9. Równoległe sortowanie próbkowe (sample sort) na wielu procesach
+# 10. Heap sort na kopcu d-arnym z budową "od dołu" (bottom-up heapsort)
+# =================================================================================================
+
+import array
+import os
+import random
+from bisect import bisect_right
+
+# =================================================================================================
+# 0. Tablica 1-indexed:
+# Wszystkie procedury w tej notatce zakładają, tak jak na wykładzie, tablicę indeksowaną od 1, która zna swoją długość
+# (arr.length), potrafi zamienić dwa elementy miejscami (arr.swap) oraz, na potrzeby kopca, przechowuje rozmiar kopca
+# (arr.heapsize). Żeby dało się te procedury faktycznie uruchomić, a nie tylko czytać jak pseudokod, poniżej jest
+# najprostsza klasa, która spełnia te założenia. Pod spodem to zwykła lista Pythona z nieużywanym elementem arr[0].
+#
+
+class Array:
+    def __init__(self, values=()):
+        self.data = [None]
+        self.data.extend(values)
+        self.length = len(self.data) - 1
+        self.heapsize = 0
+
+    def __getitem__(self, idx):
+        return self.data[idx]
+
+    def __setitem__(self, idx, value):
+        self.data[idx] = value
+
+    def swap(self, i, j):
+        self.data[i], self.data[j] = self.data[j], self.data[i]
+
+    # Elementy arr[1...n] jako zwykła lista (0-indexed)
+    def values(self):
+        return self.data[1:]
+
 # =================================================================================================
 
 # =================================================================================================
@@ -193,7 +234,9 @@ def merge(arr, i, k, j):
     R.append(INF)
     
     # puszczamy two-pointer, mamy do wypełnienia podtablicę arr[i...j]
-    l = 1, r = 1
+    # (L i R budujemy przez append, więc w Pythonie zaczynają się od 0)
+    l = 0
+    r = 0
     for idx in range(i, j+1):
         if L[l] <= R[r]:
             arr[idx] = L[l]
@@ -252,7 +295,7 @@ def merge(arr, i, k, j):
 #
 
 def parent(idx):
-    return idx/2
+    return idx//2
 def left(idx):
     return 2*idx
 def right(idx):
@@ -303,8 +346,8 @@ def build_max_heap(arr):
     # To pierwszy raz jak korzystamy z kopca, więc rozmiar kopca jest
     # równy długości tablicy
     arr.heapsize = arr.length
-    # Odpowiednik for i = arr.length / 2 down to 1
-    for i in range(arr.length // 2, 1, -1):
+    # Odpowiednik for i = arr.length / 2 down to 1 (range nie obejmuje końca, więc kończymy na 0)
+    for i in range(arr.length // 2, 0, -1):
         heapify(arr, i)
 
 #
@@ -324,7 +367,8 @@ def build_max_heap(arr):
 def heapsort(arr):
     build_max_heap(arr)
     # Usuwamy z kopca już posortowane elementy
-    for i in range(arr.length, 2, -1):
+    # Odpowiednik for i = arr.length down to 2
+    for i in range(arr.length, 1, -1):
         arr.swap(1, i)
         # Zmniejszając rozmiar kopca zostawimy już posortowane elementy "w spokoju"
         arr.heapsize -= 1
@@ -432,9 +476,10 @@ def quick_sort(arr, p, r):
 #
 
 def hoare_partition(arr, p, q):
+    i = p-1
+    j = q+1
+    pivot = arr[p]
     while True:
-        i = p-1, j = q+1
-        pivot = arr[p]
         # Znajdź indeksy i,j
         while True:
             j -= 1
@@ -500,16 +545,16 @@ def counting_sort(arr, B, k):
     # Inicjalizacja C[0...k], same zera
     C = []
     for i in range(0, k+1):
-        C[i] = 0
+        C.append(0)
     # Wypełnienie C, pierwszy etap, liczności pojedynczych elementów
     for i in range(1, n+1):
-        C[arr[i]] = 0
+        C[arr[i]] += 1
     # Wypełnienie C, drugi etap, liczność elementów <= od danego
     for i in range(1, k+1):
-        C[arr[i]] += C[arr[i-1]]
+        C[i] += C[i-1]
     
     # Wstawienie elementu na odpowiednie miejsce, dekrementacja liczności
-    for i in range(n, 1, -1):
+    for i in range(n, 0, -1):
         elem = arr[i]
         B[C[elem]] = elem
         C[elem] -= 1
@@ -536,4 +581,570 @@ def radix_sort(arr, d):
 # Złożoność obliczeniowa: sortujemy 'd' razy tablicę, której klucze są zakodowane w alfabecie o 'k' znakach, więc mamy 'k' możliwości
 # dla każdego elementu. Długością tablicy jest 'n', więc ostatecznie złożoność to Theta(d*(n+k)) = Theta(n), bo d-stała, k=O(n).
 # Złożoność pamięciowa: O(n), tak jak w counting sort.
-# =================================================================================================
\ No newline at end of file
+# =================================================================================================
+# =================================================================================================
+# 7. Sortowanie po kluczu z ładunkiem (argsort):
+# Wszystkie powyższe procedury sortują "gołe" wartości w miejscu. W praktyce rzadko sortujemy same liczby - zazwyczaj mamy
+# rekordy, które sortujemy po jednym polu (kluczu), a resztę pól (ładunek, payload) chcemy przestawić w tej samej kolejności.
+# Często tych pól jest kilka i trzymamy je w osobnych, równoległych tablicach (kolumnach). Zamiast przestawiać całe rekordy,
+# lepiej jest posortować same indeksy - wynikiem jest permutacja perm[1...n] taka, że keys[perm[1]] <= keys[perm[2]] <= ...
+# Taką permutację możemy później nałożyć na dowolną liczbę kolumn. Nie tworzymy przy tym żadnych par (klucz, indeks), bo
+# porównujemy keys[perm[x]] bezpośrednio - tablica perm trzyma tylko liczby całkowite.
+#
+# Każde sortowanie z notatki da się tak przerobić, wystarczy w każdym porównaniu zamienić arr[x] na keys[perm[x]], a każdą
+# zamianę arr.swap(x, y) na perm.swap(x, y). Poniżej wersje dla merge sorta, heap sorta, quick sorta oraz radix sorta.
+# Wszystkie przyjmują tablicę kluczy 1-indexed (Array) i zwracają permutację, również jako Array indeksów 1...n.
+#
+
+def identity_permutation(n):
+    return Array(range(1, n+1))
+
+#
+#   a) Merge sort po indeksach:
+# Tutaj scalamy metodą bez strażników (pierwszy sposób opisany w punkcie 3.), bo strażnik musiałby być indeksem, a nie
+# wartością. Scalanie jest stabilne, więc argsort przez scalanie również jest stabilny - równe klucze zachowują kolejność
+# indeksów, co jest przydatne, gdy sortujemy kolejno po kilku kolumnach.
+#
+
+def merge_argsort(keys):
+    perm = identity_permutation(keys.length)
+    merge_sort_by_key(keys, perm, 1, keys.length)
+    return perm
+
+def merge_sort_by_key(keys, perm, i, j):
+    if i < j:
+        k = (i+j) // 2
+        merge_sort_by_key(keys, perm, i, k)
+        merge_sort_by_key(keys, perm, k+1, j)
+        merge_by_key(keys, perm, i, k, j)
+
+def merge_by_key(keys, perm, i, k, j):
+    # Kopiujemy tylko indeksy z perm[i...k] oraz perm[k+1...j]
+    L = perm.data[i:k+1]
+    R = perm.data[k+1:j+1]
+    l = 0
+    r = 0
+    idx = i
+    while l < len(L) and r < len(R):
+        # <= zapewnia stabilność
+        if keys[L[l]] <= keys[R[r]]:
+            perm[idx] = L[l]
+            l += 1
+        else:
+            perm[idx] = R[r]
+            r += 1
+        idx += 1
+    # Dopisanie reszty z niewyczerpanej tablicy
+    while l < len(L):
+        perm[idx] = L[l]
+        l += 1
+        idx += 1
+    while r < len(R):
+        perm[idx] = R[r]
+        r += 1
+        idx += 1
+
+#
+#   b) Heap sort po indeksach:
+# Kopiec budujemy na tablicy perm, ale własność kopca sprawdzamy na kluczach. Heapify jest tu od razu iteracyjne (pętla zamiast
+# rekurencji) - robi dokładnie to samo, tylko "schodzimy" w dół w pętli while.
+#
+
+def heap_argsort(keys):
+    perm = identity_permutation(keys.length)
+    perm.heapsize = perm.length
+    for i in range(perm.length // 2, 0, -1):
+        heapify_by_key(keys, perm, i)
+    for i in range(perm.length, 1, -1):
+        perm.swap(1, i)
+        perm.heapsize -= 1
+        heapify_by_key(keys, perm, 1)
+    return perm
+
+def heapify_by_key(keys, perm, i):
+    while True:
+        l = left(i)
+        r = right(i)
+        largest = i
+        if l <= perm.heapsize and keys[perm[l]] > keys[perm[largest]]:
+            largest = l
+        if r <= perm.heapsize and keys[perm[r]] > keys[perm[largest]]:
+            largest = r
+        if largest == i:
+            return
+        perm.swap(i, largest)
+        i = largest
+
+#
+#   c) Quick sort po indeksach:
+# Partycja Lomuto, tylko pivot to klucz elementu perm[r]. Jak w punkcie 5., nie jest to sortowanie stabilne.
+#
+
+def quick_argsort(keys):
+    perm = identity_permutation(keys.length)
+    quick_sort_by_key(keys, perm, 1, perm.length)
+    return perm
+
+def partition_lomuto_by_key(keys, perm, p, r):
+    pivot = keys[perm[r]]
+    i = p-1
+    for j in range(p, r):
+        if keys[perm[j]] <= pivot:
+            i += 1
+            perm.swap(i, j)
+    perm.swap(i+1, r)
+    return i+1
+
+def quick_sort_by_key(keys, perm, p, r):
+    if p < r:
+        q = partition_lomuto_by_key(keys, perm, p, r)
+        quick_sort_by_key(keys, perm, p, q-1)
+        quick_sort_by_key(keys, perm, q+1, r)
+
+#
+#   d) Radix sort po indeksach:
+# Klucze to nieujemne liczby całkowite o co najwyżej d cyfrach w systemie o podstawie 'base'. Dla każdej pozycji (od cyfry
+# jedności) robimy counting sort permutacji po danej cyfrze klucza. Counting sort jest stabilny, więc radix sort działa.
+#
+
+def radix_argsort(keys, d, base=10):
+    n = keys.length
+    perm = identity_permutation(n)
+    B = Array([0] * n)
+    divisor = 1
+    for _ in range(d):
+        # C[c] to liczba kluczy z cyfrą <= c na aktualnej pozycji
+        C = [0] * base
+        for i in range(1, n+1):
+            C[keys[perm[i]] // divisor % base] += 1
+        for c in range(1, base):
+            C[c] += C[c-1]
+        # Od końca, żeby zachować stabilność
+        for i in range(n, 0, -1):
+            digit = keys[perm[i]] // divisor % base
+            B[C[digit]] = perm[i]
+            C[digit] -= 1
+        perm, B = B, perm
+        divisor *= base
+    return perm
+
+#
+#   e) Nałożenie permutacji na kolumny:
+# Mając permutację możemy albo utworzyć nową, posortowaną kolumnę (apply_permutation), albo przestawić kolumnę w miejscu.
+# Przestawianie w miejscu idzie po cyklach permutacji: element z pozycji perm[i] ma trafić na pozycję i, więc wędrujemy
+# po cyklu i -> perm[i] -> perm[perm[i]] -> ... aż wrócimy do i. Każdy element przesuwamy dokładnie raz.
+# sort_by_key sortuje klucze razem z dowolną liczbą kolumn ładunku "w jednym kroku" (lockstep).
+#
+
+ARGSORTS = {
+    'merge': merge_argsort,
+    'heap': heap_argsort,
+    'quick': quick_argsort,
+}
+
+def apply_permutation(arr, perm):
+    return Array(arr[perm[i]] for i in range(1, perm.length+1))
+
+def permute_in_place(arr, perm):
+    n = perm.length
+    done = [False] * (n+1)
+    for start in range(1, n+1):
+        if done[start]:
+            continue
+        tmp = arr[start]
+        i = start
+        while True:
+            done[i] = True
+            j = perm[i]
+            if j == start:
+                arr[i] = tmp
+                break
+            arr[i] = arr[j]
+            i = j
+
+def sort_by_key(keys, *payload, method='merge'):
+    perm = ARGSORTS[method](keys)
+    permute_in_place(keys, perm)
+    for column in payload:
+        permute_in_place(column, perm)
+    return perm
+
+#
+# Złożoność obliczeniowa jest taka sama jak odpowiednich sortowań (porównujemy te same klucze, tylko przez jeden poziom
+# pośredniości). Nałożenie permutacji to Theta(n) na każdą kolumnę.
+# Złożoność pamięciowa: Theta(n) na samą permutację (oraz Theta(n) na tablicę 'done' przy przestawianiu w miejscu).
+# Radix sort po indeksach potrzebuje do sort_by_key liczby cyfr, więc wywołujemy go osobno i nakładamy permutację sami.
+# =================================================================================================
+
+# =================================================================================================
+# 8. Selekcja i sortowanie częściowe:
+# Często nie potrzebujemy całej posortowanej tablicy, tylko i-tej statystyki pozycyjnej (np. mediany), albo k najmniejszych
+# elementów. Pełne sortowanie to wtedy Theta(n*lgn), a da się to zrobić liniowo. Pomysł jest taki sam jak w quick sorcie:
+# partycjonujemy arr[p...r] wokół pivota, który ląduje na pozycji q. Jeśli q-p+1 (pozycja pivota w podtablicy) to dokładnie
+# i, to znaleźliśmy odpowiedź. W przeciwnym wypadku schodzimy TYLKO do tej podtablicy, w której jest szukany element - drugiej
+# nie ruszamy. Dla losowego pivota oczekiwany czas to T(n) = T(n/2) + Theta(n) = Theta(n), ale pesymistycznie, tak jak
+# w quick sorcie, Theta(n^2).
+#
+# Żeby mieć gwarancję czasu liniowego, korzystamy z algorytmu "mediana median" (BFPRT, na wykładzie jako SELECT):
+# - dzielimy tablicę na grupy po 5 elementów i sortujemy każdą przez wstawianie (stały czas na grupę)
+# - medianę każdej grupy przenosimy na początek podtablicy
+# - rekurencyjnie wyznaczamy medianę tych n/5 median i to ona jest pivotem
+# Taki pivot jest większy od co najmniej 3n/10 elementów i mniejszy od co najmniej 3n/10 elementów, więc
+#               T(n) <= T(n/5) + T(7n/10) + Theta(n) = Theta(n), bo 1/5 + 7/10 < 1
+# Stałe są jednak spore, dlatego mediany median używamy tylko awaryjnie: zaczynamy od losowego pivota i partycji Lomuto, a jeśli
+# co dwie partycje rozmiar podtablicy nie spadł przynajmniej o połowę, to przełączamy się na medianę median. Aż do przełączenia
+# rozmiary maleją geometrycznie, więc łącznie to wciąż Theta(n). Po przełączeniu używamy partycji Hoare, bo ona rozdziela ciągi
+# równych kluczy na obie strony - partycja Lomuto przy samych równych kluczach odcina za każdym razem jeden element.
+#
+
+def insertion_sort_range(arr, p, r):
+    for i in range(p+1, r+1):
+        key = arr[i]
+        j = i - 1
+        while j >= p and key < arr[j]:
+            arr[j+1] = arr[j]
+            j -= 1
+        arr[j+1] = key
+
+# Zwraca indeks pivota wybranego metodą mediany median w arr[p...r]
+def median_of_medians(arr, p, r):
+    if r - p < 5:
+        insertion_sort_range(arr, p, r)
+        return (p+r) // 2
+    # m to pierwsze wolne miejsce na medianę grupy, zawsze m <= g
+    m = p
+    for g in range(p, r+1, 5):
+        end = min(g+4, r)
+        insertion_sort_range(arr, g, end)
+        arr.swap(m, (g+end) // 2)
+        m += 1
+    # Mediany są w arr[p...m-1], wybieramy ich medianę
+    mid = (m - p + 1) // 2
+    quickselect(arr, p, m-1, mid)
+    return p + mid - 1
+
+# Zwraca i-ty najmniejszy element arr[p...r] (i = 1...r-p+1). Po zakończeniu arr[p+i-1] to szukany element,
+# na lewo od niego są elementy <= od niego, a na prawo >= od niego.
+def quickselect(arr, p, r, i):
+    last_size = r - p + 1
+    rounds = 0
+    fallback = False
+    while p < r:
+        if not fallback:
+            if rounds == 2:
+                if r - p + 1 > last_size // 2:
+                    fallback = True
+                last_size = r - p + 1
+                rounds = 0
+            rounds += 1
+        if fallback:
+            arr.swap(p, median_of_medians(arr, p, r))
+            q = hoare_partition(arr, p, r)
+            # arr[p...q] <= pivot <= arr[q+1...r], ale pivot nie musi być na pozycji q
+            k = q - p + 1
+            if i <= k:
+                r = q
+            else:
+                i -= k
+                p = q + 1
+        else:
+            arr.swap(random.randint(p, r), r)
+            q = partition_lomuto(arr, p, r)
+            k = q - p + 1
+            if i == k:
+                return arr[q]
+            elif i < k:
+                r = q - 1
+            else:
+                i -= k
+                p = q + 1
+    return arr[p]
+
+#
+# nth_element (nazwa z C++) to po prostu quickselect na całej tablicy: po jego wykonaniu arr[k] jest na swoim docelowym
+# miejscu, a tablica jest względem niego spartycjonowana. Sortowanie częściowe to nth_element, a następnie posortowanie
+# samego arr[1...k] - czas Theta(n + k*lgk) zamiast Theta(n*lgn). Używamy merge sorta, żeby mieć gwarancję O(k*lgk).
+#
+
+def nth_element(arr, k):
+    return quickselect(arr, 1, arr.length, k)
+
+def partial_sort(arr, k):
+    k = min(k, arr.length)
+    if k == 0:
+        return Array()
+    nth_element(arr, k)
+    merge_sort(arr, 1, k)
+    return Array(arr[i] for i in range(1, k+1))
+
+#
+# Top-k na strumieniu: jeśli dane przychodzą z iteratora i nie chcemy (albo nie możemy) trzymać ich wszystkich w pamięci,
+# to trzymamy kopiec typu max z k najmniejszymi elementami widzianymi do tej pory. Korzeń to największy z nich, czyli "bramkarz".
+# Nowy element jest ciekawy tylko wtedy, gdy jest mniejszy od korzenia - wtedy wstawiamy go w miejsce korzenia i wołamy heapify.
+# Pamięć to O(k) niezależnie od długości strumienia, czas to O(n*lgk). Na koniec wyciągamy elementy z kopca jak w heapsort.
+#
+
+def streaming_top_k(iterable, k):
+    heap = Array()
+    if k <= 0:
+        return heap
+    for x in iterable:
+        if heap.length < k:
+            heap.data.append(x)
+            heap.length += 1
+            # Zbudowanie kopca, gdy jest już pełny
+            if heap.length == k:
+                heap.heapsize = k
+                for i in range(k // 2, 0, -1):
+                    heapify(heap, i)
+        elif x < heap[1]:
+            heap[1] = x
+            heapify(heap, 1)
+    # Strumień mógł mieć mniej niż k elementów
+    heap.heapsize = heap.length
+    for i in range(heap.length // 2, 0, -1):
+        heapify(heap, i)
+    for i in range(heap.length, 1, -1):
+        heap.swap(1, i)
+        heap.heapsize -= 1
+        heapify(heap, 1)
+    return heap
+
+#
+# Złożoność obliczeniowa:
+# - quickselect / nth_element: oczekiwanie Theta(n), pesymistycznie również O(n) dzięki medianie median
+# - partial_sort: Theta(n + k*lgk)
+# - streaming_top_k: O(n*lgk)
+# Złożoność pamięciowa: quickselect działa w miejscu (pętla zamiast rekurencji, poza rekurencją w medianie median, która ma
+# głębokość O(lgn)), streaming_top_k używa O(k) pamięci.
+# =================================================================================================
+
+# =================================================================================================
+# 9. Równoległe sortowanie próbkowe (sample sort):
+# Wszystkie powyższe sortowania działają na jednym rdzeniu. Jeśli mamy p rdzeni, to chcielibyśmy podzielić pracę na p
+# niezależnych kawałków. Merge sort dzieli się naturalnie, ale ostatnie scalanie jest sekwencyjne i przechodzi przez całą
+# tablicę. Sample sort robi odwrotnie niż merge sort - najpierw dzieli dane na "kubełki" według wartości (jak bucket sort),
+# a dopiero później sortuje każdy kubełek osobno. Po posortowaniu kubełków nie trzeba już nic scalać, bo każdy element
+# kubełka i jest mniejszy lub równy od każdego elementu kubełka i+1.
+#
+# Skąd wziąć granice kubełków (splittery)? Z próbki: losujemy p*s elementów (s to współczynnik nadpróbkowania), sortujemy
+# je i bierzemy co s-ty. Przy rozsądnym s każdy kubełek ma z dużym prawdopodobieństwem około n/p elementów.
+#
+# Kroki (każdy krok poza wyborem splitterów wykonuje się równolegle na p procesach):
+# 1. Każdy proces dostaje fragment wejścia i zlicza, ile jego elementów trafi do każdego kubełka (bisect na splitterach).
+# 2. Z liczności (jak w counting sort!) wyznaczamy, od którego miejsca w tablicy wynikowej każdy proces pisze do każdego
+#    kubełka - sumy prefiksowe najpierw po kubełkach, a w obrębie kubełka po procesach.
+# 3. Każdy proces rozrzuca swoje elementy bezpośrednio na docelowe miejsca w tablicy wynikowej.
+# 4. Każdy proces sortuje w miejscu jeden kubełek tablicy wynikowej.
+# Kubełki leżą w tablicy wynikowej jeden za drugim, więc na końcu nie ma łączenia ani dodatkowego kopiowania.
+#
+# Wejście i wyjście trzymamy we wspólnej pamięci (shared_memory) jako tablice typowane (moduł array, np. 'd' dla float
+# albo 'q' dla int64), dzięki czemu procesy nie przesyłają sobie danych, tylko nazwy bloków pamięci. Kubełek to liczby,
+# więc sortujemy go w miejscu wbudowanym sorted (Timsort w C, O(n*lgn)) i wpisujemy z powrotem do wspólnej pamięci -
+# dla liczb nic z tego pliku napisane w Pythonie nie jest szybsze na jednym rdzeniu. Wynik kopiujemy z wspólnej pamięci
+# do array.array jednym frombytes.
+#
+
+def sort_range_in_place(view, lo, hi):
+    view[lo:hi] = array.array(view.format, sorted(view[lo:hi]))
+
+# Stan procesu roboczego - ustawiany raz, przy starcie procesu w puli
+_worker = {}
+
+def _sample_sort_init(src_name, dst_name, typecode, splitters):
+    from multiprocessing import shared_memory
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    _worker['shm'] = (src, dst)
+    _worker['src'] = src.buf.cast(typecode)
+    _worker['dst'] = dst.buf.cast(typecode)
+    _worker['splitters'] = splitters
+
+def _sample_sort_count(chunk):
+    lo, hi = chunk
+    src = _worker['src']
+    splitters = _worker['splitters']
+    counts = [0] * (len(splitters) + 1)
+    for idx in range(lo, hi):
+        counts[bisect_right(splitters, src[idx])] += 1
+    return counts
+
+def _sample_sort_scatter(task):
+    lo, hi, offsets = task
+    src = _worker['src']
+    dst = _worker['dst']
+    splitters = _worker['splitters']
+    for idx in range(lo, hi):
+        x = src[idx]
+        b = bisect_right(splitters, x)
+        dst[offsets[b]] = x
+        offsets[b] += 1
+
+def _sample_sort_local(bounds):
+    lo, hi = bounds
+    sort_range_in_place(_worker['dst'], lo, hi)
+
+def sample_sort(values, workers=None, oversample=32, typecode='d'):
+    # multiprocessing importujemy dopiero tutaj - sam import kosztuje ~20 ms, a większość użytkowników sorting.py
+    # nigdy nie uruchomi procesów
+    from multiprocessing import Pool, shared_memory
+    n = len(values)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Dla małych danych narzut na procesy jest większy niż zysk
+    if workers == 1 or n < workers * oversample * 4:
+        result = array.array(typecode, values)
+        sort_range_in_place(memoryview(result), 0, n)
+        return result
+
+    # Wejście trafia do wspólnej pamięci od razu, bez pośredniej kopii (o ile już jest tablicą o typie typecode)
+    if not (isinstance(values, array.array) and values.typecode == typecode):
+        values = array.array(typecode, values)
+    itemsize = values.itemsize
+    src = shared_memory.SharedMemory(create=True, size=n * itemsize)
+    dst = shared_memory.SharedMemory(create=True, size=n * itemsize)
+    try:
+        src.buf[:n * itemsize] = memoryview(values).cast('B')
+
+        # Wybór splitterów z posortowanej próbki
+        sample = sorted(values[i] for i in random.sample(range(n), workers * oversample))
+        splitters = [sample[i * oversample] for i in range(1, workers)]
+
+        step = (n + workers - 1) // workers
+        chunks = [(lo, min(lo+step, n)) for lo in range(0, n, step)]
+        with Pool(workers, initializer=_sample_sort_init,
+                  initargs=(src.name, dst.name, typecode, splitters)) as pool:
+            counts = pool.map(_sample_sort_count, chunks)
+
+            # Sumy prefiksowe: offsets[c][b] to miejsce, od którego fragment c pisze do kubełka b
+            buckets = len(splitters) + 1
+            offsets = [[0] * buckets for _ in chunks]
+            bounds = []
+            position = 0
+            for b in range(buckets):
+                start = position
+                for c in range(len(chunks)):
+                    offsets[c][b] = position
+                    position += counts[c][b]
+                bounds.append((start, position))
+
+            pool.map(_sample_sort_scatter, [(lo, hi, offsets[c]) for c, (lo, hi) in enumerate(chunks)])
+            pool.map(_sample_sort_local, bounds)
+
+        # Jedno kopiowanie z wspólnej pamięci do wyniku
+        result = array.array(typecode)
+        result.frombytes(dst.buf[:n * itemsize])
+    finally:
+        src.close()
+        src.unlink()
+        dst.close()
+        dst.unlink()
+    return result
+
+#
+# Złożoność obliczeniowa: wybór splitterów to O(p*s*lg(p*s)), zliczanie i rozrzucanie to O((n/p)*lgp) na proces,
+# sortowanie kubełków to oczekiwanie O((n/p)*lg(n/p)) na proces. Łącznie O((n/p)*lgn), czyli idealnie p razy szybciej,
+# dopóki nie ograniczy nas przepustowość pamięci (krok 3. to losowe zapisy po całej tablicy wynikowej).
+# Złożoność pamięciowa: Theta(n) na wejście i tablicę wynikową we wspólnej pamięci oraz Theta(n) na zwrócony wynik.
+# Wynik to array.array, bo wspólna pamięć jest zwalniana po zakończeniu sortowania.
+#
+# Uwaga: jeśli wiele elementów ma ten sam klucz, to wszystkie trafią do jednego kubełka (bisect_right jest deterministyczny),
+# więc jeden proces dostanie więcej pracy. Wynik jest dalej poprawny, tylko przyspieszenie jest mniejsze.
+# =================================================================================================
+
+# =================================================================================================
+# 10. Heap sort na kopcu d-arnym, z przesiewaniem "od dołu":
+# Procedura heapify z punktu 4. jest rekurencyjna i przy każdym poziomie robi dwa porównania: które dziecko jest większe
+# oraz czy większe dziecko jest większe od rodzica. Podczas heapsortu do korzenia trafia zawsze element z końca tablicy, czyli
+# jeden z najmniejszych - prawie na pewno spadnie on z powrotem na sam dół. Drugie porównanie jest więc prawie zawsze zbędne.
+# Stąd pomysł Floyda (tzw. bottom-up heapsort, "odbijanie"):
+# 1. Schodzimy od węzła i aż do liścia, za każdym razem idąc do większego dziecka - NIE porównujemy z przesiewanym elementem.
+#    Ta ścieżka jest posortowana malejąco (własność kopca).
+# 2. "Odbijamy się" od liścia i idziemy w górę tej ścieżki, aż trafimy na węzeł nie mniejszy od przesiewanego elementu -
+#    tam jest jego miejsce. Zwykle to tylko jeden, dwa kroki w górę.
+# 3. Przesuwamy elementy ścieżki (od i do znalezionego miejsca) o jeden poziom w górę, a przesiewany element wstawiamy na
+#    zwolnione miejsce.
+# W efekcie heapsort robi około n*lgn porównań zamiast około 2n*lgn. Tego samego przesiewania używamy do budowy kopca
+# (pętla od ostatniego węzła niebędącego liściem w dół do korzenia, jak w build_max_heap). Wszystko jest iteracyjne.
+#
+# Drugi pomysł to kopiec d-arny: każdy węzeł ma d dzieci zamiast 2. Kopiec jest wtedy niższy (wysokość log_d(n)), a dzieci
+# danego węzła leżą obok siebie w tablicy, więc przy d = 4 albo 8 wybór największego dziecka czyta jeden, dwa sąsiednie
+# fragmenty pamięci. Dla tablicy 1-indexed:
+#               Child(i, c) = d*(i-1) + 1 + c, gdzie c = 1...d,       Parent(i) = (i-2) div d + 1
+# Dla d = 2 to dokładnie Left(i) = 2i, Right(i) = 2i+1 oraz Parent(i) = i div 2.
+#
+# Porządek (rosnący/malejący) oraz funkcję klucza obsługuje to samo jądro: 'higher(a, b)' mówi, czy klucz a ma stać w kopcu
+# wyżej niż b. Dla sortowania rosnącego to kopiec typu max (a > b), dla malejącego kopiec typu min (a < b). Jeśli podano
+# funkcję klucza, to klucze liczymy raz (tablica keys), a elementy arr przestawiamy razem z kluczami, jak w punkcie 7.
+#
+
+def dary_parent(i, d):
+    return (i-2) // d + 1
+
+def dary_first_child(i, d):
+    return d*(i-1) + 2
+
+def dary_sift_down(keys, vals, i, size, d, higher):
+    x = keys[i]
+    # 1. Zejście do liścia po "lepszych" dzieciach
+    j = i
+    while True:
+        first = dary_first_child(j, d)
+        if first > size:
+            break
+        best = first
+        for c in range(first+1, min(first+d, size+1)):
+            if higher(keys[c], keys[best]):
+                best = c
+        j = best
+    # 2. Odbicie w górę, aż do miejsca dla x
+    while j != i and higher(x, keys[j]):
+        j = dary_parent(j, d)
+    # 3. Przesunięcie ścieżki i..j o jeden poziom w górę, x ląduje w j
+    if j == i:
+        return
+    carry_key = x
+    carry_val = vals[i] if vals is not None else None
+    while j != i:
+        carry_key, keys[j] = keys[j], carry_key
+        if vals is not None:
+            carry_val, vals[j] = vals[j], carry_val
+        j = dary_parent(j, d)
+    keys[i] = carry_key
+    if vals is not None:
+        vals[i] = carry_val
+
+def dary_build_heap(keys, vals, size, d, higher):
+    for i in range(dary_parent(size, d), 0, -1):
+        dary_sift_down(keys, vals, i, size, d, higher)
+
+def dary_heapsort(arr, d=2, key=None, reverse=False):
+    if d < 2:
+        raise ValueError("Kopiec musi mieć co najmniej dwoje dzieci na węzeł (d >= 2)")
+    if reverse:
+        higher = lambda a, b: a < b
+    else:
+        higher = lambda a, b: a > b
+    if key is None:
+        keys = arr
+        vals = None
+    else:
+        keys = Array(key(arr[i]) for i in range(1, arr.length+1))
+        vals = arr
+
+    n = arr.length
+    dary_build_heap(keys, vals, n, d, higher)
+    for size in range(n, 1, -1):
+        # Korzeń na koniec kopca, kopiec maleje o jeden
+        keys.swap(1, size)
+        if vals is not None:
+            vals.swap(1, size)
+        dary_sift_down(keys, vals, 1, size-1, d, higher)
+    return arr
+
+#
+# Złożoność obliczeniowa: budowa kopca to wciąż O(n), każde przesianie to O(d*log_d(n)) porównań przy zejściu (wybór
+# najlepszego z d dzieci) plus zazwyczaj O(1) porównań przy odbiciu. Łącznie O(d*n*log_d(n)) = O(n*lgn) dla stałego d.
+# Złożoność pamięciowa: O(1) bez funkcji klucza (sortowanie w miejscu), Theta(n) na tablicę kluczy z funkcją klucza.
+# Sortowanie nie jest stabilne, tak jak zwykły heapsort.
+# =================================================================================================